@@ -3,7 +3,6 @@ Advanced analytics engine for music trend analysis and prediction.
 Implements machine learning, statistical analysis, and pattern recognition.
 """
 
-import json
 import logging
 import warnings
 from collections import Counter
@@ -554,43 +553,12 @@ class MusicTrendAnalytics:
             self.logger.error("No data store available for clustering analysis")
             return []
 
-        # Get recent trends with audio features
-        df = self.data_store.get_trending_tracks(days=days, limit=1000)
-
-        if len(df) < min_cluster_size:
-            self.logger.warning(f"Not enough data for clustering: {len(df)} tracks")
-            return []
-
-        # Extract audio features for clustering
-        audio_features = []
-        track_info = []
-
-        for _, row in df.iterrows():
-            metadata = row.get("metadata", {})
-            if isinstance(metadata, str):
-                try:
-                    metadata = json.loads(metadata)
-                except Exception:
-                    metadata = {}
-
-            audio = metadata.get("audio_features", {})
-            if audio and len(audio) >= 4:  # Need minimum features
-                features = [
-                    audio.get("energy", 0.5),
-                    audio.get("danceability", 0.5),
-                    audio.get("valence", 0.5),
-                    audio.get("acousticness", 0.5),
-                    audio.get("tempo", 120) / 200.0,  # Normalize tempo
-                ]
-                audio_features.append(features)
-                track_info.append(
-                    {
-                        "track_name": row["track_name"],
-                        "artist": row["artist"],
-                        "platform": row["platform"],
-                        "score": row["score"],
-                    }
-                )
+        # Audio features of recent trends, extracted in SQL via generated columns
+        audio_features, tracks = self.data_store.get_audio_feature_matrix(
+            days=days, min_features=4, limit=1000, with_tracks=True
+        )
+        audio_features[:, 4] /= 200.0  # Normalize tempo
+        track_info = tracks[["track_name", "artist", "platform", "score"]].to_dict("records")
 
         if len(audio_features) < min_cluster_size:
             self.logger.warning(f"Not enough tracks with audio features: {len(audio_features)}")
@@ -704,17 +672,8 @@ class MusicTrendAnalytics:
             self.logger.error("No data store available for forecasting")
             return {}
 
-        # Get historical data for the track
-        with self.data_store.get_connection() as conn:
-            query = """
-            SELECT th.timestamp, th.score, th.rank
-            FROM trend_history th
-            JOIN trends t ON th.trend_id = t.id
-            WHERE t.track_name LIKE ? AND t.artist LIKE ?
-            ORDER BY th.timestamp
-            """
-
-            df = pd.read_sql_query(query, conn, params=[f"%{track_name}%", f"%{artist}%"])
+        # Get historical data for the track (substring match via the trigram index)
+        df = self.data_store.get_track_history(track_name, artist)
 
         if len(df) < 5:
             return {"error": "Insufficient historical data for forecasting"}
@@ -12,6 +12,14 @@ This module contains the core application components including:
 Key Components:
     - discovery_app.py: Main application entry point
     - data_store.py: Enterprise-grade data persistence
+    - connection_pool.py: Thread-safe SQLite connection pooling
+    - async_data_store.py: Asyncio facade with a writer thread and reader pool
+    - sharded_data_store.py: Per-platform or per-month database files
+    - write_buffer.py: Group-commit buffer for single-row saves
+    - storage_backend.py: SQLite and DuckDB engines for analytical queries
+    - migrations.py: user_version schema migrations with batched backfills
+    - index_advisor.py: EXPLAIN QUERY PLAN index usage report
+    - query_stats.py: Per-query latency histograms and slow-query log
     - resilience.py: Circuit breakers and retry logic
     - notification_service.py: Multi-channel notifications
     - auth.py: Authentication and API management
@@ -0,0 +1,210 @@
+"""Asyncio facade over EnhancedMusicDataStore.
+
+SQLite allows one writer at a time, so every mutating call runs on a single
+dedicated writer thread while reads fan out over a small reader thread pool
+(WAL mode lets them proceed alongside the writer). Concurrent ``save_trend``
+calls are coalesced into one ``save_trends_bulk`` transaction, so collector
+coroutines keep fetching while persistence happens in the background.
+"""
+
+import asyncio
+import functools
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from core.data_store import EnhancedMusicDataStore, TrendData
+from core.sharded_data_store import ShardedMusicDataStore
+
+logger = logging.getLogger(__name__)
+
+# Store methods that modify the database and must run on the writer thread
+WRITE_METHODS = frozenset(
+    {
+        "save_trend",
+        "save_trends_bulk",
+        "upsert_trends",
+        "save_viral_prediction",
+        "update_trends_bulk",
+        "analyze_cross_platform_spread",
+        "analyze_cross_platform_spread_all",
+        "save_cross_platform_correlations",
+        "compact_history",
+        "checkpoint",
+        "import_from_parquet",
+        "restore_snapshot",
+        "get_data_quality_report",  # logs its result to data_quality_logs
+    }
+)
+
+
+class AsyncMusicDataStore:
+    """
+    Awaitable access to an ``EnhancedMusicDataStore``.
+
+    Every public store method is available as a coroutine with the same
+    signature: writes (``WRITE_METHODS``) are serialised on one writer thread,
+    everything else runs on the reader pool. ``save_trend`` calls that arrive
+    within ``batch_window`` seconds of each other are written together in a
+    single transaction.
+
+    Usage:
+        async with AsyncMusicDataStore(store) as db:
+            trend_id = await db.save_trend(trend)
+            df = await db.get_trending_tracks(platform="spotify")
+    """
+
+    def __init__(
+        self,
+        store: EnhancedMusicDataStore | ShardedMusicDataStore,
+        reader_threads: int = 4,
+        max_batch_size: int = 500,
+        batch_window: float = 0.01,
+    ) -> None:
+        """Initialize the facade.
+
+        Args:
+            store: Synchronous store to wrap (single-file or sharded); its pool
+                should allow at least ``reader_threads + 1`` connections
+            reader_threads: Number of threads serving read queries
+            max_batch_size: Flush queued ``save_trend`` calls once this many are pending
+            batch_window: Seconds to wait for more ``save_trend`` calls before flushing
+        """
+        self.store = store
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="datastore-writer")
+        self._readers = ThreadPoolExecutor(
+            max_workers=reader_threads, thread_name_prefix="datastore-reader"
+        )
+        self._pending: list[tuple[TrendData, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+        self._background: set[asyncio.Task] = set()
+        self._batches_written = 0
+        self._trends_written = 0
+
+    async def __aenter__(self) -> "AsyncMusicDataStore":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        """Expose store methods as coroutines bound to the right executor."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        method = getattr(self.store, name)
+        if not callable(method):
+            return method
+
+        executor = self._writer if name in WRITE_METHODS else self._readers
+
+        @functools.wraps(method)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self._run(executor, method, *args, **kwargs)
+
+        return call
+
+    async def _run(
+        self, executor: ThreadPoolExecutor, func: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        """Run a blocking store call on the given executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+    async def save_trend(self, trend_data: TrendData) -> int:
+        """Queue a trend for the next batched write and wait for it to commit.
+
+        Validation happens immediately so bad input raises in the caller.
+
+        Returns:
+            Trend row id
+        """
+        self.store._validate_trend_data(trend_data)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending.append((trend_data, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            task = asyncio.create_task(self._flush_pending())
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+
+        return await future
+
+    async def _flush_after_window(self) -> None:
+        """Flush queued trends once the batch window has elapsed."""
+        await asyncio.sleep(self.batch_window)
+        self._flush_task = None
+        while self._pending:
+            await self._flush_pending()
+
+    async def _flush_pending(self) -> None:
+        """Write up to ``max_batch_size`` queued trends in one transaction."""
+        batch = self._pending[: self.max_batch_size]
+        del self._pending[: self.max_batch_size]
+        if not batch:
+            return
+
+        try:
+            trend_ids = await self._run(
+                self._writer, self._write_batch, [trend for trend, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), trend_id in zip(batch, trend_ids, strict=True):
+            if not future.done():
+                future.set_result(trend_id)
+
+    def _write_batch(self, trends: list[TrendData]) -> list[int | None]:
+        """Save a batch on the writer thread and return the row ids it wrote."""
+        trend_ids = self.store.upsert_trends(trends)
+        self._batches_written += 1
+        self._trends_written += len(trends)
+        return trend_ids
+
+    async def flush(self) -> int:
+        """Write any queued trends now, then flush the store's own write buffer.
+
+        Returns:
+            Number of records the store's write buffer flushed
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        while self._pending:
+            await self._flush_pending()
+        if self._background:
+            await asyncio.gather(*self._background)
+        return await self._run(self._writer, self.store.flush)
+
+    def get_write_stats(self) -> dict[str, Any]:
+        """Return batching counters."""
+        return {
+            "batches_written": self._batches_written,
+            "trends_written": self._trends_written,
+            "pending": len(self._pending),
+            "avg_batch_size": (
+                self._trends_written / self._batches_written if self._batches_written else 0.0
+            ),
+        }
+
+    async def close(self) -> None:
+        """Flush queued writes and stop the worker threads.
+
+        The wrapped store stays open; call ``store.close_pool()`` separately.
+        """
+        await self.flush()
+        await asyncio.to_thread(self._writer.shutdown, wait=True)
+        await asyncio.to_thread(self._readers.shutdown, wait=True)
+
+
+__all__ = ["AsyncMusicDataStore", "WRITE_METHODS"]
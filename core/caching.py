@@ -1,15 +1,28 @@
 """Caching system for Audora with Redis and local fallback.
 
 Provides a unified caching interface with Redis support and automatic
-fallback to in-memory caching when Redis is unavailable.
+fallback to in-memory caching when Redis is unavailable. With Redis, a small
+in-process tier sits in front of it and is kept coherent across processes via
+pub/sub. The fallback is thread-safe, and ``CacheManager`` offers
+``aget``/``aset``/``adelete`` for coroutines.
 """
 
+import asyncio
 import hashlib
+import heapq
+import inspect
 import json
 import logging
+import math
 import pickle
+import random
+import sys
+import threading
 import time
-from collections.abc import Callable
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from typing import Any, ParamSpec, TypeVar
 
@@ -25,6 +38,28 @@ except ImportError:
     REDIS_AVAILABLE = False
     logger.warning("Redis not available, using local cache fallback")
 
+# Container levels approximate_size walks into
+MAX_SIZE_DEPTH = 3
+
+# Stale expiry-heap records tolerated before the heap is rebuilt
+HEAP_COMPACT_SLACK = 64
+
+# Threads running stale-while-revalidate / early-expiry refreshes
+REFRESH_WORKERS = 4
+
+# Seconds a get_or_compute caller waits for another caller's computation
+FLIGHT_WAIT_TIMEOUT = 30.0
+
+# Counters kept by TieredCacheBackend
+TIER_METRICS = (
+    "l1_hits",
+    "l1_misses",
+    "l2_hits",
+    "l2_misses",
+    "invalidations_sent",
+    "invalidations_received",
+)
+
 P = ParamSpec("P")
 R = TypeVar("R")
 
@@ -32,6 +67,10 @@ R = TypeVar("R")
 class CacheBackend:
     """Base cache backend interface."""
 
+    # Whether calls can block on I/O; CacheManager's async methods run
+    # blocking backends in a worker thread and call in-memory ones directly
+    blocking_io = True
+
     def get(self, key: str) -> Any | None:
         """Get value from cache."""
         raise NotImplementedError
@@ -52,84 +91,334 @@ class CacheBackend:
         """Check if key exists in cache."""
         raise NotImplementedError
 
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Get several values; keys that are missing or expired are left out."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set_many(self, items: dict[str, Any], ttl: int | None = None) -> None:
+        """Set several values with the same optional TTL."""
+        for key, value in items.items():
+            self.set(key, value, ttl)
+
+    def delete_many(self, keys: list[str]) -> None:
+        """Delete several values."""
+        for key in keys:
+            self.delete(key)
+
+    def get_many_with_ttl(self, keys: list[str]) -> dict[str, tuple[Any, float | None]]:
+        """Get several values with their remaining TTL in seconds.
+
+        The TTL is None for keys without an expiry, or when the backend cannot
+        report it (the default).
+        """
+        return {key: (value, None) for key, value in self.get_many(keys).items()}
+
+    def publish(self, channel: str, message: str) -> None:
+        """Broadcast a message to every process sharing this backend (no-op by default)."""
+
+    def subscribe(self, channel: str, handler: Callable[[str], None]) -> Callable[[], None] | None:
+        """Call ``handler`` with each message published on ``channel``.
+
+        Returns:
+            A function that unsubscribes, or None if the backend cannot broadcast
+        """
+        return None
+
+
+def approximate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate the in-memory size of a cached value in bytes.
+
+    ``sys.getsizeof`` already counts the data of pandas and NumPy objects;
+    dicts, lists, tuples and sets are walked up to ``MAX_SIZE_DEPTH`` levels.
+    """
+    size = sys.getsizeof(value)
+    if _depth >= MAX_SIZE_DEPTH:
+        return size
+    if isinstance(value, dict):
+        size += sum(
+            approximate_size(k, _depth + 1) + approximate_size(v, _depth + 1)
+            for k, v in value.items()
+        )
+    elif isinstance(value, list | tuple | set | frozenset):
+        size += sum(approximate_size(item, _depth + 1) for item in value)
+    return size
+
+
+class _CacheEntry:
+    """A cached value with its expiry (monotonic seconds) and approximate size."""
+
+    __slots__ = ("value", "expiry", "size")
+
+    def __init__(self, value: Any, expiry: float | None, size: int) -> None:
+        self.value = value
+        self.expiry = expiry
+        self.size = size
+
 
 class LocalCacheBackend(CacheBackend):
     """In-memory cache backend with TTL support.
 
-    Uses dictionary for storage with automatic expiration.
+    Entries live in an ``OrderedDict`` kept in recency order, so hits
+    (``move_to_end``) and LRU eviction (``popitem``) are O(1). TTLs are
+    tracked in a min-heap of ``(expiry, key)`` that is drained lazily on
+    writes, reclaiming expired entries without scanning the cache. Capacity
+    is bounded by item count and, optionally, approximate bytes.
+
+    Not thread-safe; use ``ThreadSafeLocalCacheBackend`` when the cache is
+    shared between threads.
     """
 
-    def __init__(self, max_size: int = 1000) -> None:
+    blocking_io = False
+
+    def __init__(self, max_size: int = 1000, max_bytes: int | None = None) -> None:
         """Initialize local cache.
 
         Args:
             max_size: Maximum number of items to cache (LRU eviction)
+            max_bytes: Maximum approximate size of keys plus values (None for
+                no byte limit); a single value larger than this is not cached
         """
-        self._cache: dict[str, dict[str, Any]] = {}
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._expiry_heap: list[tuple[float, str]] = []
         self._max_size = max_size
-        self._access_times: dict[str, float] = {}
-        logger.info(f"Local cache initialized (max_size={max_size})")
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._evictions = 0
+        self._expirations = 0
+        logger.info(f"Local cache initialized (max_size={max_size}, max_bytes={max_bytes})")
 
     def get(self, key: str) -> Any | None:
         """Get value from cache."""
-        if key not in self._cache:
+        entry = self._entries.get(key)
+        if entry is None:
             return None
 
-        entry = self._cache[key]
-        expiry = entry.get("expiry")
-
         # Check if expired
-        if expiry and time.time() > expiry:
-            del self._cache[key]
-            if key in self._access_times:
-                del self._access_times[key]
+        if entry.expiry is not None and time.monotonic() > entry.expiry:
+            self._remove(key)
+            self._expirations += 1
             return None
 
-        # Update access time for LRU
-        self._access_times[key] = time.time()
-        return entry["value"]
+        # Mark as most recently used
+        self._entries.move_to_end(key)
+        return entry.value
 
     def set(self, key: str, value: Any, ttl: int | None = None) -> None:
         """Set value in cache with optional TTL."""
-        # Evict if cache is full
-        if len(self._cache) >= self._max_size and key not in self._cache:
-            self._evict_lru()
+        now = time.monotonic()
+        size = approximate_size(key) + approximate_size(value)
+        if self._max_bytes is not None and size > self._max_bytes:
+            self.delete(key)
+            logger.debug(f"Not caching {key}: {size} bytes exceeds max_bytes")
+            return
+
+        self._remove(key)
+        self._purge_expired(now)
 
-        expiry = time.time() + ttl if ttl else None
-        self._cache[key] = {"value": value, "expiry": expiry}
-        self._access_times[key] = time.time()
+        expiry = now + ttl if ttl else None
+        self._entries[key] = _CacheEntry(value, expiry, size)
+        self._bytes += size
+        if expiry is not None:
+            heapq.heappush(self._expiry_heap, (expiry, key))
+
+        # Evict least recently used entries until both limits hold
+        while len(self._entries) > self._max_size or (
+            self._max_bytes is not None and self._bytes > self._max_bytes
+        ):
+            lru_key, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self._evictions += 1
+            logger.debug(f"Evicted LRU cache entry: {lru_key}")
 
     def delete(self, key: str) -> None:
         """Delete value from cache."""
-        if key in self._cache:
-            del self._cache[key]
-        if key in self._access_times:
-            del self._access_times[key]
+        self._remove(key)
 
     def clear(self) -> None:
         """Clear all cached values."""
-        count = len(self._cache)
-        self._cache.clear()
-        self._access_times.clear()
+        count = len(self._entries)
+        self._entries.clear()
+        self._expiry_heap.clear()
+        self._bytes = 0
         logger.debug(f"Cleared {count} items from local cache")
 
     def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
         return self.get(key) is not None
 
-    def _evict_lru(self) -> None:
-        """Evict least recently used item."""
-        if not self._access_times:
-            return
+    def get_many_with_ttl(self, keys: list[str]) -> dict[str, tuple[Any, float | None]]:
+        """Get several values with their remaining TTL in seconds."""
+        now = time.monotonic()
+        found = {}
+        for key, value in self.get_many(keys).items():
+            expiry = self._entries[key].expiry
+            found[key] = (value, None if expiry is None else expiry - now)
+        return found
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return item and byte counts, limits, evictions and expirations."""
+        return {
+            "items": len(self._entries),
+            "bytes": self._bytes,
+            "max_size": self._max_size,
+            "max_bytes": self._max_bytes,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+        }
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry if present; its heap record goes stale and is skipped later."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _purge_expired(self, now: float) -> None:
+        """Remove every entry whose TTL has passed, earliest expiry first."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expiry, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            # Skip records for keys deleted or re-set since they were pushed
+            if entry is not None and entry.expiry == expiry:
+                self._remove(key)
+                self._expirations += 1
+
+        # Overwrites leave stale records behind; rebuild once they dominate
+        if len(heap) > 2 * len(self._entries) + HEAP_COMPACT_SLACK:
+            self._expiry_heap = [
+                (entry.expiry, key)
+                for key, entry in self._entries.items()
+                if entry.expiry is not None
+            ]
+            heapq.heapify(self._expiry_heap)
+
+
+class ThreadSafeLocalCacheBackend(CacheBackend):
+    """Thread-safe in-memory cache built from lock-striped ``LocalCacheBackend`` segments.
+
+    Keys are hashed onto ``stripes`` independent segments, each guarded by its
+    own lock, so threads touching different keys rarely contend. Capacity is
+    split evenly across segments and LRU order is kept per segment, which
+    makes eviction approximately (not strictly) least recently used.
+    """
+
+    blocking_io = False
+
+    def __init__(
+        self, max_size: int = 1000, max_bytes: int | None = None, stripes: int = 16
+    ) -> None:
+        """Initialize the striped cache.
+
+        Args:
+            max_size: Maximum number of items across all segments
+            max_bytes: Maximum approximate size across all segments (None for no limit)
+            stripes: Number of independently locked segments
+        """
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+
+        segment_size = max(1, -(-max_size // stripes))
+        segment_bytes = None if max_bytes is None else max(1, max_bytes // stripes)
+        self._segments = [
+            LocalCacheBackend(max_size=segment_size, max_bytes=segment_bytes)
+            for _ in range(stripes)
+        ]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def _stripe(self, key: str) -> int:
+        """Index of the segment that owns ``key``."""
+        return hash(key) % len(self._segments)
+
+    def get(self, key: str) -> Any | None:
+        """Get value from cache."""
+        i = self._stripe(key)
+        with self._locks[i]:
+            return self._segments[i].get(key)
+
+    def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        """Set value in cache with optional TTL."""
+        i = self._stripe(key)
+        with self._locks[i]:
+            self._segments[i].set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        """Delete value from cache."""
+        i = self._stripe(key)
+        with self._locks[i]:
+            self._segments[i].delete(key)
+
+    def clear(self) -> None:
+        """Clear all cached values."""
+        for lock, segment in zip(self._locks, self._segments, strict=True):
+            with lock:
+                segment.clear()
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists in cache."""
+        return self.get(key) is not None
 
-        lru_key = min(self._access_times.items(), key=lambda x: x[1])[0]
-        self.delete(lru_key)
-        logger.debug(f"Evicted LRU cache entry: {lru_key}")
+    def _group_by_stripe(self, keys: Iterable[str]) -> dict[int, list[str]]:
+        """Keys grouped by owning segment, so each lock is taken once per batch."""
+        groups: dict[int, list[str]] = {}
+        for key in keys:
+            groups.setdefault(self._stripe(key), []).append(key)
+        return groups
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Get several values, locking each segment once."""
+        found: dict[str, Any] = {}
+        for i, group in self._group_by_stripe(keys).items():
+            with self._locks[i]:
+                found.update(self._segments[i].get_many(group))
+        return found
+
+    def set_many(self, items: dict[str, Any], ttl: int | None = None) -> None:
+        """Set several values, locking each segment once."""
+        for i, group in self._group_by_stripe(items).items():
+            with self._locks[i]:
+                self._segments[i].set_many({key: items[key] for key in group}, ttl)
+
+    def delete_many(self, keys: list[str]) -> None:
+        """Delete several values, locking each segment once."""
+        for i, group in self._group_by_stripe(keys).items():
+            with self._locks[i]:
+                self._segments[i].delete_many(group)
+
+    def get_many_with_ttl(self, keys: list[str]) -> dict[str, tuple[Any, float | None]]:
+        """Get several values with their remaining TTL, locking each segment once."""
+        found: dict[str, tuple[Any, float | None]] = {}
+        for i, group in self._group_by_stripe(keys).items():
+            with self._locks[i]:
+                found.update(self._segments[i].get_many_with_ttl(group))
+        return found
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return item and byte counts, limits, evictions and expirations summed over segments."""
+        segments = []
+        for lock, segment in zip(self._locks, self._segments, strict=True):
+            with lock:
+                segments.append(segment.get_stats())
+
+        totals: dict[str, Any] = {
+            name: sum(stats[name] for stats in segments)
+            for name in ("items", "bytes", "max_size", "evictions", "expirations")
+        }
+        limited = segments[0]["max_bytes"] is not None
+        totals["max_bytes"] = sum(s["max_bytes"] for s in segments) if limited else None
+        totals["stripes"] = len(segments)
+        return totals
 
 
 class RedisCacheBackend(CacheBackend):
     """Redis cache backend with connection pooling."""
 
+    blocking_io = True
+
     def __init__(
         self,
         host: str = "localhost",
@@ -213,6 +502,294 @@ class RedisCacheBackend(CacheBackend):
             logger.error(f"Redis exists error for key {key}: {e}")
             return False
 
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Get several values with one ``MGET``."""
+        if not keys:
+            return {}
+        try:
+            values = self._client.mget(keys)
+            return {
+                key: pickle.loads(value)
+                for key, value in zip(keys, values, strict=True)
+                if value is not None
+            }
+        except Exception as e:
+            logger.error(f"Redis mget error for {len(keys)} keys: {e}")
+            return {}
+
+    def set_many(self, items: dict[str, Any], ttl: int | None = None) -> None:
+        """Set several values in one pipelined round trip."""
+        if not items:
+            return
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in items.items():
+                serialized = pickle.dumps(value)
+                if ttl:
+                    pipe.setex(key, ttl, serialized)
+                else:
+                    pipe.set(key, serialized)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis pipelined set error for {len(items)} keys: {e}")
+
+    def delete_many(self, keys: list[str]) -> None:
+        """Delete several values with one ``DEL``."""
+        if not keys:
+            return
+        try:
+            self._client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Redis delete error for {len(keys)} keys: {e}")
+
+    def get_many_with_ttl(self, keys: list[str]) -> dict[str, tuple[Any, float | None]]:
+        """Get several values and their ``PTTL`` in one pipelined round trip."""
+        if not keys:
+            return {}
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.mget(keys)
+            for key in keys:
+                pipe.pttl(key)
+            values, *pttls = pipe.execute()
+            # PTTL is -1 for keys without an expiry
+            return {
+                key: (pickle.loads(value), pttl / 1000 if pttl >= 0 else None)
+                for key, value, pttl in zip(keys, values, pttls, strict=True)
+                if value is not None
+            }
+        except Exception as e:
+            logger.error(f"Redis mget/pttl error for {len(keys)} keys: {e}")
+            return {}
+
+    def publish(self, channel: str, message: str) -> None:
+        """Publish a message on a Redis pub/sub channel."""
+        try:
+            self._client.publish(channel, message)
+        except Exception as e:
+            logger.error(f"Redis publish error on {channel}: {e}")
+
+    def subscribe(self, channel: str, handler: Callable[[str], None]) -> Callable[[], None] | None:
+        """Deliver messages on ``channel`` to ``handler`` from a daemon thread."""
+
+        def on_error(error: Exception, pubsub: Any, thread: Any) -> None:
+            # Keep listening; redis-py re-subscribes when the connection returns
+            logger.error(f"Redis subscription error on {channel}: {error}")
+            time.sleep(1.0)
+
+        try:
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{channel: lambda message: handler(message["data"].decode())})
+            thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True, exception_handler=on_error)
+        except Exception as e:
+            logger.error(f"Redis subscribe error on {channel}: {e}")
+            return None
+
+        def unsubscribe() -> None:
+            thread.stop()
+            pubsub.close()
+
+        return unsubscribe
+
+
+class TieredCacheBackend(CacheBackend):
+    """Small in-process L1 cache in front of a shared L2 (normally Redis).
+
+    Reads hit L1 first and fall back to L2, copying L2 hits into L1 for no
+    longer than the key has left in L2. Writes go
+    to L2 and L1; writes, deletes and clears are broadcast on
+    ``invalidation_channel`` through the L2's pub/sub so other processes drop
+    the key from their L1. Broadcasts are fire-and-forget, so L1 entries also
+    expire after ``l1_ttl`` seconds, which bounds how stale a missed
+    invalidation can leave them.
+    """
+
+    blocking_io = True
+
+    def __init__(
+        self,
+        l2: CacheBackend,
+        l1: CacheBackend | None = None,
+        l1_ttl: int = 30,
+        invalidation_channel: str = "audora:cache:invalidate",
+    ) -> None:
+        """Initialize the tiered cache and subscribe to invalidations.
+
+        Args:
+            l2: Shared backend (e.g. ``RedisCacheBackend``)
+            l1: In-process backend (defaults to a 1024-entry ``ThreadSafeLocalCacheBackend``)
+            l1_ttl: Maximum seconds an entry lives in L1
+            invalidation_channel: Pub/sub channel for invalidation messages
+        """
+        self._l2 = l2
+        self._l1 = l1 if l1 is not None else ThreadSafeLocalCacheBackend(max_size=1024)
+        self._l1_ttl = l1_ttl
+        self._channel = invalidation_channel
+        self._node_id = uuid.uuid4().hex
+        self._metrics = dict.fromkeys(TIER_METRICS, 0)
+        self._metrics_lock = threading.Lock()
+        self._unsubscribe = l2.subscribe(invalidation_channel, self._on_invalidation)
+        if self._unsubscribe is None:
+            logger.warning("L2 cache cannot broadcast; L1 entries rely on l1_ttl for freshness")
+
+    def _count(self, metric: str, n: int = 1) -> None:
+        with self._metrics_lock:
+            self._metrics[metric] += n
+
+    def _l1_ttl_for(self, ttl: float | None) -> float:
+        return min(ttl, self._l1_ttl) if ttl else self._l1_ttl
+
+    def _promote(self, fetched: dict[str, tuple[Any, float | None]]) -> dict[str, Any]:
+        """Copy L2 hits into L1, capped at each key's remaining L2 TTL.
+
+        Returns:
+            The fetched values without their TTLs
+        """
+        by_ttl: dict[float, dict[str, Any]] = {}
+        for key, (value, remaining) in fetched.items():
+            # Keys about to expire in L2 are returned but not cached
+            if remaining is None or remaining > 0:
+                by_ttl.setdefault(self._l1_ttl_for(remaining), {})[key] = value
+        for ttl, items in by_ttl.items():
+            self._l1.set_many(items, ttl)
+        return {key: value for key, (value, _) in fetched.items()}
+
+    def _broadcast(self, op: str, keys: list[str] | None = None) -> None:
+        """Tell other processes to drop ``keys`` (or everything) from their L1."""
+        message = json.dumps({"origin": self._node_id, "op": op, "keys": keys or []})
+        self._l2.publish(self._channel, message)
+        self._count("invalidations_sent")
+
+    def _on_invalidation(self, message: str) -> None:
+        """Apply an invalidation published by another process."""
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            logger.warning(f"Ignoring malformed cache invalidation: {message!r}")
+            return
+        if payload.get("origin") == self._node_id:
+            return
+        if payload.get("op") == "clear":
+            self._l1.clear()
+        else:
+            for key in payload.get("keys", []):
+                self._l1.delete(key)
+        self._count("invalidations_received")
+
+    def get(self, key: str) -> Any | None:
+        """Get value from L1, falling back to L2."""
+        value = self._l1.get(key)
+        if value is not None:
+            self._count("l1_hits")
+            return value
+        self._count("l1_misses")
+
+        fetched = self._l2.get_many_with_ttl([key])
+        if key not in fetched:
+            self._count("l2_misses")
+            return None
+        self._count("l2_hits")
+        return self._promote(fetched)[key]
+
+    def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        """Set value in both tiers and invalidate it in other processes' L1."""
+        self._l2.set(key, value, ttl)
+        self._l1.set(key, value, self._l1_ttl_for(ttl))
+        self._broadcast("delete", [key])
+
+    def delete(self, key: str) -> None:
+        """Delete value from both tiers and from other processes' L1."""
+        self._l2.delete(key)
+        self._l1.delete(key)
+        self._broadcast("delete", [key])
+
+    def clear(self) -> None:
+        """Clear both tiers here and L1 everywhere."""
+        self._l2.clear()
+        self._l1.clear()
+        self._broadcast("clear")
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists in either tier."""
+        return self._l1.exists(key) or self._l2.exists(key)
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Get several values from L1, fetching the rest from L2 in one batch."""
+        found = self._l1.get_many(keys)
+        self._count("l1_hits", len(found))
+        missing = [key for key in keys if key not in found]
+        if not missing:
+            return found
+        self._count("l1_misses", len(missing))
+
+        fetched = self._l2.get_many_with_ttl(missing)
+        self._count("l2_hits", len(fetched))
+        self._count("l2_misses", len(missing) - len(fetched))
+        found.update(self._promote(fetched))
+        return found
+
+    def set_many(self, items: dict[str, Any], ttl: int | None = None) -> None:
+        """Set several values in both tiers with a single invalidation broadcast."""
+        if not items:
+            return
+        self._l2.set_many(items, ttl)
+        self._l1.set_many(items, self._l1_ttl_for(ttl))
+        self._broadcast("delete", list(items))
+
+    def delete_many(self, keys: list[str]) -> None:
+        """Delete several values from both tiers with a single invalidation broadcast."""
+        if not keys:
+            return
+        self._l2.delete_many(keys)
+        self._l1.delete_many(keys)
+        self._broadcast("delete", list(keys))
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return per-tier hit/miss counts and ratios, invalidation counts and L1 stats."""
+        with self._metrics_lock:
+            stats: dict[str, Any] = dict(self._metrics)
+        lookups = stats["l1_hits"] + stats["l1_misses"]
+        stats["l1_hit_ratio"] = stats["l1_hits"] / lookups if lookups else 0.0
+        l2_lookups = stats["l2_hits"] + stats["l2_misses"]
+        stats["l2_hit_ratio"] = stats["l2_hits"] / l2_lookups if l2_lookups else 0.0
+        stats["hit_ratio"] = (stats["l1_hits"] + stats["l2_hits"]) / lookups if lookups else 0.0
+        if hasattr(self._l1, "get_stats"):
+            stats["l1"] = self._l1.get_stats()
+        return stats
+
+    def close(self) -> None:
+        """Stop listening for invalidations."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+
+class _CachedValue:
+    """A computed result with its logical expiry (epoch seconds) and compute time.
+
+    Stored by ``get_or_compute``; the backend keeps it past ``expires_at`` for
+    the stale-while-revalidate window.
+    """
+
+    __slots__ = ("value", "expires_at", "delta")
+
+    def __init__(self, value: Any, expires_at: float, delta: float) -> None:
+        self.value = value
+        self.expires_at = expires_at
+        self.delta = delta
+
+
+class _Flight:
+    """One in-progress computation that concurrent callers wait on."""
+
+    __slots__ = ("done", "value", "error", "owner")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+        self.owner: int | None = None  # ident of the thread running the compute
+
 
 class CacheManager:
     """High-level cache manager with automatic backend selection.
@@ -225,6 +802,8 @@ class CacheManager:
         backend: CacheBackend | None = None,
         default_ttl: int = 3600,
         key_prefix: str = "audora",
+        l1_max_size: int = 1024,
+        l1_ttl: int = 30,
     ) -> None:
         """Initialize cache manager.
 
@@ -232,6 +811,9 @@ class CacheManager:
             backend: Custom cache backend (auto-detected if None)
             default_ttl: Default TTL in seconds (1 hour default)
             key_prefix: Prefix for all cache keys
+            l1_max_size: Entries in the in-process tier kept in front of an
+                auto-detected Redis backend (0 to talk to Redis directly)
+            l1_ttl: Maximum seconds an entry lives in that in-process tier
         """
         if backend:
             self._backend = backend
@@ -239,18 +821,33 @@ class CacheManager:
             # Try Redis first, fall back to local cache
             if REDIS_AVAILABLE:
                 try:
-                    self._backend = RedisCacheBackend()
-                    logger.info("Using Redis cache backend")
+                    redis_backend = RedisCacheBackend()
+                    if l1_max_size > 0:
+                        self._backend = TieredCacheBackend(
+                            redis_backend,
+                            ThreadSafeLocalCacheBackend(max_size=l1_max_size),
+                            l1_ttl=l1_ttl,
+                        )
+                        logger.info("Using Redis cache backend with in-process L1")
+                    else:
+                        self._backend = redis_backend
+                        logger.info("Using Redis cache backend")
                 except Exception as e:
                     logger.warning(f"Redis initialization failed: {e}, using local cache")
-                    self._backend = LocalCacheBackend()
+                    self._backend = ThreadSafeLocalCacheBackend()
             else:
-                self._backend = LocalCacheBackend()
+                self._backend = ThreadSafeLocalCacheBackend()
                 logger.info("Using local cache backend")
 
         self.default_ttl = default_ttl
         self.key_prefix = key_prefix
 
+        # Single-flight state for get_or_compute / aget_or_compute
+        self._flights: dict[str, _Flight] = {}
+        self._async_flights: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Task] = {}
+        self._flights_lock = threading.Lock()
+        self._refresh_executor: ThreadPoolExecutor | None = None
+
     def _make_key(self, key: str) -> str:
         """Create prefixed cache key."""
         return f"{self.key_prefix}:{key}"
@@ -266,6 +863,8 @@ class CacheManager:
         """
         full_key = self._make_key(key)
         value = self._backend.get(full_key)
+        if isinstance(value, _CachedValue):
+            value = value.value if time.time() < value.expires_at else None
         if value is not None:
             logger.debug(f"Cache hit: {key}")
         else:
@@ -311,15 +910,310 @@ class CacheManager:
         full_key = self._make_key(key)
         return self._backend.exists(full_key)
 
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Get several values in one backend call.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Key -> value for the keys found (missing or expired keys are left out)
+        """
+        full_keys = {self._make_key(key): key for key in keys}
+        found = {}
+        now = time.time()
+        for full_key, value in self._backend.get_many(list(full_keys)).items():
+            if isinstance(value, _CachedValue):
+                value = value.value if now < value.expires_at else None
+            if value is not None:
+                found[full_keys[full_key]] = value
+        logger.debug(f"Cache get_many: {len(found)}/{len(full_keys)} hits")
+        return found
+
+    def set_many(self, items: dict[str, Any], ttl: int | None = None) -> None:
+        """Set several values in one backend call.
+
+        Args:
+            items: Key -> value (values must be picklable)
+            ttl: Time to live in seconds (uses default_ttl if None)
+        """
+        ttl = ttl if ttl is not None else self.default_ttl
+        self._backend.set_many({self._make_key(key): value for key, value in items.items()}, ttl)
+        logger.debug(f"Cached {len(items)} keys (TTL: {ttl}s)")
+
+    def delete_many(self, keys: list[str]) -> None:
+        """Delete several values in one backend call."""
+        self._backend.delete_many([self._make_key(key) for key in keys])
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return the backend's statistics (hit/miss per tier, sizes), if it keeps any."""
+        stats = {"backend": type(self._backend).__name__}
+        if hasattr(self._backend, "get_stats"):
+            stats.update(self._backend.get_stats())
+        return stats
+
+    async def _run(self, func: Callable[..., R], *args: Any) -> R:
+        """Call a cache method from a coroutine.
+
+        Blocking backends (e.g. Redis) run in a worker thread; in-memory ones
+        are called directly, since their operations take microseconds, far
+        less than a thread hand-off.
+        """
+        if self._backend.blocking_io:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    async def aget(self, key: str) -> Any | None:
+        """Async ``get``; blocking backends run in a worker thread."""
+        return await self._run(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl: int | None = None) -> None:
+        """Async ``set``; blocking backends run in a worker thread."""
+        await self._run(self.set, key, value, ttl)
+
+    async def adelete(self, key: str) -> None:
+        """Async ``delete``; blocking backends run in a worker thread."""
+        await self._run(self.delete, key)
+
+    async def aget_many(self, keys: list[str]) -> dict[str, Any]:
+        """Async ``get_many``; blocking backends run in a worker thread."""
+        return await self._run(self.get_many, keys)
+
+    async def aset_many(self, items: dict[str, Any], ttl: int | None = None) -> None:
+        """Async ``set_many``; blocking backends run in a worker thread."""
+        await self._run(self.set_many, items, ttl)
+
+    # SINGLE-FLIGHT COMPUTATION
+
+    def _lookup(
+        self, envelope: Any, stale_ttl: int | None, early_expiry: float
+    ) -> tuple[bool, bool]:
+        """Classify a stored envelope.
+
+        Returns:
+            (usable, refresh): whether the cached value can be returned, and
+            whether a background refresh should start
+        """
+        if not isinstance(envelope, _CachedValue) or envelope.value is None:
+            return False, False
+        now = time.time()
+        if now >= envelope.expires_at:
+            # Expired: serve it only inside the stale-while-revalidate window
+            return bool(stale_ttl), True
+        if early_expiry > 0:
+            # XFetch: refresh early with a probability that grows as expiry
+            # nears and with how long the value took to compute
+            jitter = -envelope.delta * early_expiry * math.log(1.0 - random.random())
+            return True, now + jitter >= envelope.expires_at
+        return True, False
+
+    def _store(
+        self, full_key: str, value: Any, ttl: int, stale_ttl: int | None, delta: float
+    ) -> None:
+        """Write a computed value wrapped with its expiry and compute time."""
+        if value is None:
+            return  # like ``cached``, None results are not cached
+        envelope = _CachedValue(value, time.time() + ttl, delta)
+        self._backend.set(full_key, envelope, ttl + (stale_ttl or 0))
+
+    def _run_flight(
+        self,
+        full_key: str,
+        flight: _Flight,
+        compute: Callable[[], R],
+        ttl: int,
+        stale_ttl: int | None,
+        background: bool = False,
+    ) -> None:
+        """Compute a value for a registered flight, cache it and wake the waiters."""
+        flight.owner = threading.get_ident()
+        try:
+            start = time.monotonic()
+            flight.value = compute()
+            self._store(full_key, flight.value, ttl, stale_ttl, time.monotonic() - start)
+        except BaseException as e:
+            flight.error = e
+            if background:
+                logger.warning(f"Background cache refresh failed for {full_key}: {e}")
+        finally:
+            with self._flights_lock:
+                self._flights.pop(full_key, None)
+            flight.done.set()
+
+    def _refresh_in_background(
+        self, full_key: str, compute: Callable[[], R], ttl: int, stale_ttl: int | None
+    ) -> None:
+        """Start a refresh on the refresh pool unless one is already running for the key."""
+        with self._flights_lock:
+            if full_key in self._flights:
+                return
+            flight = self._flights[full_key] = _Flight()
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=REFRESH_WORKERS, thread_name_prefix="cache-refresh"
+                )
+        self._refresh_executor.submit(
+            self._run_flight, full_key, flight, compute, ttl, stale_ttl, True
+        )
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], R],
+        ttl: int | None = None,
+        stale_ttl: int | None = None,
+        early_expiry: float = 0.0,
+        wait_timeout: float = FLIGHT_WAIT_TIMEOUT,
+    ) -> R:
+        """Return the cached value for ``key``, computing it at most once at a time.
+
+        Concurrent misses for the same key are coalesced (single-flight): one
+        caller runs ``compute`` and the others wait for its result (or error).
+        A waiter gives up after ``wait_timeout`` seconds and computes the value
+        itself. A ``compute`` that requests its own key runs the nested call
+        directly instead of waiting on itself.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument function producing the value
+            ttl: Time to live in seconds (uses default_ttl if None)
+            stale_ttl: Seconds past expiry during which the old value is still
+                returned while a background refresh runs (stale-while-revalidate)
+            early_expiry: XFetch ``beta``; above 0, values are refreshed in the
+                background shortly before they expire, spreading refreshes of
+                hot keys instead of stampeding at expiry (1.0 is typical)
+            wait_timeout: Seconds to wait for another caller's computation
+
+        Returns:
+            The cached or freshly computed value
+        """
+        full_key = self._make_key(key)
+        ttl = ttl if ttl is not None else self.default_ttl
+
+        envelope = self._backend.get(full_key)
+        usable, refresh = self._lookup(envelope, stale_ttl, early_expiry)
+        if usable:
+            if refresh:
+                self._refresh_in_background(full_key, compute, ttl, stale_ttl)
+            logger.debug(f"Cache hit: {key}")
+            return envelope.value
+
+        logger.debug(f"Cache miss: {key}")
+        with self._flights_lock:
+            flight = self._flights.get(full_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[full_key] = _Flight()
+
+        if leader:
+            self._run_flight(full_key, flight, compute, ttl, stale_ttl)
+        elif flight.owner == threading.get_ident():
+            # Re-entered from this key's own compute; waiting would deadlock
+            return compute()
+        elif not flight.done.wait(wait_timeout):
+            logger.warning(f"Timed out waiting for {key} to be computed; computing it here")
+            start = time.monotonic()
+            value = compute()
+            self._store(full_key, value, ttl, stale_ttl, time.monotonic() - start)
+            return value
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    async def _arun_flight(
+        self,
+        full_key: str,
+        compute: Callable[[], Awaitable[R]],
+        ttl: int,
+        stale_ttl: int | None,
+    ) -> R:
+        """Body of an async flight task: compute, cache and deregister."""
+        try:
+            start = time.monotonic()
+            value = await compute()
+            delta = time.monotonic() - start
+            if self._backend.blocking_io:
+                await asyncio.to_thread(self._store, full_key, value, ttl, stale_ttl, delta)
+            else:
+                self._store(full_key, value, ttl, stale_ttl, delta)
+            return value
+        finally:
+            self._async_flights.pop((asyncio.get_running_loop(), full_key), None)
+
+    def _async_flight(
+        self,
+        full_key: str,
+        compute: Callable[[], Awaitable[R]],
+        ttl: int,
+        stale_ttl: int | None,
+    ) -> tuple[asyncio.Task, bool]:
+        """Return the running flight task for a key on this loop, starting one if needed.
+
+        Returns:
+            (task, started): started is True when this call created the task
+        """
+        loop = asyncio.get_running_loop()
+        task = self._async_flights.get((loop, full_key))
+        if task is not None:
+            return task, False
+        task = loop.create_task(self._arun_flight(full_key, compute, ttl, stale_ttl))
+        self._async_flights[(loop, full_key)] = task
+        return task, True
+
+    async def aget_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[R]],
+        ttl: int | None = None,
+        stale_ttl: int | None = None,
+        early_expiry: float = 0.0,
+    ) -> R:
+        """Async ``get_or_compute`` for coroutine functions.
+
+        Coalesces concurrent misses per event loop: one task runs ``compute``
+        and every waiter awaits it, shielded so a cancelled caller does not
+        cancel the shared computation. See ``get_or_compute`` for arguments.
+        """
+        full_key = self._make_key(key)
+        ttl = ttl if ttl is not None else self.default_ttl
+
+        if self._backend.blocking_io:
+            envelope = await asyncio.to_thread(self._backend.get, full_key)
+        else:
+            envelope = self._backend.get(full_key)
+        usable, refresh = self._lookup(envelope, stale_ttl, early_expiry)
+        if usable:
+            if refresh:
+                task, started = self._async_flight(full_key, compute, ttl, stale_ttl)
+                if started:
+                    task.add_done_callback(_log_refresh_failure)
+            logger.debug(f"Cache hit: {key}")
+            return envelope.value
+
+        logger.debug(f"Cache miss: {key}")
+        task, _ = self._async_flight(full_key, compute, ttl, stale_ttl)
+        return await asyncio.shield(task)
+
     def cached(
-        self, key_prefix: str = "", ttl: int | None = None, key_builder: Callable | None = None
+        self,
+        key_prefix: str = "",
+        ttl: int | None = None,
+        key_builder: Callable | None = None,
+        stale_ttl: int | None = None,
+        early_expiry: float = 0.0,
     ) -> Callable[[Callable[P, R]], Callable[P, R]]:
         """Decorator for caching function results.
 
+        Works on plain and ``async`` functions. Concurrent calls that miss on
+        the same key share one computation (see ``get_or_compute``).
+
         Args:
             key_prefix: Prefix for cache key (defaults to function name)
             ttl: Time to live in seconds (uses default_ttl if None)
             key_builder: Custom function to build cache key from args/kwargs
+            stale_ttl: Serve expired results for this many seconds while a
+                background refresh runs
+            early_expiry: XFetch ``beta`` for probabilistic early refresh (0 disables)
 
         Returns:
             Decorated function
@@ -342,23 +1236,123 @@ class CacheManager:
         def decorator(func: Callable[P, R]) -> Callable[P, R]:
             prefix = key_prefix or func.__name__
 
+            def build_key(args: tuple, kwargs: dict) -> str:
+                if key_builder:
+                    return f"{prefix}:{key_builder(*args, **kwargs)}"
+                return self._build_cache_key(prefix, args, kwargs)
+
+            if inspect.iscoroutinefunction(func):
+
+                @wraps(func)
+                async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+                    return await self.aget_or_compute(
+                        build_key(args, kwargs),
+                        lambda: func(*args, **kwargs),
+                        ttl,
+                        stale_ttl,
+                        early_expiry,
+                    )
+
+                return async_wrapper
+
             @wraps(func)
             def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-                # Build cache key
+                return self.get_or_compute(
+                    build_key(args, kwargs),
+                    lambda: func(*args, **kwargs),
+                    ttl,
+                    stale_ttl,
+                    early_expiry,
+                )
+
+            return wrapper
+
+        return decorator
+
+    def cached_batch(
+        self,
+        key_prefix: str = "",
+        ttl: int | None = None,
+        key_builder: Callable[[Any], str] | None = None,
+    ) -> Callable[[Callable[..., Any]], Callable[..., list[Any]]]:
+        """Decorator caching a batch function per input item.
+
+        The decorated function takes a list of items as its first argument
+        (plus any other arguments, which become part of each key) and returns
+        either a list of results aligned with the items or a dict keyed by
+        item. The wrapper looks every item up with one ``get_many``, calls the
+        function once with only the misses, stores their results with one
+        ``set_many`` and returns a list aligned with the original items. Works
+        on plain and ``async`` functions.
+
+        Args:
+            key_prefix: Prefix for cache keys (defaults to function name)
+            ttl: Time to live in seconds (uses default_ttl if None)
+            key_builder: Custom function building the key part for one item
+
+        Returns:
+            Decorated function
+
+        Example:
+            ```python
+            @cache.cached_batch(ttl=3600)
+            def artist_info(names: list[str]) -> dict[str, dict]:
+                return api.lookup_artists(names)  # one request for all misses
+
+            artist_info(["Adele", "Drake"])  # fetches both
+            artist_info(["Adele", "Lorde"])  # fetches only Lorde
+            ```
+        """
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., list[Any]]:
+            prefix = key_prefix or func.__name__
+
+            def plan(items: list[Any], args: tuple, kwargs: dict) -> tuple[list[str], list[Any]]:
+                """Per-item keys, and the distinct items to compute if they miss."""
                 if key_builder:
-                    cache_key = f"{prefix}:{key_builder(*args, **kwargs)}"
+                    keys = [f"{prefix}:{key_builder(item)}" for item in items]
                 else:
-                    cache_key = self._build_cache_key(prefix, args, kwargs)
-
-                # Try to get from cache
-                cached_value = self.get(cache_key)
-                if cached_value is not None:
-                    return cached_value
+                    keys = [self._build_cache_key(prefix, (item, *args), kwargs) for item in items]
+                return keys, list(dict(zip(keys, items, strict=True)).items())
+
+            def absorb(pending: list[tuple[str, Any]], computed: Any) -> dict[str, Any]:
+                """Match computed results to their keys."""
+                if isinstance(computed, Mapping):
+                    return {key: computed.get(item) for key, item in pending}
+                return {key: value for (key, _), value in zip(pending, computed, strict=True)}
+
+            def cacheable(results: dict[str, Any]) -> dict[str, Any]:
+                return {key: value for key, value in results.items() if value is not None}
+
+            if inspect.iscoroutinefunction(func):
+
+                @wraps(func)
+                async def async_wrapper(items: Any, *args: Any, **kwargs: Any) -> list[Any]:
+                    items = list(items)
+                    keys, distinct = plan(items, args, kwargs)
+                    found = await self.aget_many(list(dict(distinct)))
+                    pending = [(key, item) for key, item in distinct if key not in found]
+                    if pending:
+                        computed = absorb(
+                            pending, await func([item for _, item in pending], *args, **kwargs)
+                        )
+                        await self.aset_many(cacheable(computed), ttl)
+                        found.update(computed)
+                    return [found.get(key) for key in keys]
+
+                return async_wrapper
 
-                # Compute and cache
-                result = func(*args, **kwargs)
-                self.set(cache_key, result, ttl)
-                return result
+            @wraps(func)
+            def wrapper(items: Any, *args: Any, **kwargs: Any) -> list[Any]:
+                items = list(items)
+                keys, distinct = plan(items, args, kwargs)
+                found = self.get_many(list(dict(distinct)))
+                pending = [(key, item) for key, item in distinct if key not in found]
+                if pending:
+                    computed = absorb(pending, func([item for _, item in pending], *args, **kwargs))
+                    self.set_many(cacheable(computed), ttl)
+                    found.update(computed)
+                return [found.get(key) for key in keys]
 
             return wrapper
 
@@ -382,6 +1376,12 @@ class CacheManager:
         return ":".join(key_parts)
 
 
+def _log_refresh_failure(task: asyncio.Task) -> None:
+    """Done-callback for background refresh tasks nobody awaits."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Background cache refresh failed: {task.exception()}")
+
+
 # Global cache instance
 _global_cache: CacheManager | None = None
 
@@ -425,6 +1425,9 @@ __all__ = [
     "CacheBackend",
     "LocalCacheBackend",
     "RedisCacheBackend",
+    "ThreadSafeLocalCacheBackend",
+    "TieredCacheBackend",
+    "approximate_size",
     "get_cache",
     "reset_cache",
 ]
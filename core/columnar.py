@@ -0,0 +1,164 @@
+"""Arrow/Parquet helpers for streaming SQLite tables to columnar files.
+
+Used by ``EnhancedMusicDataStore`` to export tables as partitioned Parquet
+datasets in bounded memory and to read those snapshots back. Requires the
+optional ``pyarrow`` package.
+"""
+
+import logging
+import sqlite3
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def require_pyarrow() -> None:
+    """Raise ImportError with an install hint if pyarrow is missing."""
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for Parquet/Arrow support: pip install pyarrow")
+
+
+def _arrow_type(declared_type: str) -> "pa.DataType":
+    """Map a SQLite declared column type to an Arrow type."""
+    declared = declared_type.upper()
+    if "INT" in declared or "BOOL" in declared:
+        return pa.int64()
+    if "REAL" in declared or "FLOA" in declared or "DOUB" in declared:
+        return pa.float64()
+    return pa.string()
+
+
+def table_schema(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: Sequence[str] | None = None,
+    extra: Sequence[str] = (),
+) -> "pa.Schema":
+    """Build an Arrow schema from a SQLite table definition.
+
+    Args:
+        conn: Open connection
+        table: Table name (must already be validated by the caller)
+        columns: Optional projection; defaults to every column in table order
+        extra: Names of additional computed string columns (e.g. partition keys)
+
+    Returns:
+        Arrow schema with one field per column
+    """
+    require_pyarrow()
+    # table_xinfo also lists generated columns; row[6] is non-zero for those
+    info = list(conn.execute(f"PRAGMA table_xinfo({table})"))
+    declared = {row[1]: row[2] or "" for row in info}
+    names = list(columns) if columns else [row[1] for row in info if not row[6]]
+    fields = [pa.field(name, _arrow_type(declared.get(name, ""))) for name in names]
+    fields.extend(pa.field(name, pa.string()) for name in extra)
+    return pa.schema(fields)
+
+
+def iter_record_batches(
+    cursor: sqlite3.Cursor, schema: "pa.Schema", chunk_size: int = 50000
+) -> Iterator["pa.RecordBatch"]:
+    """Stream an executed cursor as Arrow record batches using ``fetchmany``.
+
+    Args:
+        cursor: Cursor whose result columns match ``schema`` in order
+        schema: Arrow schema for the batches
+        chunk_size: Rows per batch
+
+    Yields:
+        RecordBatch objects of at most ``chunk_size`` rows
+    """
+    require_pyarrow()
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        columns = list(zip(*rows, strict=True))
+        yield pa.RecordBatch.from_arrays(
+            [
+                pa.array(values, type=field.type)
+                for values, field in zip(columns, schema, strict=True)
+            ],
+            schema=schema,
+        )
+
+
+def write_dataset(
+    batches: Iterable["pa.RecordBatch"],
+    schema: "pa.Schema",
+    directory: str | Path,
+    partition_cols: Sequence[str] = (),
+    compression: str = "zstd",
+) -> Path:
+    """Write record batches as a hive-partitioned Parquet dataset.
+
+    Existing files in ``directory`` are replaced.
+
+    Returns:
+        Path to the dataset directory
+    """
+    require_pyarrow()
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+
+    partitioning = None
+    if partition_cols:
+        partitioning = ds.partitioning(
+            pa.schema([schema.field(name) for name in partition_cols]), flavor="hive"
+        )
+
+    ds.write_dataset(
+        batches,
+        path,
+        schema=schema,
+        format="parquet",
+        partitioning=partitioning,
+        existing_data_behavior="delete_matching",
+        file_options=ds.ParquetFileFormat().make_write_options(compression=compression),
+    )
+    return path
+
+
+def read_dataset_batches(
+    directory: str | Path, columns: Sequence[str] | None = None
+) -> tuple[list[str], Iterator["pa.RecordBatch"]]:
+    """Open a hive-partitioned Parquet dataset for streaming reads.
+
+    Args:
+        directory: Dataset directory written by ``write_dataset``
+        columns: Optional projection; names missing from the dataset are ignored
+
+    Returns:
+        Tuple of (column names read, iterator of record batches)
+    """
+    require_pyarrow()
+    dataset = ds.dataset(str(directory), format="parquet", partitioning="hive")
+    names = [name for name in (columns or dataset.schema.names) if name in dataset.schema.names]
+    return names, iter(dataset.to_batches(columns=names))
+
+
+def batch_rows(batch: "pa.RecordBatch") -> list[tuple[Any, ...]]:
+    """Convert a record batch into row tuples suitable for ``executemany``."""
+    columns = [column.to_pylist() for column in batch.columns]
+    return list(zip(*columns, strict=True))
+
+
+__all__ = [
+    "PYARROW_AVAILABLE",
+    "batch_rows",
+    "iter_record_batches",
+    "read_dataset_batches",
+    "require_pyarrow",
+    "table_schema",
+    "write_dataset",
+]
@@ -0,0 +1,341 @@
+"""Thread-safe bounded connection pool for SQLite.
+
+Hands out connections under a lock/condition so concurrent writers never share
+a connection, caps the number of open connections, applies PRAGMAs to every
+connection it creates, and validates idle connections before reuse.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, suppress
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from core.exceptions import DatabaseConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Applied to every new connection; journal_mode is persistent but the rest are
+# per-connection settings in SQLite.
+DEFAULT_PRAGMAS: dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": 10000,
+    "temp_store": "MEMORY",
+    # Let REPLACE conflict resolution fire DELETE triggers (keeps derived tables in sync)
+    "recursive_triggers": "ON",
+}
+
+# Named tuning profiles layered over DEFAULT_PRAGMAS. Negative cache_size is in
+# KiB; mmap_size is in bytes and capped by SQLite's compile-time maximum.
+# page_size only takes effect when the database file is created (it cannot
+# change once the file is in WAL mode), so it is applied before journal_mode.
+PRAGMA_PROFILES: dict[str, dict[str, Any]] = {
+    "default": {},
+    # Bulk writes: fewer, larger checkpoints and patience for a busy writer
+    "ingest": {
+        "page_size": 4096,
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "wal_autocheckpoint": 10000,
+        "busy_timeout": 30000,
+    },
+    # Large scans and aggregates: big page cache, map the whole file
+    "analytics": {
+        "page_size": 8192,
+        "cache_size": -262144,
+        "mmap_size": 1073741824,
+        "wal_autocheckpoint": 1000,
+        "busy_timeout": 5000,
+    },
+    # Small hosts: tiny cache, no mapping, temp tables on disk
+    "low_memory": {
+        "cache_size": -2048,
+        "mmap_size": 0,
+        "temp_store": "FILE",
+        "wal_autocheckpoint": 1000,
+        "busy_timeout": 5000,
+    },
+}
+
+# Settings that must be applied before journal_mode to have any effect
+_CREATION_PRAGMAS = ("page_size",)
+_PRAGMA_NAME = re.compile(r"^[a-z_]+$")
+_PRAGMA_VALUE = re.compile(r"^-?[A-Za-z0-9_]+$")
+
+
+def resolve_pragmas(
+    profile: str = "default", overrides: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Build the PRAGMA set for a named profile.
+
+    Args:
+        profile: Key of ``PRAGMA_PROFILES``
+        overrides: PRAGMA name -> value applied on top of the profile
+
+    Returns:
+        Ordered PRAGMA name -> value mapping for ``SQLiteConnectionPool``
+
+    Raises:
+        ValueError: If the profile is unknown or a name/value is not a plain
+            identifier or integer (they are interpolated into the PRAGMA statement)
+    """
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(
+            f"Unknown PRAGMA profile {profile!r}; expected one of {list(PRAGMA_PROFILES)}"
+        )
+
+    merged = {**DEFAULT_PRAGMAS, **PRAGMA_PROFILES[profile], **(overrides or {})}
+    for name, value in merged.items():
+        if not _PRAGMA_NAME.match(name) or not _PRAGMA_VALUE.match(str(value)):
+            raise ValueError(f"Invalid PRAGMA setting {name}={value!r}")
+
+    ordered = {name: merged[name] for name in _CREATION_PRAGMAS if name in merged}
+    ordered.update((name, value) for name, value in merged.items() if name not in ordered)
+    return ordered
+
+
+@dataclass
+class PoolMetrics:
+    """Counters describing pool usage."""
+
+    created: int = 0
+    closed: int = 0
+    checkouts: int = 0
+    in_use: int = 0
+    timeouts: int = 0
+    health_check_failures: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+
+
+class SQLiteConnectionPool:
+    """
+    Bounded pool of SQLite connections safe to share between threads.
+
+    Features:
+    - Blocking checkout with timeout once ``max_size`` connections are open
+    - Per-connection PRAGMA initialisation
+    - Health check (``SELECT 1``) on checkout, replacing broken connections
+    - Rollback of transactions left open when a connection is returned
+    - Usage metrics (wait time, in-use, created)
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_size: int = 5,
+        timeout: float = 30.0,
+        pragmas: dict[str, Any] | None = None,
+        health_check: bool = True,
+        initializer: Callable[[sqlite3.Connection], None] | None = None,
+        uri: bool = False,
+        factory: type[sqlite3.Connection] = sqlite3.Connection,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_size: Maximum number of open connections
+            timeout: Seconds to wait for a free connection before failing
+            pragmas: PRAGMA name -> value applied to each new connection
+            health_check: Whether to validate idle connections on checkout
+            initializer: Optional hook run on each new connection (e.g. to register
+                SQL functions) after PRAGMAs are applied
+            uri: Interpret ``db_path`` as a ``file:`` URI (e.g. ``?mode=ro``)
+            factory: ``sqlite3.Connection`` subclass to open connections with
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.health_check = health_check
+        self.initializer = initializer
+        self.uri = uri
+        self.factory = factory
+
+        self._idle: list[sqlite3.Connection] = []
+        self._size = 0  # idle + checked out
+        self._closed = False
+        self._condition = threading.Condition(threading.Lock())
+        self._metrics = PoolMetrics()
+
+    def __len__(self) -> int:
+        """Return the number of idle connections."""
+        with self._condition:
+            return len(self._idle)
+
+    @property
+    def closed(self) -> bool:
+        """Whether ``close`` has been called."""
+        return self._closed
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """Open and initialise a new connection."""
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, uri=self.uri, factory=self.factory
+        )
+        conn.row_factory = sqlite3.Row
+        try:
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name}={value}")
+            if self.initializer:
+                self.initializer(conn)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        logger.debug("Created new database connection")
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Check that a pooled connection is still usable."""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        """Close a connection and release its slot. Caller must hold the lock."""
+        with suppress(sqlite3.Error):
+            conn.close()
+        self._size -= 1
+        self._metrics.closed += 1
+        self._condition.notify()
+
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a connection, blocking until one is available.
+
+        Returns:
+            A connection reserved for the caller until ``release``
+
+        Raises:
+            DatabaseConnectionError: If the pool is closed or no connection frees
+                up within ``timeout``
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+
+        while True:
+            with self._condition:
+                while not self._closed and not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics.timeouts += 1
+                        raise DatabaseConnectionError(
+                            "Timed out waiting for a pooled database connection",
+                            details={"db_path": self.db_path, "max_size": self.max_size},
+                        )
+                    self._condition.wait(remaining)
+
+                if self._closed:
+                    raise DatabaseConnectionError(
+                        "Connection pool is closed", details={"db_path": self.db_path}
+                    )
+                if self._idle:
+                    conn: sqlite3.Connection | None = self._idle.pop()
+                else:
+                    conn = None
+                    self._size += 1  # reserve a slot; connect outside the lock
+
+            if conn is None:
+                try:
+                    conn = self._create_connection()
+                except sqlite3.Error as e:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise DatabaseConnectionError(
+                        f"Failed to open database connection: {e}",
+                        details={"db_path": self.db_path},
+                    )
+                with self._condition:
+                    self._metrics.created += 1
+            elif self.health_check and not self._is_healthy(conn):
+                with self._condition:
+                    self._metrics.health_check_failures += 1
+                    self._discard(conn)
+                logger.warning("Discarded unhealthy pooled connection")
+                continue
+
+            waited = time.monotonic() - start
+            with self._condition:
+                self._metrics.checkouts += 1
+                self._metrics.in_use += 1
+                self._metrics.total_wait_time += waited
+                self._metrics.max_wait_time = max(self._metrics.max_wait_time, waited)
+            return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a checked-out connection to the pool."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+                logger.warning("Rolled back uncommitted transaction on returned connection")
+            healthy = True
+        except sqlite3.Error:
+            healthy = False
+
+        with self._condition:
+            self._metrics.in_use -= 1
+            if healthy and not self._closed:
+                self._idle.append(conn)
+                self._condition.notify()
+            else:
+                self._discard(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Context manager that checks out and returns a connection."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> int:
+        """Close the pool.
+
+        Idle connections are closed now; checked-out connections stay usable
+        and are closed when released. Later ``acquire`` calls raise.
+
+        Returns:
+            Number of idle connections closed
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            for conn in idle:
+                self._discard(conn)
+            # Wake blocked checkouts so they fail instead of waiting out the timeout
+            self._condition.notify_all()
+        return len(idle)
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Return a snapshot of pool metrics."""
+        with self._condition:
+            metrics = asdict(self._metrics)
+            metrics["idle"] = len(self._idle)
+            metrics["size"] = self._size
+            metrics["max_size"] = self.max_size
+            checkouts = self._metrics.checkouts
+            metrics["avg_wait_time"] = (
+                self._metrics.total_wait_time / checkouts if checkouts else 0.0
+            )
+        return metrics
+
+
+__all__ = [
+    "DEFAULT_PRAGMAS",
+    "PRAGMA_PROFILES",
+    "PoolMetrics",
+    "SQLiteConnectionPool",
+    "resolve_pragmas",
+]
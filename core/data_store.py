@@ -3,18 +3,149 @@ Enhanced data persistence layer for music discovery data.
 Handles trending data, viral predictions, and cross-platform analysis.
 """
 
+import calendar
+import gzip
+import hashlib
 import json
 import logging
+import re
+import shutil
 import sqlite3
-from contextlib import contextmanager
+import threading
+import time
+import unicodedata
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import closing, contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
+from core import columnar
 from core.caching import get_cache
+from core.connection_pool import SQLiteConnectionPool, resolve_pragmas
+from core.exceptions import DatabaseConnectionError
+from core.index_advisor import advise_indexes
+from core.migrations import Backfill, Migration, MigrationRunner, column_names, rebuild_table
+from core.query_stats import InstrumentedConnection, QueryRecorder
+from core.storage_backend import AnalyticsBackend, DuckDBBackend, SQLiteBackend
+from core.write_buffer import GroupCommitBuffer
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Downsampled history tables (trend_history_<resolution>) and their bucket formats
+HISTORY_RESOLUTIONS = {"hourly": "%Y-%m-%dT%H:00:00", "daily": "%Y-%m-%dT00:00:00"}
+
+# Per-connection settings for read-only snapshot connections; the store's
+# profile contributes its READ_PRAGMAS on top
+SNAPSHOT_PRAGMAS = {"cache_size": 10000, "temp_store": "MEMORY"}
+READ_PRAGMAS = ("cache_size", "mmap_size", "temp_store")
+
+# PRAGMAs reported by get_pragma_settings
+REPORTED_PRAGMAS = (
+    "page_size",
+    "journal_mode",
+    "synchronous",
+    "cache_size",
+    "mmap_size",
+    "temp_store",
+    "wal_autocheckpoint",
+    "busy_timeout",
+)
+
+BACKUP_PREFIX = "music_trends_backup_"
+BACKUP_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+BACKUP_SUFFIXES = {None: ".db", "gzip": ".db.gz", "zstd": ".db.zst"}
+
+
+class _BackupRestartLimit(Exception):
+    """Raised from the backup progress callback to abort a paged copy."""
+
+
+def _to_epoch(value: datetime) -> int:
+    """Convert a datetime to integer epoch seconds.
+
+    Naive values are treated as UTC, matching SQLite's ``strftime('%s', ...)``
+    so Python-side writes agree with the SQL backfill.
+    """
+    return calendar.timegm(value.utctimetuple())
+
+
+def _cutoff_epoch(days: int) -> int:
+    """Epoch seconds for ``days`` ago, equivalent to ``datetime('now', '-N days')``."""
+    return int(time.time()) - days * 86400
+
+
+def normalize_match_key(track_name: str | None, artist: str | None) -> str:
+    """Build the exact-match lookup key for a (track_name, artist) pair.
+
+    Both parts are accent-stripped, casefolded and whitespace-collapsed, so
+    "Beyoncé  - HALO" and "beyonce - halo" produce the same key.
+    """
+
+    def normalize(value: str | None) -> str:
+        decomposed = unicodedata.normalize("NFKD", value or "")
+        stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+        return " ".join(stripped.casefold().split())
+
+    return f"{normalize(track_name)}\x1f{normalize(artist)}"
+
+
+def _fts_phrase(value: str) -> str:
+    """Quote a value as an FTS5 phrase string."""
+    return '"' + value.replace('"', '""') + '"'
+
+
+class LazyJSON(Mapping):
+    """Read-only mapping over a JSON object that is only decoded on first access."""
+
+    __slots__ = ("_raw", "_value")
+
+    def __init__(self, raw: str | None) -> None:
+        self._raw = raw
+        self._value: dict[str, Any] | None = None
+
+    @property
+    def raw(self) -> str | None:
+        """The undecoded JSON text."""
+        return self._raw
+
+    @property
+    def decoded(self) -> bool:
+        """Whether the JSON has been parsed yet."""
+        return self._value is not None
+
+    def _decode(self) -> dict[str, Any]:
+        if self._value is None:
+            self._value = json.loads(self._raw) if self._raw else {}
+        return self._value
+
+    def __getitem__(self, key: str) -> Any:
+        return self._decode()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._decode())
+
+    def __len__(self) -> int:
+        return len(self._decode())
+
+    def __repr__(self) -> str:
+        return f"LazyJSON({self._decode() if self.decoded else self._raw!r})"
+
+
+def _metadata_column_name(key: str) -> str:
+    """Validate a metadata key for ``json_extract`` projection and return its alias."""
+    if not key.replace("_", "").isalnum():
+        raise ValueError(f"Invalid metadata key: {key!r} (letters, digits and _ only)")
+    return f"metadata_{key}"
 
 
 @dataclass
@@ -62,65 +193,407 @@ class EnhancedMusicDataStore:
     - Analytics-ready data structures
     """
 
-    def __init__(self, db_path: str = "enhanced_music_trends.db", backup_dir: str = "backups"):
+    def __init__(
+        self,
+        db_path: str = "enhanced_music_trends.db",
+        backup_dir: str = "backups",
+        max_pool_size: int = 5,
+        pool_timeout: float = 30.0,
+        analytics_engine: str = "sqlite",
+        pragma_profile: str = "default",
+        pragmas: dict[str, Any] | None = None,
+    ):
         self.db_path = db_path
+        self.pragma_profile = pragma_profile
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(exist_ok=True)
         self.logger = logging.getLogger(__name__)
 
         # Initialize cache
         self._cache = get_cache()
-        self._connection_pool: list[sqlite3.Connection] = []
-        self._max_pool_size = 5
+
+        # Per-query-template latency stats; off until enable_query_stats()
+        self._query_recorder = QueryRecorder()
+
+        # Thread-safe pool; the profile's PRAGMAs (WAL, cache_size, mmap_size,
+        # busy_timeout, ...) are applied to every connection it opens
+        self._connection_pool = SQLiteConnectionPool(
+            db_path,
+            max_size=max_pool_size,
+            timeout=pool_timeout,
+            pragmas=resolve_pragmas(pragma_profile, pragmas),
+            initializer=self._init_connection,
+            factory=InstrumentedConnection,
+        )
+        self._has_trigram_index = False
+        self._has_search_index = False
+        self._write_buffer: GroupCommitBuffer | None = None
+
+        # Read snapshot state (see enable_read_snapshot)
+        self._snapshot_pool: SQLiteConnectionPool | None = None
+        self._snapshot_dir: Path | None = None
+        self._snapshot_files: list[Path] = []
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_stop: threading.Event | None = None
+        self._snapshot_thread: threading.Thread | None = None
 
         # Initialize database
         self._initialize_database()
+        self._migrate_schema()
         self._create_indexes()
 
-        # Enable WAL mode for better concurrency
-        with self.get_connection() as conn:
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute("PRAGMA cache_size=10000")
-            conn.execute("PRAGMA temp_store=memory")
-
-    def _get_pooled_connection(self) -> sqlite3.Connection:
-        """Get a connection from the pool or create a new one."""
-        if self._connection_pool:
-            conn = self._connection_pool.pop()
-            self.logger.debug("Reused connection from pool")
-            return conn
-
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        self.logger.debug("Created new database connection")
-        return conn
-
-    def _return_to_pool(self, conn: sqlite3.Connection) -> None:
-        """Return a connection to the pool."""
-        if len(self._connection_pool) < self._max_pool_size:
-            self._connection_pool.append(conn)
-            self.logger.debug("Returned connection to pool")
-        else:
-            conn.close()
-            self.logger.debug("Closed excess connection")
+        # Engine for aggregate queries (summary, spread, quality report)
+        self._analytics_backend: AnalyticsBackend = SQLiteBackend(self.get_read_connection)
+        if analytics_engine != "sqlite":
+            self.use_analytics_engine(analytics_engine)
+
+    @staticmethod
+    def _register_sql_functions(conn: sqlite3.Connection) -> None:
+        """Register Python SQL functions used by migrations and bulk updates."""
+        conn.create_function("audora_match_key", 2, normalize_match_key, deterministic=True)
+
+    def _init_connection(self, conn: sqlite3.Connection) -> None:
+        """Set up a newly opened pool connection."""
+        self._register_sql_functions(conn)
+        conn.recorder = self._query_recorder
+
+    # QUERY INSTRUMENTATION
+
+    def enable_query_stats(self, slow_query_ms: float = 100.0, explain_slow: bool = True) -> None:
+        """Start recording per-query-template latency, rows and slow-query plans.
+
+        Statements at or above ``slow_query_ms`` are logged as WARNING on the
+        ``core.query_stats`` logger with their template, duration, row count and
+        (with ``explain_slow``) ``EXPLAIN QUERY PLAN``. See ``core.query_stats``.
+        """
+        self._query_recorder.enable(slow_query_ms, explain_slow)
+
+    def disable_query_stats(self) -> None:
+        """Stop recording query statistics; collected stats are kept."""
+        self._query_recorder.disable()
+
+    def reset_query_stats(self) -> None:
+        """Discard collected query statistics."""
+        self._query_recorder.reset()
+
+    def get_query_stats(self, limit: int | None = 20, sort_by: str = "total_ms") -> dict[str, Any]:
+        """Return query statistics per template, heaviest first.
+
+        Args:
+            limit: Maximum number of templates (None for all)
+            sort_by: total_ms, calls, max_ms, slow_calls or rows
+
+        Returns:
+            Totals plus, per template: calls, errors, latency min/avg/max and
+            p50/p95/p99, histogram, rows, fetch time and the slow-query plan
+        """
+        return self._query_recorder.get_stats(limit=limit, sort_by=sort_by)
 
     def close_pool(self) -> None:
-        """Close all connections in the pool."""
-        count = len(self._connection_pool)
-        while self._connection_pool:
-            conn = self._connection_pool.pop()
-            conn.close()
+        """Close the connection pool; connections still in use close when returned."""
+        count = self._connection_pool.close()
         self.logger.info(f"Closed {count} pooled connections")
 
+    def enable_write_buffer(self, max_rows: int = 500, max_delay: float = 0.25) -> None:
+        """Start group-committing ``save_trend`` and ``save_viral_prediction`` calls.
+
+        While enabled those methods validate, queue the record and return None;
+        queued records are written together in one transaction when ``max_rows``
+        are pending, after ``max_delay`` seconds, or on ``flush()``. A record is
+        durable only once the flush containing it has committed, so a crash can
+        lose up to ``max_rows`` records / ``max_delay`` seconds of saves. Call
+        ``flush()`` before relying on a write (e.g. before reading it back).
+        """
+        if self._write_buffer is None:
+            self._write_buffer = GroupCommitBuffer(self._flush_buffered, max_rows, max_delay)
+
+    def disable_write_buffer(self) -> int:
+        """Flush pending records and return to per-call commits.
+
+        Returns:
+            Number of records flushed
+        """
+        if self._write_buffer is None:
+            return 0
+        # Flush first so a failed write leaves buffering (and the records) in place
+        count = self._write_buffer.flush()
+        buffer, self._write_buffer = self._write_buffer, None
+        return count + buffer.close()
+
+    def flush(self) -> int:
+        """Commit all buffered writes; blocks until they are durable.
+
+        Returns:
+            Number of records flushed (0 when buffering is disabled)
+        """
+        return self._write_buffer.flush() if self._write_buffer is not None else 0
+
+    @contextmanager
+    def buffered_writes(self, max_rows: int = 500, max_delay: float = 0.25):
+        """Context manager that buffers saves and flushes them on exit.
+
+        Nested use keeps the outer buffer and only flushes on inner exit.
+        """
+        owner = self._write_buffer is None
+        self.enable_write_buffer(max_rows, max_delay)
+        try:
+            yield self
+        finally:
+            if owner:
+                self.disable_write_buffer()
+            else:
+                self.flush()
+
+    def get_write_buffer_metrics(self) -> dict[str, Any]:
+        """Get write buffer metrics (flushes, rows flushed, pending, ...)."""
+        return self._write_buffer.get_metrics() if self._write_buffer is not None else {}
+
+    def _flush_buffered(self, batch: dict[str, list[Any]]) -> None:
+        """Write one buffered batch of trends and predictions in a single transaction."""
+        with self.get_connection() as conn:
+            try:
+                # IMMEDIATE: _write_trends reads before it writes (see upsert_trends)
+                conn.execute("BEGIN IMMEDIATE")
+                trends = len(set(self._write_trends(conn, batch.get("trend", []))) - {None})
+                predictions = batch.get("prediction", [])
+                conn.executemany(
+                    self._PREDICTION_INSERT, [self._prediction_row(p) for p in predictions]
+                )
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                self.logger.error(f"Buffered write failed: {e}")
+                raise
+
+        self.logger.debug(f"Flushed {trends} trends and {len(predictions)} predictions")
+
+    def get_pool_metrics(self) -> dict[str, Any]:
+        """Get connection pool metrics (wait time, in-use, created, ...)."""
+        return self._connection_pool.get_metrics()
+
+    def get_pragma_settings(self) -> dict[str, Any]:
+        """Return the profile name and the PRAGMA values in effect on a pooled connection.
+
+        Values are read back from SQLite, so settings it clamps (e.g. ``mmap_size``
+        above the compile-time limit) or ignores (``page_size`` on an existing
+        file) show up as they actually apply.
+        """
+        with self.get_connection() as conn:
+            settings = {
+                name: conn.execute(f"PRAGMA {name}").fetchone()[0] for name in REPORTED_PRAGMAS
+            }
+        return {"profile": self.pragma_profile, **settings}
+
     @contextmanager
     def get_connection(self):
         """Context manager for database connections with pooling."""
-        conn = self._get_pooled_connection()
+        with self._connection_pool.connection() as conn:
+            yield conn
+
+    @contextmanager
+    def get_read_connection(self):
+        """Connection for read-only queries.
+
+        Uses the published read snapshot when ``enable_read_snapshot`` is active,
+        otherwise the primary database.
+        """
+        while True:
+            pool = self._snapshot_pool if self._snapshot_pool is not None else self._connection_pool
+            try:
+                conn = pool.acquire()
+                break
+            except DatabaseConnectionError:
+                # A refresh closed this snapshot after we picked it; use the new one
+                if not pool.closed or pool is self._connection_pool:
+                    raise
         try:
             yield conn
         finally:
-            self._return_to_pool(conn)
+            pool.release(conn)
+
+    def use_analytics_engine(self, engine: str = "sqlite", parquet_dir: str | None = None) -> None:
+        """Select the engine that runs the analytical aggregate queries.
+
+        Args:
+            engine: "sqlite" (the store's own connections) or "duckdb" (embedded,
+                vectorised; needs the optional duckdb package)
+            parquet_dir: With duckdb, read a snapshot written by ``create_snapshot``
+                instead of the live SQLite file
+        """
+        if engine == "sqlite":
+            backend: AnalyticsBackend = SQLiteBackend(self.get_read_connection)
+        elif engine == "duckdb":
+            backend = DuckDBBackend(
+                db_path=self.db_path,
+                parquet_dir=parquet_dir,
+                connection_factory=self.get_read_connection,
+            )
+        else:
+            raise ValueError(f"Invalid analytics engine: {engine}. Must be sqlite or duckdb")
+
+        previous, self._analytics_backend = self._analytics_backend, backend
+        previous.close()
+        self.logger.info(f"Analytics engine set to {engine}")
+
+    @property
+    def analytics_engine(self) -> str:
+        """Name of the engine running analytical queries."""
+        return self._analytics_backend.name
+
+    def refresh_analytics_engine(self) -> None:
+        """Re-read a Parquet snapshot (copied SQLite tables refresh on their own)."""
+        self._analytics_backend.refresh()
+
+    def _analytics_query(self, sql: str, params: list[Any] | tuple[Any, ...] = ()) -> pd.DataFrame:
+        """Run an aggregate query on the configured analytics engine."""
+        return self._analytics_backend.query(sql, params)
+
+    def checkpoint(self, mode: str = "TRUNCATE") -> dict[str, int]:
+        """Run ``PRAGMA wal_checkpoint`` on the primary database.
+
+        TRUNCATE copies every WAL frame into the database and resets the WAL
+        file to zero bytes, so it stops growing between checkpoints. It can only
+        complete when no reader still needs older frames.
+
+        Args:
+            mode: PASSIVE, FULL, RESTART or TRUNCATE
+
+        Returns:
+            busy (1 if the checkpoint could not complete), log_frames and
+            checkpointed_frames
+        """
+        mode = mode.upper()
+        if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"Invalid checkpoint mode: {mode}")
+
+        with self.get_connection() as conn:
+            busy, log_frames, checkpointed = conn.execute(
+                f"PRAGMA wal_checkpoint({mode})"
+            ).fetchone()
+
+        if busy:
+            self.logger.warning(f"WAL checkpoint ({mode}) blocked by active readers")
+        return {"busy": busy, "log_frames": log_frames, "checkpointed_frames": checkpointed}
+
+    def enable_read_snapshot(
+        self,
+        snapshot_dir: str | None = None,
+        refresh_interval: float = 300.0,
+        checkpoint_mode: str | None = "TRUNCATE",
+    ) -> str:
+        """Serve read-only queries from a periodically published snapshot.
+
+        A copy of the database is written with ``VACUUM INTO`` and opened with
+        ``mode=ro&immutable=1``, so long analytics reads never hold a read
+        transaction on the primary file and cannot block WAL checkpoints. A
+        background thread republishes the snapshot every ``refresh_interval``
+        seconds and then checkpoints the primary WAL. Reads through
+        ``get_read_connection`` (trending, predictions, history, search,
+        iter_trends, feature matrix, quality report) may lag writes by up to
+        one interval.
+
+        Args:
+            snapshot_dir: Where snapshot files go (default: ``<backup_dir>/read_snapshots``)
+            refresh_interval: Seconds between snapshot refreshes
+            checkpoint_mode: wal_checkpoint mode run after each refresh (None to skip)
+
+        Returns:
+            Path of the first published snapshot
+        """
+        self.disable_read_snapshot()
+        self._snapshot_dir = (
+            Path(snapshot_dir) if snapshot_dir else self.backup_dir / "read_snapshots"
+        )
+        path = self.refresh_read_snapshot()
+
+        self._snapshot_stop = threading.Event()
+        self._snapshot_thread = threading.Thread(
+            target=self._snapshot_loop,
+            args=(self._snapshot_stop, refresh_interval, checkpoint_mode),
+            name="read-snapshot-refresher",
+            daemon=True,
+        )
+        self._snapshot_thread.start()
+        return path
+
+    def _snapshot_loop(
+        self, stop: threading.Event, interval: float, checkpoint_mode: str | None
+    ) -> None:
+        """Background thread: refresh the snapshot, then checkpoint the WAL."""
+        while not stop.wait(interval):
+            try:
+                self.refresh_read_snapshot()
+                if checkpoint_mode:
+                    self.checkpoint(checkpoint_mode)
+            except Exception as e:
+                self.logger.error(f"Read snapshot refresh failed: {e}")
+
+    def refresh_read_snapshot(self) -> str:
+        """Publish a new read snapshot and switch read queries to it.
+
+        The previous snapshot file is kept until the next refresh so readers
+        still holding its connections can finish.
+
+        Returns:
+            Path of the new snapshot file
+        """
+        if self._snapshot_dir is None:
+            raise RuntimeError("Read snapshots are not enabled")
+
+        self._snapshot_dir.mkdir(parents=True, exist_ok=True)
+        path = self._snapshot_dir / f"read_snapshot_{time.time_ns()}.db"
+        try:
+            with self.get_connection() as conn:
+                conn.execute("VACUUM INTO ?", (str(path),))
+        except sqlite3.Error:
+            path.unlink(missing_ok=True)
+            raise
+
+        pool = SQLiteConnectionPool(
+            f"{path.resolve().as_uri()}?mode=ro&immutable=1",
+            max_size=self._connection_pool.max_size,
+            timeout=self._connection_pool.timeout,
+            pragmas={
+                **SNAPSHOT_PRAGMAS,
+                **{
+                    name: value
+                    for name, value in self._connection_pool.pragmas.items()
+                    if name in READ_PRAGMAS
+                },
+            },
+            initializer=self._init_connection,
+            uri=True,
+            factory=InstrumentedConnection,
+        )
+        with self._snapshot_lock:
+            previous, self._snapshot_pool = self._snapshot_pool, pool
+            self._snapshot_files.append(path)
+            stale, self._snapshot_files = self._snapshot_files[:-2], self._snapshot_files[-2:]
+
+        if previous is not None:
+            previous.close()
+        for stale_path in stale:
+            stale_path.unlink(missing_ok=True)
+
+        self.logger.info(f"Published read snapshot {path}")
+        return str(path)
+
+    def disable_read_snapshot(self) -> None:
+        """Stop refreshing, route reads back to the primary database and delete snapshots."""
+        if self._snapshot_stop is not None:
+            self._snapshot_stop.set()
+            if self._snapshot_thread is not None:
+                self._snapshot_thread.join()
+            self._snapshot_stop = self._snapshot_thread = None
+
+        with self._snapshot_lock:
+            pool, self._snapshot_pool = self._snapshot_pool, None
+            files, self._snapshot_files = self._snapshot_files, []
+        if pool is not None:
+            pool.close()
+        for path in files:
+            path.unlink(missing_ok=True)
+        self._snapshot_dir = None
 
     def _initialize_database(self) -> None:
         """Create all database tables with enhanced schema."""
@@ -145,7 +618,10 @@ class EnhancedMusicDataStore:
                 metadata TEXT,
                 is_active BOOLEAN DEFAULT 1,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(platform, track_id, region, trend_date) ON CONFLICT REPLACE
+                trend_ts INTEGER,  -- trend_date as epoch seconds
+                first_detected_ts INTEGER,  -- first_detected as epoch seconds
+                match_key TEXT,  -- normalize_match_key(track_name, artist)
+                UNIQUE(platform, track_id, region, trend_date)
             )
             """
             )
@@ -185,7 +661,8 @@ class EnhancedMusicDataStore:
                 actual_peak_score REAL,
                 accuracy_score REAL,
                 status TEXT DEFAULT 'pending',  -- pending, confirmed, failed
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                prediction_ts INTEGER  -- prediction_date as epoch seconds
             )
             """
             )
@@ -261,40 +738,431 @@ class EnhancedMusicDataStore:
             """
             )
 
+            # Per-trend rollup of trend_history, maintained by triggers
+            cursor.execute(
+                """
+            CREATE TABLE IF NOT EXISTS trend_stats (
+                trend_id INTEGER PRIMARY KEY,
+                data_points INTEGER NOT NULL DEFAULT 0,
+                sum_velocity REAL NOT NULL DEFAULT 0,
+                last_score REAL,
+                last_timestamp TEXT
+            )
+            """
+            )
+
+            cursor.execute(
+                """
+            CREATE TRIGGER IF NOT EXISTS trg_history_stats_insert
+            AFTER INSERT ON trend_history
+            BEGIN
+                INSERT INTO trend_stats
+                (trend_id, data_points, sum_velocity, last_score, last_timestamp)
+                VALUES (NEW.trend_id, 1, COALESCE(NEW.velocity, 0), NEW.score, NEW.timestamp)
+                ON CONFLICT(trend_id) DO UPDATE SET
+                    data_points = data_points + 1,
+                    sum_velocity = sum_velocity + COALESCE(NEW.velocity, 0),
+                    last_score = NEW.score,
+                    last_timestamp = NEW.timestamp;
+            END
+            """
+            )
+
+            # Downsampled trend_history written by compact_history()
+            for resolution in HISTORY_RESOLUTIONS:
+                cursor.execute(
+                    f"""
+                CREATE TABLE IF NOT EXISTS trend_history_{resolution} (
+                    id INTEGER PRIMARY KEY,
+                    trend_id INTEGER NOT NULL,
+                    bucket TEXT NOT NULL,  -- ISO start of the hour or day
+                    samples INTEGER NOT NULL,
+                    min_score REAL,
+                    max_score REAL,
+                    mean_score REAL,
+                    mean_velocity REAL,
+                    last_rank INTEGER,
+                    last_timestamp TEXT,
+                    UNIQUE (trend_id, bucket)
+                )
+                """
+                )
+                cursor.execute(
+                    f"""
+                CREATE INDEX IF NOT EXISTS idx_history_{resolution}_bucket
+                ON trend_history_{resolution}(bucket)
+                """
+                )
+
+            # Raw and downsampled history in one relation; readers filter on trend_id
+            # and timestamp, which SQLite pushes down into each branch
+            cursor.execute(
+                """
+            CREATE VIEW IF NOT EXISTS trend_history_all AS
+            SELECT trend_id, timestamp, score, rank, velocity,
+                   1 AS samples, 'raw' AS resolution
+            FROM trend_history
+            UNION ALL
+            SELECT trend_id, bucket, mean_score, last_rank, mean_velocity, samples, 'hourly'
+            FROM trend_history_hourly
+            UNION ALL
+            SELECT trend_id, bucket, mean_score, last_rank, mean_velocity, samples, 'daily'
+            FROM trend_history_daily
+            """
+            )
+
+            self._create_trend_triggers(conn)
+
             conn.commit()
             self.logger.info("Database tables initialized successfully")
 
+    def _create_trend_triggers(self, conn: sqlite3.Connection) -> None:
+        """Create the triggers on trends and the FTS indexes they maintain.
+
+        Triggers are dropped together with their table, so this also runs after
+        migrations that rebuild trends.
+        """
+        conn.execute(
+            """
+        CREATE TRIGGER IF NOT EXISTS trg_trends_stats_delete
+        AFTER DELETE ON trends
+        BEGIN
+            DELETE FROM trend_stats WHERE trend_id = OLD.id;
+        END
+        """
+        )
+        conn.execute(
+            """
+        CREATE TRIGGER IF NOT EXISTS trg_trends_rollup_delete
+        AFTER DELETE ON trends
+        BEGIN
+            DELETE FROM trend_history_hourly WHERE trend_id = OLD.id;
+            DELETE FROM trend_history_daily WHERE trend_id = OLD.id;
+        END
+        """
+        )
+
+        self._has_trigram_index = self._create_trigram_index(conn)
+        self._has_search_index = self._create_search_index(conn)
+
+    def _create_trigram_index(self, conn: sqlite3.Connection) -> bool:
+        """Create the FTS5 trigram index used for fuzzy track/artist lookups.
+
+        Returns:
+            False if this SQLite build lacks FTS5 or the trigram tokenizer
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trends_trigram'"
+        ).fetchone()
+        if not exists:
+            try:
+                conn.execute(
+                    """
+                CREATE VIRTUAL TABLE trends_trigram USING fts5(
+                    track_name, artist,
+                    content='trends', content_rowid='id', tokenize='trigram'
+                )
+                """
+                )
+            except sqlite3.OperationalError as e:
+                self.logger.warning(f"FTS5 trigram index unavailable, fuzzy lookups disabled: {e}")
+                return False
+
+        # Statements run one by one: executescript would commit a migration's transaction
+        for trigger in (
+            """
+        CREATE TRIGGER IF NOT EXISTS trg_trends_trigram_insert AFTER INSERT ON trends BEGIN
+            INSERT INTO trends_trigram(rowid, track_name, artist)
+            VALUES (NEW.id, NEW.track_name, NEW.artist);
+        END
+        """,
+            """
+        CREATE TRIGGER IF NOT EXISTS trg_trends_trigram_delete AFTER DELETE ON trends BEGIN
+            INSERT INTO trends_trigram(trends_trigram, rowid, track_name, artist)
+            VALUES ('delete', OLD.id, OLD.track_name, OLD.artist);
+        END
+        """,
+            """
+        CREATE TRIGGER IF NOT EXISTS trg_trends_trigram_update
+        AFTER UPDATE OF track_name, artist ON trends BEGIN
+            INSERT INTO trends_trigram(trends_trigram, rowid, track_name, artist)
+            VALUES ('delete', OLD.id, OLD.track_name, OLD.artist);
+            INSERT INTO trends_trigram(rowid, track_name, artist)
+            VALUES (NEW.id, NEW.track_name, NEW.artist);
+        END
+        """,
+        ):
+            conn.execute(trigger)
+
+        if not exists:
+            # Index rows written before the table existed
+            conn.execute("INSERT INTO trends_trigram(trends_trigram) VALUES ('rebuild')")
+        return True
+
+    # Metadata keys whose values are indexed for full-text search
+    _FTS_METADATA_KEYS = ("album", "genre", "genres", "tags", "hashtags", "label", "source")
+
+    def _create_search_index(self, conn: sqlite3.Connection) -> bool:
+        """Create the FTS5 index behind ``search_trends``.
+
+        Indexes track_name, artist and selected metadata values, keyed by
+        ``trends.id`` and kept in sync by triggers.
+
+        Returns:
+            False if this SQLite build lacks FTS5
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trends_fts'"
+        ).fetchone()
+        if not exists:
+            try:
+                conn.execute(
+                    """
+                CREATE VIRTUAL TABLE trends_fts USING fts5(
+                    track_name, artist, metadata_text,
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+                """
+                )
+            except sqlite3.OperationalError as e:
+                self.logger.warning(f"FTS5 unavailable, search_trends disabled: {e}")
+                return False
+
+        def metadata_text(column: str) -> str:
+            parts = " || ' ' || ".join(
+                f"COALESCE(json_extract({column}, '$.{key}'), '')"
+                for key in self._FTS_METADATA_KEYS
+            )
+            return f"CASE WHEN json_valid({column}) THEN {parts} ELSE '' END"
+
+        for trigger in (
+            f"""
+        CREATE TRIGGER IF NOT EXISTS trg_trends_fts_insert AFTER INSERT ON trends BEGIN
+            INSERT INTO trends_fts(rowid, track_name, artist, metadata_text)
+            VALUES (NEW.id, NEW.track_name, NEW.artist, {metadata_text("NEW.metadata")});
+        END
+        """,
+            """
+        CREATE TRIGGER IF NOT EXISTS trg_trends_fts_delete AFTER DELETE ON trends BEGIN
+            DELETE FROM trends_fts WHERE rowid = OLD.id;
+        END
+        """,
+            f"""
+        CREATE TRIGGER IF NOT EXISTS trg_trends_fts_update
+        AFTER UPDATE OF track_name, artist, metadata ON trends BEGIN
+            DELETE FROM trends_fts WHERE rowid = OLD.id;
+            INSERT INTO trends_fts(rowid, track_name, artist, metadata_text)
+            VALUES (NEW.id, NEW.track_name, NEW.artist, {metadata_text("NEW.metadata")});
+        END
+        """,
+        ):
+            conn.execute(trigger)
+
+        if not exists:
+            # Index rows written before the table existed
+            conn.execute(
+                f"""
+            INSERT INTO trends_fts(rowid, track_name, artist, metadata_text)
+            SELECT id, track_name, artist, {metadata_text("metadata")} FROM trends
+            """
+            )
+        return True
+
+    # Derived columns added by migration 1: (table, column, type, expression).
+    # Epoch columns back sargable range filters; match_key backs exact pair lookups.
+    _DERIVED_COLUMNS = [
+        ("trends", "trend_ts", "INTEGER", "CAST(strftime('%s', trend_date) AS INTEGER)"),
+        (
+            "trends",
+            "first_detected_ts",
+            "INTEGER",
+            "CAST(strftime('%s', first_detected) AS INTEGER)",
+        ),
+        (
+            "viral_predictions",
+            "prediction_ts",
+            "INTEGER",
+            "CAST(strftime('%s', prediction_date) AS INTEGER)",
+        ),
+        ("trends", "match_key", "TEXT", "audora_match_key(track_name, artist)"),
+    ]
+
+    # Virtual generated columns over trends.metadata, added by migration 2:
+    # (column, type, JSON path).
+    # Computed on read (or stored in an index), so no backfill is needed.
+    _GENERATED_COLUMNS = [
+        ("energy", "REAL", "$.audio_features.energy"),
+        ("danceability", "REAL", "$.audio_features.danceability"),
+        ("valence", "REAL", "$.audio_features.valence"),
+        ("acousticness", "REAL", "$.audio_features.acousticness"),
+        ("tempo", "REAL", "$.audio_features.tempo"),
+        ("views", "INTEGER", "$.views"),
+        ("likes", "INTEGER", "$.likes"),
+    ]
+
+    def _schema_migrations(self) -> list[Migration]:
+        """Schema versions tracked in ``PRAGMA user_version``, oldest first.
+
+        Append new steps with the next version; never change applied ones.
+        ``apply`` callbacks must be idempotent (see ``core.migrations``).
+        """
+        return [
+            Migration(
+                1,
+                "Derived epoch and match-key columns",
+                self._add_derived_columns,
+                tuple(
+                    Backfill(table, column, expr)
+                    for table, column, _, expr in self._DERIVED_COLUMNS
+                ),
+            ),
+            Migration(2, "Generated metadata columns", self._add_generated_columns),
+            Migration(3, "Seed trend_stats from trend_history", self._seed_trend_stats),
+            Migration(4, "Drop indexes covered by wider indexes", self._drop_redundant_indexes),
+            Migration(
+                5,
+                "Plain UNIQUE key on trends instead of ON CONFLICT REPLACE",
+                self._rebuild_trends_unique,
+            ),
+        ]
+
+    def _migrate_schema(self, batch_size: int = 10000, pause: float = 0.0) -> list[int]:
+        """Apply pending schema migrations.
+
+        Backfills commit every ``batch_size`` rows, so writers are not blocked
+        for the whole table.
+
+        Returns:
+            Versions applied
+        """
+        runner = MigrationRunner(self.get_connection, self._schema_migrations(), batch_size, pause)
+        return runner.run()
+
+    def get_schema_version(self) -> dict[str, Any]:
+        """Return the database's schema version and any pending migrations."""
+        runner = MigrationRunner(self.get_connection, self._schema_migrations())
+        return {
+            "version": runner.current_version(),
+            "latest": runner.latest_version,
+            "pending": [(m.version, m.description) for m in runner.pending()],
+        }
+
+    def _add_derived_columns(self, conn: sqlite3.Connection) -> None:
+        """Migration 1: add the columns of ``_DERIVED_COLUMNS`` (backfilled separately)."""
+        for table, column, column_type, _ in self._DERIVED_COLUMNS:
+            if column not in column_names(conn, table):
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+                self.logger.info(f"Added column {table}.{column}")
+
+    def _add_generated_columns(self, conn: sqlite3.Connection) -> None:
+        """Migration 2: add the virtual columns of ``_GENERATED_COLUMNS``."""
+        existing = column_names(conn, "trends")
+        for column, column_type, path in self._GENERATED_COLUMNS:
+            if column not in existing:
+                conn.execute(
+                    f"""
+                ALTER TABLE trends ADD COLUMN {column} {column_type}
+                GENERATED ALWAYS AS (
+                    CASE WHEN json_valid(metadata) THEN json_extract(metadata, '{path}') END
+                ) VIRTUAL
+                """
+                )
+                self.logger.info(f"Added generated column trends.{column}")
+
+    def _seed_trend_stats(self, conn: sqlite3.Connection) -> None:
+        """Migration 3: seed the trend_stats rollup for databases that predate it."""
+        stats_empty = conn.execute("SELECT 1 FROM trend_stats LIMIT 1").fetchone() is None
+        has_history = conn.execute("SELECT 1 FROM trend_history LIMIT 1").fetchone()
+        if stats_empty and has_history:
+            # Bare score column takes its value from the MAX(timestamp) row
+            cursor = conn.execute(
+                """
+            INSERT INTO trend_stats
+            (trend_id, data_points, sum_velocity, last_score, last_timestamp)
+            SELECT trend_id, COUNT(*), COALESCE(SUM(velocity), 0), score, MAX(timestamp)
+            FROM trend_history
+            WHERE trend_id IS NOT NULL
+            GROUP BY trend_id
+            """
+            )
+            self.logger.info(f"Seeded trend_stats for {cursor.rowcount} trends")
+
+    # Indexes whose columns lead a wider index or a UNIQUE constraint's index
+    _REDUNDANT_INDEXES = [
+        "idx_trends_platform",  # idx_trends_composite, idx_trends_platform_active_ts
+        "idx_trends_active",  # idx_trends_active_ts_score
+        "idx_correlations_track",  # UNIQUE(track_name, artist, ...)
+        "idx_metrics_platform_date",  # UNIQUE(platform, date)
+    ]
+
+    def _drop_redundant_indexes(self, conn: sqlite3.Connection) -> None:
+        """Migration 4: drop ``_REDUNDANT_INDEXES``; each costs a write per insert."""
+        for index in self._REDUNDANT_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {index}")
+
+    def _rebuild_trends_unique(self, conn: sqlite3.Connection) -> None:
+        """Migration 5: rebuild trends without ``ON CONFLICT REPLACE``.
+
+        REPLACE deleted the conflicting row and inserted a new one under a new
+        id, orphaning its trend_history. With a plain UNIQUE key a duplicate
+        ``save_trend`` raises IntegrityError and updates the existing row.
+        The rebuild holds the write lock for one table copy.
+        """
+        create_sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'trends'"
+        ).fetchone()[0]
+        if "ON CONFLICT REPLACE" not in create_sql.upper():
+            return
+
+        rebuild_table(
+            conn, "trends", lambda sql: re.sub(r"\s+ON CONFLICT REPLACE", "", sql, flags=re.I)
+        )
+        self._create_trend_triggers(conn)
+        for index_sql in self._index_statements():
+            conn.execute(index_sql)
+        self.logger.info("Rebuilt trends with a plain UNIQUE key")
+
+    def _index_statements(self) -> list[str]:
+        """``CREATE INDEX IF NOT EXISTS`` statements for the current schema."""
+        return [
+            # Indexes for trends table
+            "CREATE INDEX IF NOT EXISTS idx_trends_artist ON trends(artist)",
+            "CREATE INDEX IF NOT EXISTS idx_trends_score ON trends(score DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_trends_date ON trends(trend_date)",
+            "CREATE INDEX IF NOT EXISTS idx_trends_region ON trends(region)",
+            "CREATE INDEX IF NOT EXISTS idx_trends_composite ON trends(platform, region, trend_date)",
+            # Covering indexes for the (is_active, trend window, score) access pattern
+            "CREATE INDEX IF NOT EXISTS idx_trends_active_ts_score ON trends(is_active, trend_ts, score)",
+            "CREATE INDEX IF NOT EXISTS idx_trends_platform_active_ts ON trends(platform, is_active, trend_ts, score)",
+            "CREATE INDEX IF NOT EXISTS idx_trends_match_key ON trends(match_key)",
+            # Generated metadata columns; the partial audio index covers
+            # get_audio_feature_matrix and only holds tracks with audio features
+            "CREATE INDEX IF NOT EXISTS idx_trends_audio_features ON trends(is_active, trend_ts, score, energy, danceability, valence, acousticness, tempo)"
+            f" WHERE {self._HAS_AUDIO_FEATURES}",
+            "CREATE INDEX IF NOT EXISTS idx_trends_views ON trends(views DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_trends_likes ON trends(likes DESC)",
+            # Indexes for trend_history
+            "CREATE INDEX IF NOT EXISTS idx_history_trend_id ON trend_history(trend_id)",
+            "CREATE INDEX IF NOT EXISTS idx_history_timestamp ON trend_history(timestamp)",
+            "CREATE INDEX IF NOT EXISTS idx_history_score ON trend_history(score DESC)",
+            # Indexes for viral_predictions
+            "CREATE INDEX IF NOT EXISTS idx_predictions_confidence ON viral_predictions(confidence DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_predictions_date ON viral_predictions(prediction_date)",
+            "CREATE INDEX IF NOT EXISTS idx_predictions_ts ON viral_predictions(prediction_ts, confidence)",
+            "CREATE INDEX IF NOT EXISTS idx_predictions_status ON viral_predictions(status)",
+            "CREATE INDEX IF NOT EXISTS idx_predictions_artist ON viral_predictions(artist)",
+            # Indexes for cross_platform_correlations
+            "CREATE INDEX IF NOT EXISTS idx_correlations_platforms ON cross_platform_correlations(source_platform, target_platform)",
+            "CREATE INDEX IF NOT EXISTS idx_correlations_date ON cross_platform_correlations(analysis_date)",
+            # Indexes for platform_metrics
+            "CREATE INDEX IF NOT EXISTS idx_metrics_accuracy ON platform_metrics(average_prediction_accuracy DESC)",
+        ]
+
     def _create_indexes(self) -> None:
         """Create database indexes for better query performance."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-
-            # Indexes for trends table
-            indexes = [
-                "CREATE INDEX IF NOT EXISTS idx_trends_platform ON trends(platform)",
-                "CREATE INDEX IF NOT EXISTS idx_trends_artist ON trends(artist)",
-                "CREATE INDEX IF NOT EXISTS idx_trends_score ON trends(score DESC)",
-                "CREATE INDEX IF NOT EXISTS idx_trends_date ON trends(trend_date)",
-                "CREATE INDEX IF NOT EXISTS idx_trends_region ON trends(region)",
-                "CREATE INDEX IF NOT EXISTS idx_trends_active ON trends(is_active)",
-                "CREATE INDEX IF NOT EXISTS idx_trends_composite ON trends(platform, region, trend_date)",
-                # Indexes for trend_history
-                "CREATE INDEX IF NOT EXISTS idx_history_trend_id ON trend_history(trend_id)",
-                "CREATE INDEX IF NOT EXISTS idx_history_timestamp ON trend_history(timestamp)",
-                "CREATE INDEX IF NOT EXISTS idx_history_score ON trend_history(score DESC)",
-                # Indexes for viral_predictions
-                "CREATE INDEX IF NOT EXISTS idx_predictions_confidence ON viral_predictions(confidence DESC)",
-                "CREATE INDEX IF NOT EXISTS idx_predictions_date ON viral_predictions(prediction_date)",
-                "CREATE INDEX IF NOT EXISTS idx_predictions_status ON viral_predictions(status)",
-                "CREATE INDEX IF NOT EXISTS idx_predictions_artist ON viral_predictions(artist)",
-                # Indexes for cross_platform_correlations
-                "CREATE INDEX IF NOT EXISTS idx_correlations_track ON cross_platform_correlations(track_name, artist)",
-                "CREATE INDEX IF NOT EXISTS idx_correlations_platforms ON cross_platform_correlations(source_platform, target_platform)",
-                "CREATE INDEX IF NOT EXISTS idx_correlations_date ON cross_platform_correlations(analysis_date)",
-                # Indexes for platform_metrics
-                "CREATE INDEX IF NOT EXISTS idx_metrics_platform_date ON platform_metrics(platform, date)",
-                "CREATE INDEX IF NOT EXISTS idx_metrics_accuracy ON platform_metrics(average_prediction_accuracy DESC)",
-            ]
+            indexes = self._index_statements()
 
             for index_sql in indexes:
                 cursor.execute(index_sql)
@@ -302,7 +1170,7 @@ class EnhancedMusicDataStore:
             conn.commit()
             self.logger.info("Database indexes created successfully")
 
-    def save_trend(self, trend_data: TrendData) -> int:
+    def save_trend(self, trend_data: TrendData) -> int | None:
         """
         Save a trend with full validation and error handling.
 
@@ -310,11 +1178,15 @@ class EnhancedMusicDataStore:
             trend_data: TrendData object
 
         Returns:
-            ID of saved trend
+            ID of saved trend, or None if it was queued in the write buffer
         """
         # Validate data
         self._validate_trend_data(trend_data)
 
+        if self._write_buffer is not None:
+            self._write_buffer.add("trend", trend_data)
+            return None
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
@@ -323,8 +1195,9 @@ class EnhancedMusicDataStore:
                     """
                 INSERT INTO trends
                 (platform, track_id, track_name, artist, score, rank, region,
-                 trend_date, first_detected, last_updated, metadata, is_active)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 trend_date, first_detected, last_updated, metadata, is_active,
+                 trend_ts, first_detected_ts, match_key)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                     (
                         trend_data.platform,
@@ -339,6 +1212,9 @@ class EnhancedMusicDataStore:
                         datetime.now().isoformat(),
                         json.dumps(trend_data.metadata),
                         True,
+                        _to_epoch(trend_data.trend_date),
+                        _to_epoch(trend_data.first_detected),
+                        normalize_match_key(trend_data.track_name, trend_data.artist),
                     ),
                 )
 
@@ -371,7 +1247,8 @@ class EnhancedMusicDataStore:
                 # Update existing trend
                 return self._update_existing_trend(trend_data, conn)
 
-    def _validate_trend_data(self, trend_data: TrendData) -> None:
+    @staticmethod
+    def _validate_trend_data(trend_data: TrendData) -> None:
         """Validate trend data before saving."""
         if not trend_data.track_name or not trend_data.artist:
             raise ValueError("Track name and artist are required")
@@ -389,14 +1266,18 @@ class EnhancedMusicDataStore:
         """Update an existing trend and add history entry."""
         cursor = conn.cursor()
 
-        # Get existing trend
+        # Get the row holding the conflicting UNIQUE key
         cursor.execute(
             """
         SELECT id, score FROM trends
-        WHERE platform = ? AND track_name = ? AND artist = ? AND region = ?
-        ORDER BY last_updated DESC LIMIT 1
+        WHERE platform = ? AND track_id = ? AND region = ? AND trend_date = ?
         """,
-            (trend_data.platform, trend_data.track_name, trend_data.artist, trend_data.region),
+            (
+                trend_data.platform,
+                trend_data.track_id,
+                trend_data.region,
+                trend_data.trend_date.isoformat(),
+            ),
         )
 
         row = cursor.fetchone()
@@ -444,32 +1325,45 @@ class EnhancedMusicDataStore:
         conn.commit()
         return trend_id
 
-    def save_viral_prediction(self, prediction: ViralPrediction) -> int:
-        """Save a viral prediction with validation."""
+    _PREDICTION_INSERT = """
+    INSERT INTO viral_predictions
+    (track_id, track_name, artist, confidence, prediction_date,
+     predicted_peak_date, predicted_peak_score, prediction_features, prediction_ts)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _prediction_row(prediction: ViralPrediction) -> tuple[Any, ...]:
+        """Parameters for ``_PREDICTION_INSERT``."""
+        return (
+            prediction.track_id,
+            prediction.track_name,
+            prediction.artist,
+            prediction.confidence,
+            prediction.prediction_date.isoformat(),
+            prediction.predicted_peak_date.isoformat(),
+            prediction.predicted_peak_score,
+            json.dumps(prediction.prediction_features),
+            _to_epoch(prediction.prediction_date),
+        )
+
+    def save_viral_prediction(self, prediction: ViralPrediction) -> int | None:
+        """Save a viral prediction with validation.
+
+        Returns:
+            ID of saved prediction, or None if it was queued in the write buffer
+        """
         if not 0 <= prediction.confidence <= 1:
             raise ValueError("Confidence must be between 0 and 1")
 
+        if self._write_buffer is not None:
+            self._write_buffer.add("prediction", prediction)
+            return None
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            cursor.execute(
-                """
-            INSERT INTO viral_predictions
-            (track_id, track_name, artist, confidence, prediction_date,
-             predicted_peak_date, predicted_peak_score, prediction_features)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    prediction.track_id,
-                    prediction.track_name,
-                    prediction.artist,
-                    prediction.confidence,
-                    prediction.prediction_date.isoformat(),
-                    prediction.predicted_peak_date.isoformat(),
-                    prediction.predicted_peak_score,
-                    json.dumps(prediction.prediction_features),
-                ),
-            )
+            cursor.execute(self._PREDICTION_INSERT, self._prediction_row(prediction))
 
             prediction_id = cursor.lastrowid
             conn.commit()
@@ -486,6 +1380,7 @@ class EnhancedMusicDataStore:
         days: int = 7,
         min_score: float = 0.0,
         limit: int = 50,
+        lazy_metadata: bool = False,
     ) -> pd.DataFrame:
         """
         Get trending tracks with advanced filtering.
@@ -496,36 +1391,38 @@ class EnhancedMusicDataStore:
             days: Number of days to look back
             min_score: Minimum score threshold
             limit: Maximum number of results
+            lazy_metadata: Wrap metadata in ``LazyJSON`` instead of parsing every row
 
         Returns:
             DataFrame with trending tracks
         """
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             # Build dynamic query
             conditions = [
-                "datetime(trend_date) >= datetime('now', ?)",
-                "score >= ?",
-                "is_active = 1",
+                "t.is_active = 1",
+                "t.trend_ts >= ?",
+                "t.score >= ?",
             ]
-            params = [f"-{days} days", min_score]
+            params: list[Any] = [_cutoff_epoch(days), min_score]
 
             if platform:
-                conditions.append("platform = ?")
+                conditions.append("t.platform = ?")
                 params.append(platform)
 
             if region:
-                conditions.append("region = ?")
+                conditions.append("t.region = ?")
                 params.append(region)
 
             query = f"""
             SELECT
-                platform, track_name, artist, score, rank, region, trend_date,
-                metadata, first_detected,
-                (SELECT COUNT(*) FROM trend_history th WHERE th.trend_id = t.id) as data_points,
-                (SELECT AVG(velocity) FROM trend_history th WHERE th.trend_id = t.id) as avg_velocity
+                t.platform, t.track_name, t.artist, t.score, t.rank, t.region, t.trend_date,
+                t.metadata, t.first_detected,
+                COALESCE(s.data_points, 0) as data_points,
+                s.sum_velocity / NULLIF(s.data_points, 0) as avg_velocity
             FROM trends t
+            LEFT JOIN trend_stats s ON s.trend_id = t.id
             WHERE {' AND '.join(conditions)}
-            ORDER BY score DESC, trend_date DESC
+            ORDER BY t.score DESC, t.trend_date DESC
             LIMIT ?
             """
             params.append(limit)
@@ -534,28 +1431,120 @@ class EnhancedMusicDataStore:
 
             # Parse metadata if it exists
             if not df.empty and "metadata" in df.columns:
-                df["metadata"] = df["metadata"].apply(lambda x: json.loads(x) if x else {})
+                decode = LazyJSON if lazy_metadata else (lambda x: json.loads(x) if x else {})
+                df["metadata"] = [decode(x) for x in df["metadata"].tolist()]
 
             return df
 
-    def get_viral_predictions(
-        self,
-        confidence_threshold: float = 0.7,
-        status: str | None = None,
-        days: int = 30,
-        limit: int = 20,
+    def get_top_movers(
+        self, platform: str | None = None, days: int = 7, limit: int = 20
     ) -> pd.DataFrame:
-        """Get viral predictions with filtering."""
-        with self.get_connection() as conn:
-            conditions = ["confidence >= ?", "datetime(prediction_date) >= datetime('now', ?)"]
-            params = [confidence_threshold, f"-{days} days"]
+        """
+        Get the tracks with the highest average velocity from the trend_stats rollup.
 
-            if status:
-                conditions.append("status = ?")
-                params.append(status)
+        Args:
+            platform: Filter by platform
+            days: Number of days to look back
+            limit: Maximum number of results
 
-            query = f"""
-            SELECT
+        Returns:
+            DataFrame with track, current score, data points and average velocity
+        """
+        with self.get_read_connection() as conn:
+            conditions = ["t.is_active = 1", "t.trend_ts >= ?"]
+            params: list[Any] = [_cutoff_epoch(days)]
+
+            if platform:
+                conditions.append("t.platform = ?")
+                params.append(platform)
+
+            query = f"""
+            SELECT
+                t.platform, t.track_name, t.artist, t.score, t.rank, t.region,
+                s.data_points, s.sum_velocity / s.data_points as avg_velocity,
+                s.last_score, s.last_timestamp
+            FROM trends t
+            JOIN trend_stats s ON s.trend_id = t.id
+            WHERE {' AND '.join(conditions)} AND s.data_points > 0
+            ORDER BY avg_velocity DESC, t.score DESC
+            LIMIT ?
+            """
+            params.append(limit)
+
+            return pd.read_sql_query(query, conn, params=tuple(params))
+
+    def get_trend_history(self, trend_id: int, days: int | None = None) -> pd.DataFrame:
+        """
+        Get the history of one trend across raw and compacted rows.
+
+        Raw rows come from trend_history; older periods come from the hourly and
+        daily aggregates written by ``compact_history``.
+
+        Args:
+            trend_id: Trend row id
+            days: Only include the last N days
+
+        Returns:
+            DataFrame with timestamp, score, rank, velocity, samples and resolution,
+            ordered by timestamp
+        """
+        query = """
+        SELECT timestamp, score, rank, velocity, samples, resolution
+        FROM trend_history_all
+        WHERE trend_id = ?
+        """
+        params: list[Any] = [trend_id]
+        if days:
+            query += " AND timestamp >= ?"
+            params.append((datetime.now() - timedelta(days=days)).isoformat())
+        query += " ORDER BY timestamp"
+
+        with self.get_read_connection() as conn:
+            return pd.read_sql_query(query, conn, params=tuple(params))
+
+    def get_track_history(self, track_name: str, artist: str) -> pd.DataFrame:
+        """
+        Get the combined history of every trend matching a track and artist.
+
+        Names are substring matches (see ``_track_match_clause``), resolved
+        through the trigram index when it is available.
+
+        Returns:
+            DataFrame with timestamp, score and rank, ordered by timestamp
+        """
+        match_clause, match_params = self._track_match_clause(track_name, artist, engine="sqlite")
+        query = f"""
+        SELECT timestamp, score, rank
+        FROM trend_history_all
+        WHERE trend_id IN (SELECT id FROM trends WHERE {match_clause})
+        ORDER BY timestamp
+        """
+        with self.get_read_connection() as conn:
+            return pd.read_sql_query(query, conn, params=tuple(match_params))
+
+    def get_viral_predictions(
+        self,
+        confidence_threshold: float = 0.7,
+        status: str | None = None,
+        days: int = 30,
+        limit: int = 20,
+        lazy_features: bool = False,
+    ) -> pd.DataFrame:
+        """Get viral predictions with filtering.
+
+        ``lazy_features`` wraps prediction_features in ``LazyJSON`` instead of
+        parsing every row.
+        """
+        with self.get_read_connection() as conn:
+            conditions = ["prediction_ts >= ?", "confidence >= ?"]
+            params: list[Any] = [_cutoff_epoch(days), confidence_threshold]
+
+            if status:
+                conditions.append("status = ?")
+                params.append(status)
+
+            query = f"""
+            SELECT
                 track_name, artist, confidence, prediction_date,
                 predicted_peak_date, predicted_peak_score,
                 actual_peak_date, actual_peak_score, accuracy_score, status,
@@ -571,16 +1560,271 @@ class EnhancedMusicDataStore:
 
             # Parse prediction features
             if not df.empty and "prediction_features" in df.columns:
-                df["prediction_features"] = df["prediction_features"].apply(
-                    lambda x: json.loads(x) if x else {}
-                )
+                decode = LazyJSON if lazy_features else (lambda x: json.loads(x) if x else {})
+                df["prediction_features"] = [decode(x) for x in df["prediction_features"].tolist()]
 
             return df
 
+    # STREAMING READS
+
+    # Derived lookup columns hidden from iterator output unless projected explicitly
+    _ITER_HIDDEN_COLUMNS = {"trend_ts", "first_detected_ts", "match_key"}
+
+    def iter_trends(
+        self,
+        platform: str | None = None,
+        region: str | None = None,
+        days: int | None = None,
+        min_score: float = 0.0,
+        active_only: bool = False,
+        columns: list[str] | None = None,
+        metadata_keys: list[str] | None = None,
+        chunk_size: int = 10000,
+        output: str = "records",
+        lazy_metadata: bool = True,
+    ) -> Iterator[Any]:
+        """
+        Stream trends in bounded memory, ``chunk_size`` rows at a time.
+
+        Rows are read with ``fetchmany`` in id order, so the full table can be
+        scanned without materialising it. The generator holds one pooled
+        connection until it is exhausted or closed.
+
+        Args:
+            platform: Filter by platform
+            region: Filter by region
+            days: Only trends from the last N days (all history when None)
+            min_score: Minimum score threshold
+            active_only: Only rows with is_active = 1
+            columns: Columns to read (default: every stored, non-derived column;
+                generated metadata columns such as ``energy`` can be named here)
+            metadata_keys: Top-level metadata keys to extract in SQL with
+                ``json_extract``; each becomes a ``metadata_<key>`` column
+            chunk_size: Rows fetched per round trip
+            output: "records" yields one dict per row, "frames" one DataFrame
+                per chunk, "arrow" one pyarrow RecordBatch per chunk
+            lazy_metadata: Wrap the metadata column in ``LazyJSON`` instead of
+                parsing it up front (records/frames only; Arrow keeps raw JSON)
+
+        Yields:
+            Records, DataFrames or RecordBatches depending on ``output``
+        """
+        if output not in ("records", "frames", "arrow"):
+            raise ValueError(f"Invalid output: {output}. Must be records, frames or arrow")
+        if output == "arrow":
+            columnar.require_pyarrow()
+
+        conditions = ["t.score >= ?"]
+        params: list[Any] = [min_score]
+        if days:
+            conditions.append("t.trend_ts >= ?")
+            params.append(_cutoff_epoch(days))
+        if active_only:
+            conditions.append("t.is_active = 1")
+        if platform:
+            conditions.append("t.platform = ?")
+            params.append(platform)
+        if region:
+            conditions.append("t.region = ?")
+            params.append(region)
+
+        with self.get_read_connection() as conn:
+            # table_xinfo includes generated columns (hidden = 2 or 3)
+            table_columns = {row[1]: row[6] for row in conn.execute("PRAGMA table_xinfo(trends)")}
+            if columns:
+                unknown = set(columns) - set(table_columns)
+                if unknown:
+                    raise ValueError(f"Unknown trends columns: {sorted(unknown)}")
+                selected = list(columns)
+            else:
+                selected = [
+                    column
+                    for column, hidden in table_columns.items()
+                    if not hidden and column not in self._ITER_HIDDEN_COLUMNS
+                ]
+
+            select_list = [f"t.{column}" for column in selected]
+            extract_params: list[Any] = []
+            extra = []
+            for key in metadata_keys or []:
+                alias = _metadata_column_name(key)
+                expression = "json_extract(t.metadata, ?)"
+                if output == "arrow":
+                    expression = f"CAST({expression} AS TEXT)"
+                select_list.append(f"{expression} AS {alias}")
+                extract_params.append(f"$.{key}")
+                extra.append(alias)
+
+            query = f"""
+            SELECT {', '.join(select_list)}
+            FROM trends t
+            WHERE {' AND '.join(conditions)}
+            ORDER BY t.id
+            """
+            cursor = conn.execute(query, [*extract_params, *params])
+            names = selected + extra
+
+            if output == "arrow":
+                schema = columnar.table_schema(conn, "trends", selected, extra=extra)
+                yield from columnar.iter_record_batches(cursor, schema, chunk_size)
+                return
+
+            decode = LazyJSON if lazy_metadata else (lambda x: json.loads(x) if x else {})
+            metadata_index = names.index("metadata") if "metadata" in names else None
+
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    return
+                records = []
+                for row in rows:
+                    record = dict(zip(names, row, strict=True))
+                    if metadata_index is not None:
+                        record["metadata"] = decode(row[metadata_index])
+                    records.append(record)
+
+                if output == "frames":
+                    yield pd.DataFrame.from_records(records, columns=names)
+                else:
+                    yield from records
+
+    # Column order of get_audio_feature_matrix
+    AUDIO_FEATURE_COLUMNS = ["energy", "danceability", "valence", "acousticness", "tempo"]
+    _AUDIO_FEATURE_DEFAULTS = [0.5, 0.5, 0.5, 0.5, 120.0]
+    # Partial index predicate; queries must repeat it verbatim to use the index
+    _HAS_AUDIO_FEATURES = "(" + " OR ".join(f"{c} IS NOT NULL" for c in AUDIO_FEATURE_COLUMNS) + ")"
+
+    def get_audio_feature_matrix(
+        self,
+        days: int = 30,
+        min_features: int = 4,
+        limit: int | None = None,
+        with_tracks: bool = False,
+    ) -> np.ndarray | tuple[np.ndarray, pd.DataFrame]:
+        """
+        Get audio features of recent active trends as a float matrix.
+
+        Features are read from the generated metadata columns, so no JSON is
+        decoded in Python. Missing features are filled with neutral defaults
+        (0.5, tempo 120).
+
+        Args:
+            days: Number of days to look back
+            min_features: Minimum number of the five features a track must have
+            limit: Highest-scoring tracks to include (all when None)
+            with_tracks: Also return platform/track_name/artist/score per row
+
+        Returns:
+            Array of shape (n, 5) in ``AUDIO_FEATURE_COLUMNS`` order, or a tuple of
+            that array and a DataFrame of matching track rows
+        """
+        present = " + ".join(f"({column} IS NOT NULL)" for column in self.AUDIO_FEATURE_COLUMNS)
+        selected = ", ".join(
+            f"COALESCE({column}, {default})"
+            for column, default in zip(
+                self.AUDIO_FEATURE_COLUMNS, self._AUDIO_FEATURE_DEFAULTS, strict=True
+            )
+        )
+        track_columns = ["platform", "track_name", "artist", "score"]
+        if with_tracks:
+            selected += ", " + ", ".join(track_columns)
+
+        query = f"""
+        SELECT {selected}
+        FROM trends
+        WHERE is_active = 1 AND trend_ts >= ? AND {present} >= ?
+        """
+        params: list[Any] = [_cutoff_epoch(days), min_features]
+        if min_features >= 1:
+            query += f" AND {self._HAS_AUDIO_FEATURES}"
+        query += " ORDER BY score DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self.get_read_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        width = len(self.AUDIO_FEATURE_COLUMNS)
+        matrix = np.array([tuple(row)[:width] for row in rows], dtype=float).reshape(-1, width)
+        if not with_tracks:
+            return matrix
+
+        tracks = pd.DataFrame([tuple(row)[width:] for row in rows], columns=track_columns)
+        return matrix, tracks
+
     # OPTIMIZED BULK OPERATIONS
 
+    def _validate_trends_vectorized(self, trends: list[TrendData]) -> pd.DataFrame:
+        """Validate a batch of trends in one pass and return the valid rows.
+
+        Applies the same rules as ``_validate_trend_data`` using column masks
+        instead of per-object checks. The index keeps each row's position in
+        ``trends``.
+
+        Args:
+            trends: List of TrendData objects
+
+        Returns:
+            DataFrame of valid rows ready for staging
+        """
+
+        def to_iso(value: Any) -> str | None:
+            return value.isoformat() if hasattr(value, "isoformat") else None
+
+        def to_epoch(value: Any) -> int | None:
+            return _to_epoch(value) if hasattr(value, "utctimetuple") else None
+
+        frame = pd.DataFrame(
+            {
+                "platform": [t.platform for t in trends],
+                "track_id": [t.track_id for t in trends],
+                "track_name": [t.track_name for t in trends],
+                "artist": [t.artist for t in trends],
+                "score": pd.to_numeric([t.score for t in trends], errors="coerce"),
+                "rank": pd.to_numeric([t.rank for t in trends], errors="coerce"),
+                "region": [t.region for t in trends],
+                "trend_date": [to_iso(t.trend_date) for t in trends],
+                "first_detected": [to_iso(t.first_detected) for t in trends],
+                "metadata": [t.metadata for t in trends],
+                "trend_ts": [to_epoch(t.trend_date) for t in trends],
+                "first_detected_ts": [to_epoch(t.first_detected) for t in trends],
+                "match_key": [normalize_match_key(t.track_name, t.artist) for t in trends],
+            }
+        )
+
+        valid = (
+            frame["track_name"].fillna("").astype(bool)
+            & frame["artist"].fillna("").astype(bool)
+            & frame["platform"].fillna("").astype(bool)
+            & frame["score"].between(0, 100)
+            & (frame["rank"] >= 0)
+            & frame["trend_ts"].notna()
+            & frame["first_detected_ts"].notna()
+        )
+
+        invalid_count = int((~valid).sum())
+        if invalid_count:
+            self.logger.warning(f"Skipping {invalid_count} invalid trends in bulk save")
+
+        frame = frame[valid].copy()
+        if frame.empty:
+            return frame
+
+        frame["rank"] = frame["rank"].astype(int)
+        frame["trend_ts"] = frame["trend_ts"].astype(int)
+        frame["first_detected_ts"] = frame["first_detected_ts"].astype(int)
+        frame["metadata"] = [json.dumps(m) for m in frame["metadata"].tolist()]
+        return frame
+
     def save_trends_bulk(self, trends: list[TrendData]) -> int:
-        """Save multiple trends in a single transaction for better performance.
+        """Upsert multiple trends and their history rows in a single transaction.
+
+        Rows are validated in one vectorised pass, staged with ``executemany``
+        and merged with ``INSERT ... ON CONFLICT DO UPDATE`` so existing trends
+        keep their ``id`` (and therefore their ``trend_history``). A history row
+        is written for every upserted trend with velocity measured against the
+        score it replaced.
 
         Args:
             trends: List of TrendData objects to save
@@ -588,64 +1832,214 @@ class EnhancedMusicDataStore:
         Returns:
             Number of trends saved
         """
+        return len(set(self.upsert_trends(trends)) - {None})
+
+    def upsert_trends(self, trends: list[TrendData]) -> list[int | None]:
+        """Save trends like ``save_trends_bulk`` and return their row ids.
+
+        Returns:
+            One id per trend, in input order (None for invalid trends); trends
+            sharing an upsert key get the id of the row they were merged into
+        """
         if not trends:
-            return 0
+            return []
 
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            saved_count = 0
-
             try:
-                conn.execute("BEGIN TRANSACTION")
-
-                for trend_data in trends:
-                    try:
-                        self._validate_trend_data(trend_data)
-
-                        cursor.execute(
-                            """
-                        INSERT INTO trends
-                        (platform, track_id, track_name, artist, score, rank, region,
-                         trend_date, first_detected, last_updated, metadata, is_active)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                            (
-                                trend_data.platform,
-                                trend_data.track_id,
-                                trend_data.track_name,
-                                trend_data.artist,
-                                trend_data.score,
-                                trend_data.rank,
-                                trend_data.region,
-                                trend_data.trend_date.isoformat(),
-                                trend_data.first_detected.isoformat(),
-                                datetime.now().isoformat(),
-                                json.dumps(trend_data.metadata),
-                                True,
-                            ),
-                        )
-                        saved_count += 1
-
-                    except Exception as e:
-                        self.logger.warning(f"Failed to save trend {trend_data.track_name}: {e}")
-                        continue
-
+                # Take the write lock up front: _write_trends reads before it
+                # writes, and a deferred upgrade can fail with SQLITE_BUSY_SNAPSHOT
+                # in WAL mode, which busy_timeout does not retry
+                conn.execute("BEGIN IMMEDIATE")
+                ids = self._write_trends(conn, trends)
                 conn.commit()
-                self.logger.info(f"Bulk saved {saved_count} trends")
-                return saved_count
-
             except Exception as e:
                 conn.rollback()
                 self.logger.error(f"Bulk save failed: {e}")
                 raise
 
+        self.logger.info(f"Bulk saved {len(set(ids) - {None})} trends")
+        return ids
+
+    def _write_trends(self, conn: sqlite3.Connection, trends: list[TrendData]) -> list[int | None]:
+        """Run the staged trend upsert on ``conn`` inside the caller's transaction.
+
+        Returns:
+            Row id of each trend, in input order (None for invalid trends)
+        """
+        ids: list[int | None] = [None] * len(trends)
+        valid = self._validate_trends_vectorized(trends)
+        if valid.empty:
+            return ids
+
+        # Rows sharing an upsert key are written once, from the last occurrence;
+        # NULL track_ids never conflict in SQLite, so those rows are all kept
+        key_columns = ["platform", "track_id", "region", "trend_date"]
+        duplicated = valid.duplicated(subset=key_columns, keep="last")
+        frame = valid[~(duplicated & valid["track_id"].notna())]
+
+        now = datetime.now().isoformat()
+        columns = [
+            "platform",
+            "track_id",
+            "track_name",
+            "artist",
+            "score",
+            "rank",
+            "region",
+            "trend_date",
+            "first_detected",
+            "metadata",
+            "trend_ts",
+            "first_detected_ts",
+            "match_key",
+        ]
+        rows = list(zip(*(frame[column].tolist() for column in columns), strict=True))
+
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+        CREATE TEMP TABLE IF NOT EXISTS staging_trends (
+            platform TEXT, track_id TEXT, track_name TEXT, artist TEXT,
+            score REAL, rank INTEGER, region TEXT, trend_date TEXT,
+            first_detected TEXT, metadata TEXT, trend_ts INTEGER,
+            first_detected_ts INTEGER, match_key TEXT, prev_score REAL, trend_id INTEGER
+        )
+        """
+        )
+        cursor.execute("DELETE FROM staging_trends")
+
+        cursor.executemany(
+            """
+        INSERT INTO staging_trends
+        (platform, track_id, track_name, artist, score, rank, region,
+         trend_date, first_detected, metadata, trend_ts, first_detected_ts, match_key)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            rows,
+        )
+
+        # Capture the score each row is about to replace (NULL for new trends)
+        cursor.execute(
+            """
+        UPDATE staging_trends SET prev_score = (
+            SELECT t.score FROM trends t
+            WHERE t.platform = staging_trends.platform
+            AND t.track_id = staging_trends.track_id
+            AND t.region = staging_trends.region
+            AND t.trend_date = staging_trends.trend_date
+        )
+        """
+        )
+
+        cursor.execute(
+            """
+        INSERT INTO trends
+        (platform, track_id, track_name, artist, score, rank, region,
+         trend_date, first_detected, last_updated, metadata, is_active,
+         trend_ts, first_detected_ts, match_key)
+        SELECT platform, track_id, track_name, artist, score, rank, region,
+               trend_date, first_detected, ?, metadata, 1,
+               trend_ts, first_detected_ts, match_key
+        FROM staging_trends WHERE track_id IS NOT NULL
+        ON CONFLICT(platform, track_id, region, trend_date) DO UPDATE SET
+            track_name = excluded.track_name,
+            artist = excluded.artist,
+            match_key = excluded.match_key,
+            score = excluded.score,
+            rank = excluded.rank,
+            last_updated = excluded.last_updated,
+            metadata = excluded.metadata,
+            is_active = 1
+        """,
+            (now,),
+        )
+
+        cursor.execute(
+            """
+        UPDATE staging_trends SET trend_id = (
+            SELECT t.id FROM trends t
+            WHERE t.platform = staging_trends.platform
+            AND t.track_id = staging_trends.track_id
+            AND t.region = staging_trends.region
+            AND t.trend_date = staging_trends.trend_date
+        )
+        WHERE track_id IS NOT NULL
+        """
+        )
+
+        # NULL track_ids never conflict, so they are always fresh inserts. Insert
+        # them in staging order; the ids are then contiguous and end at lastrowid.
+        cursor.execute(
+            """
+        INSERT INTO trends
+        (platform, track_id, track_name, artist, score, rank, region,
+         trend_date, first_detected, last_updated, metadata, is_active,
+         trend_ts, first_detected_ts, match_key)
+        SELECT platform, track_id, track_name, artist, score, rank, region,
+               trend_date, first_detected, ?, metadata, 1,
+               trend_ts, first_detected_ts, match_key
+        FROM staging_trends WHERE track_id IS NULL
+        ORDER BY rowid
+        """,
+            (now,),
+        )
+        if cursor.rowcount > 0:
+            cursor.execute(
+                """
+            UPDATE staging_trends SET trend_id = ? - unkeyed.rows_after
+            FROM (
+                SELECT rowid AS staging_rowid,
+                       ROW_NUMBER() OVER (ORDER BY rowid DESC) - 1 AS rows_after
+                FROM staging_trends WHERE track_id IS NULL
+            ) AS unkeyed
+            WHERE staging_trends.rowid = unkeyed.staging_rowid
+            """,
+                (cursor.lastrowid,),
+            )
+
+        cursor.execute(
+            """
+        INSERT INTO trend_history
+        (trend_id, timestamp, score, rank, velocity, momentum, cross_platform_count)
+        SELECT
+            trend_id, ?, score, rank,
+            COALESCE(score - prev_score, 0.0),
+            CASE WHEN prev_score IS NULL THEN 1.0
+                 ELSE MAX(0.1, 1.0 + (score - prev_score) / 10.0) END,
+            1
+        FROM staging_trends
+        """,
+            (now,),
+        )
+
+        # Staging rows are in frame order, so their ids line up with its index
+        cursor.execute("SELECT trend_id FROM staging_trends ORDER BY rowid")
+        staged_ids = dict(
+            zip(frame.index.tolist(), [row[0] for row in cursor.fetchall()], strict=True)
+        )
+        cursor.execute("DELETE FROM staging_trends")
+
+        def row_keys(rows: pd.DataFrame) -> list[tuple[Any, ...]]:
+            return list(zip(*(rows[column].tolist() for column in key_columns), strict=True))
+
+        key_ids = dict(zip(row_keys(frame), staged_ids.values(), strict=True))
+        for position, key in zip(valid.index.tolist(), row_keys(valid), strict=True):
+            ids[position] = staged_ids[position] if position in staged_ids else key_ids[key]
+        return ids
+
     def get_tracks_with_artists_bulk(
-        self, track_artist_pairs: list[tuple[str, str]]
+        self, track_artist_pairs: list[tuple[str, str]], fuzzy: bool = False
     ) -> pd.DataFrame:
         """Efficiently retrieve multiple tracks in a single query.
 
+        Pairs are normalised with ``normalize_match_key``, loaded into a temp
+        table and joined against the indexed ``match_key`` column, so batch size
+        is not bounded by SQLite's parameter limit.
+
         Args:
             track_artist_pairs: List of (track_name, artist) tuples
+            fuzzy: Also match pairs whose names contain the given strings, using
+                the FTS5 trigram index (terms need at least 3 characters)
 
         Returns:
             DataFrame with all matching tracks
@@ -653,33 +2047,61 @@ class EnhancedMusicDataStore:
         if not track_artist_pairs:
             return pd.DataFrame()
 
-        # Create cache key from the pairs
-        cache_key = f"tracks_bulk:{hash(tuple(sorted(track_artist_pairs)))}"
+        # Stable content hash so the key is shared across processes
+        digest = hashlib.sha256(
+            json.dumps(sorted(set(track_artist_pairs)), ensure_ascii=False).encode()
+        ).hexdigest()
+        cache_key = f"tracks_bulk:{'fuzzy' if fuzzy else 'exact'}:{digest}"
         cached_result = self._cache.get(cache_key)
         if cached_result is not None:
             self.logger.debug(f"Cache hit for bulk tracks query ({len(track_artist_pairs)} pairs)")
             return cached_result
 
-        with self.get_connection() as conn:
-            # Build a query with OR conditions for each pair
-            conditions = []
-            params = []
+        use_fuzzy = fuzzy and self._has_trigram_index
+        if fuzzy and not use_fuzzy:
+            self.logger.warning("Fuzzy lookup requested but trigram index unavailable")
+
+        lookup_rows = []
+        for track_name, artist in set(track_artist_pairs):
+            fts_query = None
+            if use_fuzzy and len(track_name.strip()) >= 3 and len(artist.strip()) >= 3:
+                fts_query = (
+                    f"track_name : {_fts_phrase(track_name.strip())}"
+                    f" AND artist : {_fts_phrase(artist.strip())}"
+                )
+            lookup_rows.append((normalize_match_key(track_name, artist), fts_query))
 
-            for track_name, artist in track_artist_pairs:
-                conditions.append("(track_name LIKE ? AND artist LIKE ?)")
-                params.extend([f"%{track_name}%", f"%{artist}%"])
+        with self.get_read_connection() as conn:
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS lookup_pairs (match_key TEXT, fts_query TEXT)"
+            )
+            conn.execute("DELETE FROM lookup_pairs")
+            conn.executemany("INSERT INTO lookup_pairs VALUES (?, ?)", lookup_rows)
+
+            matched_ids = """
+                SELECT t.id FROM lookup_pairs p JOIN trends t ON t.match_key = p.match_key
+            """
+            if use_fuzzy:
+                matched_ids += """
+                UNION
+                SELECT f.rowid FROM lookup_pairs p
+                JOIN trends_trigram f ON f.trends_trigram MATCH p.fts_query
+                WHERE p.fts_query IS NOT NULL
+                """
 
             query = f"""
             SELECT
                 platform, track_id, track_name, artist, score, rank,
                 region, trend_date, metadata, first_detected
             FROM trends
-            WHERE ({' OR '.join(conditions)})
+            WHERE id IN ({matched_ids})
             AND is_active = 1
             ORDER BY score DESC
             """
 
-            df = pd.read_sql_query(query, conn, params=tuple(params))
+            df = pd.read_sql_query(query, conn)
+            conn.execute("DELETE FROM lookup_pairs")
+            conn.commit()
 
             # Parse metadata
             if not df.empty and "metadata" in df.columns:
@@ -691,76 +2113,148 @@ class EnhancedMusicDataStore:
 
             return df
 
-    def get_trending_summary_cached(
-        self, platform: str | None = None, days: int = 7
-    ) -> dict[str, Any]:
-        """Get a summary of trending tracks with caching.
+    def search_trends(
+        self, query: str, platform: str | None = None, limit: int = 50
+    ) -> pd.DataFrame:
+        """Full-text search over track names, artists and indexed metadata.
+
+        Each whitespace-separated term must match (diacritics and case are
+        ignored). Hits are ranked by BM25 with track name weighted above artist
+        and artist above metadata.
 
         Args:
-            platform: Platform to filter by (optional)
-            days: Number of days to look back
+            query: Search terms
+            platform: Filter by platform
+            limit: Maximum number of results
 
         Returns:
-            Summary dictionary with stats and top tracks
+            DataFrame of matching trends with a ``bm25`` column (lower is better)
         """
-        # Check cache first
-        cache_key = f"trending_summary:{platform or 'all'}:{days}"
-        cached_result = self._cache.get(cache_key)
-        if cached_result is not None:
-            self.logger.debug("Cache hit for trending summary")
-            return cached_result
+        terms = query.split()
+        if not terms:
+            return pd.DataFrame()
 
-        with self.get_connection() as conn:
-            conditions = [
-                "datetime(trend_date) >= datetime('now', ?)",
-                "is_active = 1",
-            ]
-            params = [f"-{days} days"]
+        if not self._has_search_index:
+            raise RuntimeError("Full-text search requires SQLite built with FTS5")
 
-            if platform:
-                conditions.append("platform = ?")
-                params.append(platform)
+        match_expression = " ".join(_fts_phrase(term) for term in terms)
+        conditions = ["trends_fts MATCH ?"]
+        params: list[Any] = [match_expression]
+
+        if platform:
+            conditions.append("t.platform = ?")
+            params.append(platform)
 
-            # Get aggregate stats
-            stats_query = f"""
+        with self.get_read_connection() as conn:
+            sql = f"""
             SELECT
-                COUNT(DISTINCT track_name || artist) as unique_tracks,
-                COUNT(DISTINCT platform) as platforms,
-                AVG(score) as avg_score,
-                MAX(score) as max_score,
-                COUNT(*) as total_entries
-            FROM trends
+                t.platform, t.track_id, t.track_name, t.artist, t.score, t.rank,
+                t.region, t.trend_date, t.metadata,
+                bm25(trends_fts, 10.0, 5.0, 1.0) as bm25
+            FROM trends_fts
+            JOIN trends t ON t.id = trends_fts.rowid
             WHERE {' AND '.join(conditions)}
+            ORDER BY bm25
+            LIMIT ?
             """
+            params.append(limit)
 
-            stats = pd.read_sql_query(stats_query, conn, params=tuple(params)).to_dict("records")[0]
+            df = pd.read_sql_query(sql, conn, params=tuple(params))
 
-            # Get top tracks
-            top_tracks_query = f"""
-            SELECT
-                track_name, artist, platform, score, rank
-            FROM trends
-            WHERE {' AND '.join(conditions)}
-            ORDER BY score DESC
-            LIMIT 10
-            """
+            if not df.empty and "metadata" in df.columns:
+                df["metadata"] = df["metadata"].apply(lambda x: json.loads(x) if x else {})
+
+            return df
+
+    def _track_match_clause(
+        self, track_name: str, artist: str, engine: str | None = None
+    ) -> tuple[str, list[Any]]:
+        """Build a substring filter on track_name/artist for ``trends``.
 
-            top_tracks = pd.read_sql_query(top_tracks_query, conn, params=tuple(params)).to_dict(
-                "records"
+        Uses the trigram index when available (same semantics as ``LIKE '%x%'``),
+        falling back to LIKE for terms shorter than three characters. Other
+        analytics engines get a case-insensitive ILIKE. ``engine`` defaults to
+        the configured analytics engine; pass "sqlite" for the store's own
+        connections.
+        """
+        if (engine or self.analytics_engine) != "sqlite":
+            return "track_name ILIKE ? AND artist ILIKE ?", [f"%{track_name}%", f"%{artist}%"]
+        if self._has_trigram_index and len(track_name) >= 3 and len(artist) >= 3:
+            return (
+                "id IN (SELECT rowid FROM trends_trigram WHERE trends_trigram MATCH ?)",
+                [f"track_name : {_fts_phrase(track_name)} AND artist : {_fts_phrase(artist)}"],
             )
+        return "track_name LIKE ? AND artist LIKE ?", [f"%{track_name}%", f"%{artist}%"]
 
-            result = {
-                "stats": stats,
-                "top_tracks": top_tracks,
-                "period_days": days,
-                "platform": platform or "all",
-            }
+    def get_trending_summary_cached(
+        self, platform: str | None = None, days: int = 7
+    ) -> dict[str, Any]:
+        """Get a summary of trending tracks with caching.
+
+        Args:
+            platform: Platform to filter by (optional)
+            days: Number of days to look back
 
-            # Cache for 10 minutes
-            self._cache.set(cache_key, result, ttl=600)
-            self.logger.debug("Cached trending summary")
+        Returns:
+            Summary dictionary with stats and top tracks
+        """
+        # Cache for 10 minutes; concurrent misses share one computation, and
+        # hot summaries refresh in the background around expiry
+        return self._cache.get_or_compute(
+            f"trending_summary:{platform or 'all'}:{days}",
+            lambda: self._compute_trending_summary(platform, days),
+            ttl=600,
+            stale_ttl=60,
+            early_expiry=1.0,
+        )
 
-            return result
+    def _compute_trending_summary(self, platform: str | None, days: int) -> dict[str, Any]:
+        """Query the stats and top tracks behind ``get_trending_summary_cached``."""
+        conditions = [
+            "is_active = 1",
+            "trend_ts >= ?",
+        ]
+        params: list[Any] = [_cutoff_epoch(days)]
+
+        if platform:
+            conditions.append("platform = ?")
+            params.append(platform)
+
+        # Get aggregate stats
+        stats_query = f"""
+        SELECT
+            COUNT(DISTINCT track_name || artist) as unique_tracks,
+            COUNT(DISTINCT platform) as platforms,
+            AVG(score) as avg_score,
+            MAX(score) as max_score,
+            COUNT(*) as total_entries
+        FROM trends
+        WHERE {' AND '.join(conditions)}
+        """
+
+        stats = self._analytics_query(stats_query, params).to_dict("records")[0]
+
+        # Get top tracks
+        top_tracks_query = f"""
+        SELECT
+            track_name, artist, platform, score, rank
+        FROM trends
+        WHERE {' AND '.join(conditions)}
+        ORDER BY score DESC
+        LIMIT 10
+        """
+
+        top_tracks = self._analytics_query(top_tracks_query, params).to_dict("records")
+
+        result = {
+            "stats": stats,
+            "top_tracks": top_tracks,
+            "period_days": days,
+            "platform": platform or "all",
+        }
+        self.logger.debug("Computed trending summary")
+
+        return result
 
     def update_trends_bulk(self, track_ids: list[str], updates: dict[str, Any]) -> int:
         """Update multiple trends with the same values.
@@ -779,6 +2273,19 @@ class EnhancedMusicDataStore:
         set_clauses = [f"{field} = ?" for field in updates]
         params = list(updates.values())
 
+        # Keep epoch columns in step with the date columns they mirror
+        for column, source in (("trend_ts", "trend_date"), ("first_detected_ts", "first_detected")):
+            if source in updates:
+                set_clauses.append(f"{column} = CAST(strftime('%s', ?) AS INTEGER)")
+                value = updates[source]
+                params.append(value.isoformat() if hasattr(value, "isoformat") else value)
+
+        if "track_name" in updates or "artist" in updates:
+            set_clauses.append(
+                "match_key = audora_match_key(COALESCE(?, track_name), COALESCE(?, artist))"
+            )
+            params.extend([updates.get("track_name"), updates.get("artist")])
+
         # Add track IDs for WHERE clause
         placeholders = ",".join("?" * len(track_ids))
         params.extend(track_ids)
@@ -812,101 +2319,464 @@ class EnhancedMusicDataStore:
         Returns:
             Cross-platform analysis results
         """
-        with self.get_connection() as conn:
-            # Get all platform appearances for this track
-            query = """
+        match_clause, match_params = self._track_match_clause(track_name, artist)
+
+        # Get all platform appearances for this track
+        query = f"""
+        SELECT
+            platform,
+            MIN(first_detected_ts) as first_appearance,
+            MAX(score) as peak_score,
+            COUNT(*) as data_points
+        FROM trends
+        WHERE {match_clause}
+        AND trend_ts >= ?
+        GROUP BY platform
+        ORDER BY first_appearance
+        """
+
+        df = self._analytics_query(query, [*match_params, _cutoff_epoch(days)])
+
+        if df.empty:
+            return {"message": "No cross-platform data found"}
+
+        platforms = df["platform"].tolist()
+
+        # Calculate propagation times
+        df["match_key"] = ""
+        df["track_name"] = track_name
+        df["artist"] = artist
+        edges = self._propagation_edges(df)
+        self.save_cross_platform_correlations(edges)
+
+        propagation_analysis = [
+            {
+                "from_platform": edge.source_platform,
+                "to_platform": edge.target_platform,
+                "hours_difference": float(edge.lag_hours),
+                "score_change": float(edge.score_change),
+            }
+            for edge in edges.itertuples(index=False)
+        ]
+
+        return {
+            "track_name": track_name,
+            "artist": artist,
+            "platforms": platforms,
+            "platform_count": len(platforms),
+            "first_platform": platforms[0] if platforms else None,
+            "propagation_pattern": propagation_analysis,
+            "total_propagation_time": sum(p["hours_difference"] for p in propagation_analysis),
+            "analysis_timestamp": datetime.now().isoformat(),
+        }
+
+    def get_first_appearances(self, days: int = 30) -> pd.DataFrame:
+        """First appearance and peak score of every track on every platform.
+
+        Tracks are grouped by ``match_key`` (exact normalised track/artist), in
+        one window-function pass over the trends seen in the last ``days``.
+
+        Returns:
+            One row per (match_key, platform) with first_appearance (epoch
+            seconds), peak_score and the track_name/artist of the track's
+            earliest row on any platform
+        """
+        query = """
+        SELECT match_key, platform, first_appearance, peak_score, track_name, artist
+        FROM (
             SELECT
+                match_key,
                 platform,
-                MIN(datetime(first_detected)) as first_appearance,
-                MAX(score) as peak_score,
-                COUNT(*) as data_points
+                MIN(first_detected_ts) OVER by_platform AS first_appearance,
+                MAX(score) OVER by_platform AS peak_score,
+                FIRST_VALUE(track_name) OVER by_track AS track_name,
+                FIRST_VALUE(artist) OVER by_track AS artist,
+                ROW_NUMBER() OVER (PARTITION BY match_key, platform ORDER BY id) AS row_number
             FROM trends
-            WHERE track_name LIKE ? AND artist LIKE ?
-            AND datetime(trend_date) >= datetime('now', ?)
-            GROUP BY platform
-            ORDER BY first_appearance
-            """
+            WHERE trend_ts >= ? AND match_key IS NOT NULL
+            WINDOW
+                by_platform AS (PARTITION BY match_key, platform),
+                by_track AS (PARTITION BY match_key ORDER BY first_detected_ts, id)
+        ) AS appearances
+        WHERE row_number = 1
+        """
+        return self._analytics_query(query, [_cutoff_epoch(days)])
 
-            df = pd.read_sql_query(
-                query, conn, params=[f"%{track_name}%", f"%{artist}%", f"-{days} days"]
-            )
+    @staticmethod
+    def _propagation_edges(first_seen: pd.DataFrame) -> pd.DataFrame:
+        """Platform-to-platform hops from per-platform first appearances.
 
-            if df.empty:
-                return {"message": "No cross-platform data found"}
-
-            platforms = df["platform"].tolist()
-
-            # Calculate propagation times
-            propagation_analysis = []
-            if len(platforms) > 1:
-                df["first_appearance"] = pd.to_datetime(df["first_appearance"])
-                df = df.sort_values("first_appearance")
-
-                for i in range(1, len(df)):
-                    current = df.iloc[i]
-                    previous = df.iloc[i - 1]
-
-                    time_diff = (
-                        current["first_appearance"] - previous["first_appearance"]
-                    ).total_seconds() / 3600
-
-                    propagation_analysis.append(
-                        {
-                            "from_platform": previous["platform"],
-                            "to_platform": current["platform"],
-                            "hours_difference": round(time_diff, 1),
-                            "score_change": current["peak_score"] - previous["peak_score"],
-                        }
-                    )
-
-            # Store correlation data
-            for prop in propagation_analysis:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                INSERT OR REPLACE INTO cross_platform_correlations
-                (track_name, artist, source_platform, target_platform,
-                 lag_hours, propagation_strength, analysis_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        track_name,
-                        artist,
-                        prop["from_platform"],
-                        prop["to_platform"],
-                        prop["hours_difference"],
-                        abs(prop["score_change"]) / 10.0,  # Normalize strength
-                        datetime.now().isoformat(),
-                    ),
-                )
+        Each track's platforms are ordered by first appearance and every
+        consecutive pair becomes one edge, computed with array shifts rather
+        than a per-row loop.
 
-            conn.commit()
+        Args:
+            first_seen: match_key, platform, first_appearance (epoch seconds),
+                peak_score, track_name and artist per (match_key, platform)
 
-            return {
-                "track_name": track_name,
-                "artist": artist,
-                "platforms": platforms,
-                "platform_count": len(platforms),
-                "first_platform": platforms[0] if platforms else None,
-                "propagation_pattern": propagation_analysis,
-                "total_propagation_time": sum(p["hours_difference"] for p in propagation_analysis),
-                "analysis_timestamp": datetime.now().isoformat(),
+        Returns:
+            match_key, track_name, artist, source_platform, target_platform,
+            lag_hours, score_change and propagation_strength per edge
+        """
+        ordered = first_seen.sort_values(
+            ["match_key", "first_appearance", "platform"], kind="stable"
+        )
+        keys = ordered["match_key"].to_numpy()
+        target = np.flatnonzero(keys[1:] == keys[:-1]) + 1
+        source = target - 1
+
+        appeared = ordered["first_appearance"].to_numpy(dtype=float)
+        peaks = ordered["peak_score"].to_numpy(dtype=float)
+        platforms = ordered["platform"].to_numpy()
+        score_change = peaks[target] - peaks[source]
+        return pd.DataFrame(
+            {
+                "match_key": keys[target],
+                "track_name": ordered["track_name"].to_numpy()[target],
+                "artist": ordered["artist"].to_numpy()[target],
+                "source_platform": platforms[source],
+                "target_platform": platforms[target],
+                "lag_hours": np.round((appeared[target] - appeared[source]) / 3600, 1),
+                "score_change": score_change,
+                "propagation_strength": np.abs(score_change) / 10.0,  # Normalize strength
             }
+        )
 
-    def create_backup(self) -> str:
-        """Create a backup of the database."""
-        backup_filename = f"music_trends_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-        backup_path = self.backup_dir / backup_filename
+    def save_cross_platform_correlations(
+        self, edges: pd.DataFrame, analysis_date: str | None = None
+    ) -> int:
+        """Bulk-write propagation edges to ``cross_platform_correlations``.
+
+        Args:
+            edges: Output of ``_propagation_edges``
+            analysis_date: ISO timestamp shared by the batch (defaults to now)
 
-        with self.get_connection() as source_conn, sqlite3.connect(backup_path) as backup_conn:
-            source_conn.backup(backup_conn)
+        Returns:
+            Number of rows written
+        """
+        if edges.empty:
+            return 0
+        analysis_date = analysis_date or datetime.now().isoformat()
+        rows = [
+            (
+                edge.track_name,
+                edge.artist,
+                edge.source_platform,
+                edge.target_platform,
+                float(edge.lag_hours),
+                float(edge.propagation_strength),
+                analysis_date,
+            )
+            for edge in edges.itertuples(index=False)
+        ]
+        with self.get_connection() as conn:
+            conn.executemany(
+                """
+            INSERT OR REPLACE INTO cross_platform_correlations
+            (track_name, artist, source_platform, target_platform,
+             lag_hours, propagation_strength, analysis_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
+            conn.commit()
+        return len(rows)
+
+    def analyze_cross_platform_spread_all(self, days: int = 30) -> pd.DataFrame:
+        """Analyze cross-platform spread for every track seen in the last ``days``.
+
+        Set-based counterpart of ``analyze_cross_platform_spread``: one query
+        for all first appearances, vectorised lag computation and a single
+        bulk write, instead of one query and one INSERT per edge per track.
+        Tracks are matched exactly on ``match_key`` rather than by substring.
+
+        Args:
+            days: Number of days to analyze
+
+        Returns:
+            Propagation edges written (see ``_propagation_edges``)
+        """
+        edges = self._propagation_edges(self.get_first_appearances(days))
+        written = self.save_cross_platform_correlations(edges)
+        self.logger.info(
+            f"Cross-platform spread: {written} edges across {edges['match_key'].nunique()} tracks"
+        )
+        return edges
+
+    def create_backup(
+        self,
+        pages: int = 1024,
+        sleep: float = 0.05,
+        compression: str | None = None,
+        progress: Callable[[int, int, int], None] | None = None,
+        max_restarts: int = 3,
+    ) -> str:
+        """Create an online backup of the database.
+
+        The copy runs ``pages`` pages at a time, releasing the source between
+        steps and sleeping ``sleep`` seconds so writers are not stalled for the
+        whole copy. A write from another connection restarts the backup from the
+        first page, so on a busy database a paged copy may never finish; after
+        ``max_restarts`` restarts it falls back to a single-step copy, which
+        holds a read transaction for its whole duration instead.
+
+        Args:
+            pages: Pages copied per step (-1 copies everything in one step)
+            sleep: Seconds to pause between steps
+            compression: None, "gzip" or "zstd" (requires the zstandard package)
+            progress: Optional callback(status, remaining, total) after each step
+            max_restarts: Restarts tolerated before falling back to one step
 
-        self.logger.info(f"Database backup created: {backup_path}")
+        Returns:
+            Path to the backup file
+        """
+        if compression not in BACKUP_SUFFIXES:
+            raise ValueError(f"Unsupported compression: {compression}")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ImportError("zstandard package required for zstd backups")
+
+        timestamp = datetime.now().strftime(BACKUP_TIMESTAMP_FORMAT)
+        backup_path = self.backup_dir / f"{BACKUP_PREFIX}{timestamp}.db"
+
+        restarts = 0
+        last_remaining: int | None = None
+
+        def log_progress(status: int, remaining: int, total: int) -> None:
+            nonlocal restarts, last_remaining
+            self.logger.debug(f"Backup progress: {total - remaining}/{total} pages")
+            if progress:
+                progress(status, remaining, total)
+            # Remaining pages only grow when a write restarted the copy
+            if last_remaining is not None and remaining > last_remaining:
+                restarts += 1
+                if restarts > max_restarts:
+                    raise _BackupRestartLimit
+            last_remaining = remaining
+
+        started = time.monotonic()
+        with (
+            self.get_connection() as source_conn,
+            closing(sqlite3.connect(backup_path)) as backup_conn,
+        ):
+            try:
+                source_conn.backup(backup_conn, pages=pages, progress=log_progress, sleep=sleep)
+            except _BackupRestartLimit:
+                self.logger.warning(
+                    f"Backup restarted {restarts} times by concurrent writes; "
+                    "copying in a single step"
+                )
+                source_conn.backup(backup_conn, pages=-1)
+
+        if compression:
+            compressed_path = backup_path.with_suffix(BACKUP_SUFFIXES[compression])
+            opener = gzip.open if compression == "gzip" else self._open_zstd_writer
+            with backup_path.open("rb") as src, opener(compressed_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, length=1024 * 1024)
+            backup_path.unlink()
+            backup_path = compressed_path
+
+        self.logger.info(
+            f"Database backup created: {backup_path} ({time.monotonic() - started:.1f}s)"
+        )
         return str(backup_path)
 
-    def export_to_csv(self, table: str, filepath: str, days: int | None = None) -> str:
+    @staticmethod
+    def _open_zstd_writer(path: Path, mode: str = "wb"):
+        """Open a zstd-compressed file for writing."""
+        return zstandard.open(path, mode)
+
+    def list_backups(self) -> list[tuple[datetime, Path]]:
+        """List backup files in backup_dir, newest first."""
+        backups = []
+        for path in self.backup_dir.glob(f"{BACKUP_PREFIX}*"):
+            stamp = path.name[len(BACKUP_PREFIX) :].split(".", 1)[0]
+            try:
+                backups.append((datetime.strptime(stamp, BACKUP_TIMESTAMP_FORMAT), path))
+            except ValueError:
+                continue
+        return sorted(backups, reverse=True)
+
+    def prune_backups(self, hourly: int = 24, daily: int = 7, weekly: int = 4) -> list[str]:
+        """Apply a grandfather-father-son retention policy to backup_dir.
+
+        Keeps the newest backup in each of the last ``hourly`` hours, ``daily``
+        days and ``weekly`` ISO weeks that have backups; everything else is
+        deleted.
+
+        Returns:
+            Paths of deleted backups
+        """
+        backups = self.list_backups()
+        keep: set[Path] = set()
+
+        for limit, bucket in (
+            (hourly, lambda d: d.strftime("%Y%m%d%H")),
+            (daily, lambda d: d.strftime("%Y%m%d")),
+            (weekly, lambda d: d.strftime("%G%V")),
+        ):
+            seen: set[str] = set()
+            for created, path in backups:
+                key = bucket(created)
+                if key in seen:
+                    continue
+                if len(seen) >= limit:
+                    break
+                seen.add(key)
+                keep.add(path)
+
+        deleted = []
+        for _, path in backups:
+            if path not in keep:
+                path.unlink()
+                deleted.append(str(path))
+
+        if deleted:
+            self.logger.info(f"Pruned {len(deleted)} old backups, kept {len(keep)}")
+        return deleted
+
+    # Compaction steps: (source, target, projection onto the aggregate columns,
+    # cutoff column). Raw rows count as one sample each.
+    _HISTORY_ROLLUPS = [
+        (
+            "trend_history",
+            "hourly",
+            "timestamp AS ts, 1 AS samples, score AS min_score, score AS max_score, "
+            "score AS mean_score, COALESCE(velocity, 0) AS mean_velocity, rank AS last_rank",
+            "timestamp",
+        ),
+        (
+            "trend_history_hourly",
+            "daily",
+            "last_timestamp AS ts, samples, min_score, max_score, mean_score, "
+            "mean_velocity, last_rank",
+            "bucket",
+        ),
+    ]
+
+    def compact_history(
+        self, raw_days: int = 7, hourly_days: int = 90, batch_size: int = 10000
+    ) -> dict[str, int]:
+        """Downsample old trend_history into hourly and daily aggregates.
+
+        Raw rows older than ``raw_days`` are rolled into trend_history_hourly and
+        hourly buckets older than ``hourly_days`` into trend_history_daily
+        (min/max/mean score, mean velocity, last rank). Source rows are deleted
+        batch by batch in the same transaction as their aggregate upsert, so
+        repeated or interrupted runs never double count. Cutoffs are aligned to
+        bucket boundaries so only complete hours/days are compacted.
+
+        trend_stats is left untouched and keeps counting every data point ever
+        recorded. ``get_trend_history`` reads raw and compacted rows together.
+
+        Args:
+            raw_days: Age after which raw history is rolled into hourly buckets
+            hourly_days: Age after which hourly buckets are rolled into daily ones
+            batch_size: Source rows per transaction
+
+        Returns:
+            Number of source rows compacted into each resolution
+        """
+        if hourly_days < raw_days:
+            raise ValueError("hourly_days must be greater than or equal to raw_days")
+
+        now = datetime.now()
+        cutoffs = {
+            "hourly": (now - timedelta(days=raw_days)).replace(minute=0, second=0, microsecond=0),
+            "daily": (now - timedelta(days=hourly_days)).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            ),
+        }
+
+        compacted: dict[str, int] = {}
+        with self.get_connection() as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS compact_batch (rid INTEGER PRIMARY KEY)")
+
+            for source, resolution, projection, cutoff_column in self._HISTORY_ROLLUPS:
+                bucket = f"strftime('{HISTORY_RESOLUTIONS[resolution]}', ts)"
+                cutoff = cutoffs[resolution].isoformat()
+                compacted[resolution] = 0
+
+                while True:
+                    try:
+                        conn.execute("BEGIN IMMEDIATE")
+                        conn.execute("DELETE FROM compact_batch")
+                        selected = conn.execute(
+                            f"""
+                        INSERT INTO compact_batch
+                        SELECT id FROM {source} WHERE {cutoff_column} < ? LIMIT ?
+                        """,
+                            (cutoff, batch_size),
+                        ).rowcount
+                        if selected <= 0:
+                            conn.rollback()
+                            break
+
+                        conn.execute(
+                            f"""
+                        WITH batch AS (
+                            SELECT trend_id, {bucket} AS bucket, ts, samples, min_score,
+                                   max_score, mean_score, mean_velocity,
+                                   FIRST_VALUE(last_rank) OVER (
+                                       PARTITION BY trend_id, {bucket} ORDER BY ts DESC
+                                   ) AS last_rank
+                            FROM (
+                                SELECT trend_id, {projection} FROM {source}
+                                WHERE id IN (SELECT rid FROM compact_batch)
+                            )
+                        )
+                        INSERT INTO trend_history_{resolution}
+                        (trend_id, bucket, samples, min_score, max_score, mean_score,
+                         mean_velocity, last_rank, last_timestamp)
+                        SELECT
+                            trend_id, bucket, SUM(samples), MIN(min_score), MAX(max_score),
+                            SUM(mean_score * samples) / SUM(samples),
+                            SUM(mean_velocity * samples) / SUM(samples),
+                            MAX(last_rank), MAX(ts)
+                        FROM batch
+                        WHERE true
+                        GROUP BY trend_id, bucket
+                        ON CONFLICT(trend_id, bucket) DO UPDATE SET
+                            samples = samples + excluded.samples,
+                            min_score = MIN(min_score, excluded.min_score),
+                            max_score = MAX(max_score, excluded.max_score),
+                            mean_score = (mean_score * samples
+                                          + excluded.mean_score * excluded.samples)
+                                         / (samples + excluded.samples),
+                            mean_velocity = (mean_velocity * samples
+                                             + excluded.mean_velocity * excluded.samples)
+                                            / (samples + excluded.samples),
+                            last_rank = CASE WHEN excluded.last_timestamp >= last_timestamp
+                                             THEN excluded.last_rank ELSE last_rank END,
+                            last_timestamp = MAX(last_timestamp, excluded.last_timestamp)
+                        """
+                        )
+
+                        conn.execute(
+                            f"DELETE FROM {source} WHERE id IN (SELECT rid FROM compact_batch)"
+                        )
+                        conn.commit()
+                    except Exception as e:
+                        conn.rollback()
+                        self.logger.error(f"History compaction into {resolution} failed: {e}")
+                        raise
+
+                    compacted[resolution] += selected
+
+        if any(compacted.values()):
+            self.logger.info(
+                f"Compacted {compacted['hourly']} raw history rows into hourly and "
+                f"{compacted['daily']} hourly rows into daily aggregates"
+            )
+        return compacted
+
+    def export_to_csv(
+        self, table: str, filepath: str, days: int | None = None, chunk_size: int = 50000
+    ) -> str:
         """Export table data to CSV.
 
+        Rows are streamed ``chunk_size`` at a time, so memory use does not grow
+        with the table.
+
         Note: Table name is validated against whitelist to prevent SQL injection.
         """
         # Whitelist valid table names to prevent SQL injection
@@ -929,76 +2799,300 @@ class EnhancedMusicDataStore:
                 WHERE datetime(created_at) >= datetime('now', ?)
                 ORDER BY created_at DESC
                 """
-                df = pd.read_sql_query(query, conn, params=[f"-{days} days"])
+                chunks = pd.read_sql_query(
+                    query, conn, params=[f"-{days} days"], chunksize=chunk_size
+                )
             else:
                 # Table name is validated above, safe to use in query
                 query = f"SELECT * FROM {table} ORDER BY created_at DESC"
-                df = pd.read_sql_query(query, conn)
+                chunks = pd.read_sql_query(query, conn, chunksize=chunk_size)
 
             # Ensure directory exists
             Path(filepath).resolve().parent.mkdir(parents=True, exist_ok=True)
 
-            df.to_csv(filepath, index=False)
-            self.logger.info(f"Exported {len(df)} rows from {table} to {filepath}")
+            exported = 0
+            with Path(filepath).open("w", newline="") as f:
+                for i, chunk in enumerate(chunks):
+                    chunk.to_csv(f, index=False, header=i == 0)
+                    exported += len(chunk)
+            self.logger.info(f"Exported {exported} rows from {table} to {filepath}")
 
         return filepath
 
-    def get_data_quality_report(self) -> dict[str, Any]:
-        """Generate comprehensive data quality report."""
+    # Tables exportable as Parquet: partition columns (name -> SQL expression) and
+    # the column/kind used to push a ``days`` window down into the SQLite query
+    _SNAPSHOT_TABLES: dict[str, dict[str, Any]] = {
+        "trends": {
+            "partitions": {"platform": "platform", "trend_day": "date(trend_ts, 'unixepoch')"},
+            "window": ("trend_ts", "epoch"),
+        },
+        "trend_history": {
+            "partitions": {"day": "date(timestamp)"},
+            "window": ("timestamp", "iso"),
+        },
+        "trend_history_hourly": {
+            "partitions": {"day": "date(bucket)"},
+            "window": ("bucket", "iso"),
+        },
+        "trend_history_daily": {
+            "partitions": {"day": "date(bucket)"},
+            "window": ("bucket", "iso"),
+        },
+        "viral_predictions": {
+            "partitions": {"day": "date(prediction_ts, 'unixepoch')"},
+            "window": ("prediction_ts", "epoch"),
+        },
+        "cross_platform_correlations": {
+            "partitions": {"day": "date(analysis_date)"},
+            "window": ("analysis_date", "iso"),
+        },
+    }
+
+    def export_to_parquet(
+        self, table: str, directory: str, days: int | None = None, chunk_size: int = 50000
+    ) -> str:
+        """Stream a table to a hive-partitioned, zstd-compressed Parquet dataset.
+
+        Rows are read with ``fetchmany`` and written as Arrow record batches, so
+        memory stays bounded by ``chunk_size``. ``trends`` is partitioned by
+        platform and trend day, the other tables by day. The ``days`` window is
+        applied in the SQLite query on an indexed column.
+
+        Args:
+            table: One of the snapshot tables (trends, trend_history, ...)
+            directory: Output dataset directory (existing partitions are replaced)
+            days: Only export rows from the last N days
+            chunk_size: Rows per record batch
+
+        Returns:
+            Path to the dataset directory
+        """
+        columnar.require_pyarrow()
+        if table not in self._SNAPSHOT_TABLES:
+            raise ValueError(
+                f"Invalid table name: {table}. Must be one of {set(self._SNAPSHOT_TABLES)}"
+            )
+
+        spec = self._SNAPSHOT_TABLES[table]
         with self.get_connection() as conn:
-            cursor = conn.cursor()
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+            extra = [name for name in spec["partitions"] if name not in columns]
+            schema = columnar.table_schema(conn, table, columns, extra=extra)
 
-            # Table row counts with validated table names
-            table_stats = {}
-            # Whitelist of valid tables to prevent SQL injection
-            tables = ["trends", "trend_history", "viral_predictions", "cross_platform_correlations"]
+            select_list = ", ".join(
+                columns + [f"{spec['partitions'][name]} AS {name}" for name in extra]
+            )
+            query = f"SELECT {select_list} FROM {table}"
+            params: list[Any] = []
+            if days:
+                window_column, kind = spec["window"]
+                cutoff = _cutoff_epoch(days)
+                query += f" WHERE {window_column} >= ?"
+                params.append(
+                    cutoff
+                    if kind == "epoch"
+                    else time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(cutoff))
+                )
 
-            for table in tables:
-                # Table names are from whitelist, safe to use
-                cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                table_stats[table] = cursor.fetchone()[0]
+            cursor = conn.execute(query, params)
+            path = columnar.write_dataset(
+                columnar.iter_record_batches(cursor, schema, chunk_size),
+                schema,
+                directory,
+                partition_cols=list(spec["partitions"]),
+            )
 
-            # Data quality checks
-            quality_issues = []
+        self.logger.info(f"Exported {table} to Parquet dataset {path}")
+        return str(path)
 
-            # Check for missing track names or artists
-            cursor.execute("SELECT COUNT(*) FROM trends WHERE track_name = '' OR artist = ''")
-            missing_data = cursor.fetchone()[0]
-            if missing_data > 0:
-                quality_issues.append(f"{missing_data} trends with missing track name or artist")
+    # Tables whose replacement invalidates trend_stats and the history rollups
+    _ROLLUP_SOURCE_TABLES = frozenset(
+        {"trends", "trend_history", "trend_history_hourly", "trend_history_daily"}
+    )
 
-            # Check for score outliers
-            cursor.execute("SELECT COUNT(*) FROM trends WHERE score < 0 OR score > 100")
-            invalid_scores = cursor.fetchone()[0]
-            if invalid_scores > 0:
-                quality_issues.append(f"{invalid_scores} trends with invalid scores")
+    def _rebuild_trend_rollups(self, conn: sqlite3.Connection) -> None:
+        """Recompute trend_stats and drop rollups of trends that no longer exist.
 
-            # Check for orphaned history records
-            cursor.execute(
-                """
-            SELECT COUNT(*) FROM trend_history th
-            LEFT JOIN trends t ON th.trend_id = t.id
-            WHERE t.id IS NULL
+        Stats are rebuilt from raw and compacted history together, matching what
+        the insert trigger would have accumulated before compaction.
+        """
+        for resolution in HISTORY_RESOLUTIONS:
+            conn.execute(
+                f"""
+            DELETE FROM trend_history_{resolution}
+            WHERE trend_id NOT IN (SELECT id FROM trends)
             """
             )
-            orphaned_history = cursor.fetchone()[0]
-            if orphaned_history > 0:
-                quality_issues.append(f"{orphaned_history} orphaned history records")
-
-            # Platform distribution
-            cursor.execute(
-                """
-            SELECT platform, COUNT(*) as count
-            FROM trends
-            WHERE datetime(trend_date) >= datetime('now', '-7 days')
-            GROUP BY platform
-            ORDER BY count DESC
+        conn.execute("DELETE FROM trend_stats")
+        # Bare score column takes its value from the MAX(timestamp) row
+        cursor = conn.execute(
             """
+        INSERT INTO trend_stats
+        (trend_id, data_points, sum_velocity, last_score, last_timestamp)
+        SELECT trend_id, SUM(samples), COALESCE(SUM(velocity * samples), 0),
+               score, MAX(timestamp)
+        FROM trend_history_all
+        WHERE trend_id IN (SELECT id FROM trends)
+        GROUP BY trend_id
+        """
+        )
+        self.logger.info(f"Rebuilt trend_stats for {cursor.rowcount} trends")
+
+    def import_from_parquet(self, table: str, directory: str, replace: bool = False) -> int:
+        """Load rows from a Parquet dataset written by ``export_to_parquet``.
+
+        Row ids are preserved, so trends and their history stay linked.
+        Triggers rebuild the search indexes. A replacing import of trends keeps
+        the history rollups of ids that come back and drops the rest, and any
+        replacing import of trends or history rebuilds trend_stats afterwards.
+
+        Args:
+            table: Target table (one of the snapshot tables)
+            directory: Dataset directory
+            replace: Delete existing rows first; otherwise rows whose id already
+                exists are skipped
+
+        Returns:
+            Number of rows imported
+        """
+        columnar.require_pyarrow()
+        if table not in self._SNAPSHOT_TABLES:
+            raise ValueError(
+                f"Invalid table name: {table}. Must be one of {set(self._SNAPSHOT_TABLES)}"
             )
-            platform_distribution = dict(cursor.fetchall())
 
+        with self.get_connection() as conn:
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+            names, batches = columnar.read_dataset_batches(directory, columns)
+            placeholders = ", ".join("?" * len(names))
+            verb = "INSERT" if replace else "INSERT OR IGNORE"
+            insert_sql = f"{verb} INTO {table} ({', '.join(names)}) VALUES ({placeholders})"
+
+            imported = 0
+            try:
+                conn.execute("BEGIN TRANSACTION")
+                if replace:
+                    if table == "trends":
+                        # Skip the per-row rollup cleanup; _rebuild_trend_rollups
+                        # reconciles them against the imported ids in one pass
+                        conn.execute("DROP TRIGGER IF EXISTS trg_trends_stats_delete")
+                        conn.execute("DROP TRIGGER IF EXISTS trg_trends_rollup_delete")
+                    conn.execute(f"DELETE FROM {table}")
+
+                for batch in batches:
+                    cursor = conn.executemany(insert_sql, columnar.batch_rows(batch))
+                    imported += cursor.rowcount
+
+                if replace and table in self._ROLLUP_SOURCE_TABLES:
+                    if table == "trends":
+                        self._create_trend_triggers(conn)
+                    self._rebuild_trend_rollups(conn)
+
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                self.logger.error(f"Parquet import into {table} failed: {e}")
+                raise
+
+        self.logger.info(f"Imported {imported} rows into {table} from {directory}")
+        return imported
+
+    def create_snapshot(self, directory: str | None = None, days: int | None = None) -> str:
+        """Export every snapshot table as Parquet under one directory.
+
+        Args:
+            directory: Snapshot root (defaults to a timestamped folder in backup_dir)
+            days: Only export rows from the last N days
+
+        Returns:
+            Path to the snapshot root, with one dataset subdirectory per table
+        """
+        root = (
+            Path(directory)
+            if directory
+            else (self.backup_dir / f"snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        )
+        for table in self._SNAPSHOT_TABLES:
+            self.export_to_parquet(table, str(root / table), days=days)
+
+        self.logger.info(f"Parquet snapshot created: {root}")
+        return str(root)
+
+    def restore_snapshot(self, directory: str, replace: bool = True) -> dict[str, int]:
+        """Rebuild tables from a snapshot written by ``create_snapshot``.
+
+        Returns:
+            Rows imported per table
+        """
+        root = Path(directory)
+        return {
+            table: self.import_from_parquet(table, str(root / table), replace=replace)
+            for table in self._SNAPSHOT_TABLES
+            if (root / table).exists()
+        }
+
+    def get_data_quality_report(self) -> dict[str, Any]:
+        """Generate comprehensive data quality report.
+
+        Checks run on the analytics engine; the result is logged to
+        data_quality_logs on the primary database.
+        """
+
+        def scalar(sql: str) -> int:
+            return int(self._analytics_query(sql).iloc[0, 0])
+
+        # Table row counts with validated table names
+        table_stats = {}
+        # Whitelist of valid tables to prevent SQL injection
+        tables = ["trends", "trend_history", "viral_predictions", "cross_platform_correlations"]
+
+        for table in tables:
+            # Table names are from whitelist, safe to use
+            table_stats[table] = scalar(f"SELECT COUNT(*) FROM {table}")
+
+        # Data quality checks
+        quality_issues = []
+
+        # Check for missing track names or artists
+        missing_data = scalar("SELECT COUNT(*) FROM trends WHERE track_name = '' OR artist = ''")
+        if missing_data > 0:
+            quality_issues.append(f"{missing_data} trends with missing track name or artist")
+
+        # Check for score outliers
+        invalid_scores = scalar("SELECT COUNT(*) FROM trends WHERE score < 0 OR score > 100")
+        if invalid_scores > 0:
+            quality_issues.append(f"{invalid_scores} trends with invalid scores")
+
+        # Check for orphaned history records
+        orphaned_history = scalar(
+            """
+        SELECT COUNT(*) FROM trend_history th
+        LEFT JOIN trends t ON th.trend_id = t.id
+        WHERE t.id IS NULL
+        """
+        )
+        if orphaned_history > 0:
+            quality_issues.append(f"{orphaned_history} orphaned history records")
+
+        # Platform distribution
+        distribution = self._analytics_query(
+            """
+        SELECT platform, COUNT(*) as count
+        FROM trends
+        WHERE trend_ts >= ?
+        GROUP BY platform
+        ORDER BY count DESC
+        """,
+            [_cutoff_epoch(7)],
+        )
+        platform_distribution = {
+            platform: int(count)
+            for platform, count in zip(distribution["platform"], distribution["count"], strict=True)
+        }
+
+        with self.get_connection() as conn:
             # Log quality report
-            cursor.execute(
+            conn.execute(
                 """
             INSERT INTO data_quality_logs
             (table_name, validation_type, validation_result, details, row_count, issue_count)
@@ -1025,6 +3119,90 @@ class EnhancedMusicDataStore:
                 "issue_count": len(quality_issues),
             }
 
+    # Representative shapes of the hot read paths, checked by get_index_report
+    _QUERY_CATALOGUE: dict[str, tuple[str, tuple[Any, ...]]] = {
+        "trending_tracks": (
+            """
+        SELECT t.platform, t.track_name, t.artist, t.score, s.data_points
+        FROM trends t LEFT JOIN trend_stats s ON s.trend_id = t.id
+        WHERE t.is_active = 1 AND t.trend_ts >= ? AND t.score >= ?
+        ORDER BY t.score DESC, t.trend_date DESC LIMIT ?
+        """,
+            (0, 0.0, 50),
+        ),
+        "trending_tracks_by_platform": (
+            """
+        SELECT t.platform, t.track_name, t.artist, t.score, s.data_points
+        FROM trends t LEFT JOIN trend_stats s ON s.trend_id = t.id
+        WHERE t.is_active = 1 AND t.trend_ts >= ? AND t.score >= ? AND t.platform = ?
+        ORDER BY t.score DESC, t.trend_date DESC LIMIT ?
+        """,
+            (0, 0.0, "spotify", 50),
+        ),
+        "top_movers": (
+            """
+        SELECT t.track_name, t.artist, s.sum_velocity / s.data_points AS avg_velocity
+        FROM trends t JOIN trend_stats s ON s.trend_id = t.id
+        WHERE t.is_active = 1 AND t.trend_ts >= ? AND s.data_points > 0
+        ORDER BY avg_velocity DESC, t.score DESC LIMIT ?
+        """,
+            (0, 20),
+        ),
+        "trend_by_key": (
+            """
+        SELECT id FROM trends
+        WHERE platform = ? AND track_id = ? AND region = ? AND trend_date = ?
+        """,
+            ("spotify", "", "US", ""),
+        ),
+        "trends_by_match_key": (
+            "SELECT platform, first_detected_ts FROM trends WHERE match_key = ?",
+            ("",),
+        ),
+        "trend_history": (
+            """
+        SELECT timestamp, score FROM trend_history_all
+        WHERE trend_id = ? AND timestamp >= ? ORDER BY timestamp
+        """,
+            (0, ""),
+        ),
+        "viral_predictions": (
+            """
+        SELECT track_name, artist, confidence FROM viral_predictions
+        WHERE prediction_ts >= ? AND confidence >= ?
+        ORDER BY prediction_date DESC, confidence DESC LIMIT ?
+        """,
+            (0, 0.7, 20),
+        ),
+        "history_compaction": ("SELECT id FROM trend_history WHERE timestamp < ? LIMIT ?", ("", 1)),
+        "platform_distribution": (
+            "SELECT platform, COUNT(*) FROM trends WHERE trend_ts >= ? GROUP BY platform",
+            (0,),
+        ),
+    }
+
+    def get_index_report(self) -> dict[str, Any]:
+        """Run ``EXPLAIN QUERY PLAN`` over ``_QUERY_CATALOGUE`` and report index usage.
+
+        Returns:
+            Per-query plans plus the queries with full scans or temp B-trees,
+            indexes no catalogued query uses and indexes made redundant by a
+            wider one (see ``core.index_advisor.advise_indexes``)
+        """
+        catalogue = dict(self._QUERY_CATALOGUE)
+        catalogue["audio_feature_matrix"] = (
+            f"""
+        SELECT energy, danceability, valence, acousticness, tempo FROM trends
+        WHERE is_active = 1 AND trend_ts >= ? AND {self._HAS_AUDIO_FEATURES}
+        ORDER BY score DESC
+        """,
+            (0,),
+        )
+        with self.get_connection() as conn:
+            report = advise_indexes(conn, catalogue)
+        report["schema_version"] = self.get_schema_version()["version"]
+        return report
+
 
 # Example usage
 if __name__ == "__main__":
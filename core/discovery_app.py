@@ -17,7 +17,8 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 # Import all enhanced components
 from analytics.advanced_analytics import MusicTrendAnalytics
-from core.data_store import EnhancedMusicDataStore
+from core.async_data_store import AsyncMusicDataStore
+from core.data_store import EnhancedMusicDataStore, TrendData, normalize_match_key
 from core.notification_service import (
     EnhancedNotificationService,
     NotificationChannel,
@@ -25,6 +26,10 @@ from core.notification_service import (
     NotificationPriority,
 )
 from core.resilience import EnhancedResilience
+from core.sharded_data_store import ShardedMusicDataStore
+
+# Backup intervals for the database config's "backup_frequency" setting
+BACKUP_INTERVAL_HOURS = {"hourly": 1, "daily": 24, "weekly": 168}
 
 
 class EnhancedMusicDiscoveryApp:
@@ -44,11 +49,50 @@ class EnhancedMusicDiscoveryApp:
 
         # Initialize components
         self.resilience = EnhancedResilience()
-        self.data_store = EnhancedMusicDataStore(
-            self.configs.get("database", {}).get("path", "data/enhanced_music_trends.db")
-        )
+        database_config = self.configs.get("database", {})
+        db_config = database_config.get("database", database_config)
+        performance_config = database_config.get("performance", {})
+        pragma_options = {
+            "pragma_profile": performance_config.get("pragma_profile", "default"),
+            "pragmas": performance_config.get("pragmas"),
+        }
+
+        # Optionally split the database into per-platform or per-month files
+        sharding_config = db_config.get("sharding", {})
+        if sharding_config.get("enabled", False):
+            self.data_store: EnhancedMusicDataStore | ShardedMusicDataStore = ShardedMusicDataStore(
+                shard_dir=sharding_config.get("directory", "data/shards"),
+                shard_by=sharding_config.get("by", "platform"),
+                **pragma_options,
+            )
+        else:
+            self.data_store = EnhancedMusicDataStore(
+                db_config.get("path", "data/enhanced_music_trends.db"), **pragma_options
+            )
+        # Non-blocking access for coroutines: writer thread + reader pool
+        self.db = AsyncMusicDataStore(self.data_store)
+
+        # Optionally move analytics reads onto a periodically published snapshot
+        snapshot_config = db_config.get("read_snapshot", {})
+        if snapshot_config.get("enabled", False):
+            if isinstance(self.data_store, ShardedMusicDataStore):
+                self.logger.warning("read_snapshot is not supported with sharding; ignoring")
+            else:
+                self.data_store.enable_read_snapshot(
+                    refresh_interval=snapshot_config.get("refresh_interval", 300.0)
+                )
+
+        # Optionally record query latency and log slow queries with their plans
+        query_stats_config = db_config.get("query_stats", {})
+        if query_stats_config.get("enabled", False):
+            self.data_store.enable_query_stats(
+                slow_query_ms=query_stats_config.get("slow_query_ms", 100.0),
+                explain_slow=query_stats_config.get("explain_slow", True),
+            )
         self.analytics = MusicTrendAnalytics(self.data_store)
         self.notifications = EnhancedNotificationService()
+        self._last_backup: datetime | None = None
+        self._last_compaction: datetime | None = None
 
         self.logger.info("Enhanced Music Discovery App initialized successfully")
 
@@ -173,7 +217,7 @@ class EnhancedMusicDiscoveryApp:
 
         # Check database
         try:
-            quality_report = self.data_store.get_data_quality_report()
+            quality_report = await self.db.get_data_quality_report()
             health_results["components"]["database"] = {
                 "status": "healthy",
                 "record_count": quality_report.get("total_records", 0),
@@ -237,14 +281,41 @@ class EnhancedMusicDiscoveryApp:
         return sample_discoveries
 
     async def _store_discoveries(self, discoveries: list[dict[str, Any]]) -> None:
-        """Store discoveries in the enhanced data store."""
-        for discovery in discoveries:
+        """Store discoveries in the enhanced data store.
+
+        Saves are issued concurrently and committed together by the async store.
+        Discoveries without a source track_id are keyed on their normalised
+        track/artist, so distinct tracks found on the same day do not collide on
+        the (platform, track_id, region, trend_date) key.
+        """
+        now = datetime.now()
+
+        async def store(discovery: dict[str, Any]) -> None:
             try:
-                self.data_store.store_trend_data(discovery)
+                await self.db.save_trend(
+                    TrendData(
+                        platform=discovery["platform"],
+                        track_id=discovery.get("track_id")
+                        or normalize_match_key(discovery["track_name"], discovery["artist"]),
+                        track_name=discovery["track_name"],
+                        artist=discovery["artist"],
+                        score=discovery["score"],
+                        rank=discovery.get("rank", 0),
+                        region=discovery.get("region", "global"),
+                        trend_date=now,
+                        metadata={
+                            **discovery.get("metadata", {}),
+                            "audio_features": discovery.get("audio_features", {}),
+                        },
+                        first_detected=now,
+                    )
+                )
                 self.logger.debug(f"Stored: {discovery['track_name']} by {discovery['artist']}")
             except Exception as e:
                 self.logger.error(f"Failed to store discovery: {e}")
 
+        await asyncio.gather(*(store(discovery) for discovery in discoveries))
+
     async def _run_analytics(self) -> dict[str, Any]:
         """Run advanced analytics on collected data."""
         self.logger.info("🧠 Running advanced analytics")
@@ -341,6 +412,57 @@ class EnhancedMusicDiscoveryApp:
             "uptime": "24h",  # Would be measured in real implementation
         }
 
+    async def _run_scheduled_backup(self) -> str | None:
+        """Create a backup and apply retention when the configured interval has elapsed.
+
+        Runs off the event loop so collectors keep running.
+
+        Returns:
+            Path of the new backup, or None if no backup was due
+        """
+        database_config = self.configs.get("database", {})
+        db_config = database_config.get("database", database_config)
+        if not db_config.get("backup_enabled", False):
+            return None
+
+        frequency = db_config.get("backup_frequency", "daily")
+        interval = timedelta(hours=BACKUP_INTERVAL_HOURS.get(frequency, 24))
+        if self._last_backup and datetime.now() - self._last_backup < interval:
+            return None
+
+        try:
+            backup_path = await self.db.create_backup(
+                compression=db_config.get("backup_compression")
+            )
+            await self.db.prune_backups(**db_config.get("backup_retention", {}))
+        except Exception as e:
+            self.logger.error(f"❌ Scheduled backup failed: {e}")
+            return None
+
+        self._last_backup = datetime.now()
+        self.logger.info(f"💾 Scheduled backup created: {backup_path}")
+        return backup_path
+
+    async def _run_history_compaction(self) -> dict[str, int] | None:
+        """Downsample old trend history once a day using the configured retention.
+
+        Returns:
+            Rows compacted per resolution, or None if compaction was not due
+        """
+        if self._last_compaction and datetime.now() - self._last_compaction < timedelta(days=1):
+            return None
+
+        database_config = self.configs.get("database", {})
+        db_config = database_config.get("database", database_config)
+        try:
+            compacted = await self.db.compact_history(**db_config.get("history_retention", {}))
+        except Exception as e:
+            self.logger.error(f"❌ History compaction failed: {e}")
+            return None
+
+        self._last_compaction = datetime.now()
+        return compacted
+
     async def run_continuous_monitoring(self, interval_minutes: int = 15) -> None:
         """Run continuous monitoring and discovery."""
         self.logger.info(f"🔄 Starting continuous monitoring (every {interval_minutes} minutes)")
@@ -366,6 +488,11 @@ class EnhancedMusicDiscoveryApp:
                 with open(results_file, "w") as f:
                     json.dump(cycle_results, f, indent=2)
 
+                # History compaction, backup, retention and WAL checkpoint
+                await self._run_history_compaction()
+                await self._run_scheduled_backup()
+                await self.db.checkpoint()
+
                 # Wait for next cycle
                 await asyncio.sleep(interval_minutes * 60)
 
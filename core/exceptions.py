@@ -83,6 +83,13 @@ class DataValidationError(DataStoreException):
         super().__init__(message=message, error_code="DATA_VALIDATION_FAILED", details=details)
 
 
+class SchemaMigrationError(DataStoreException):
+    """Raised when a schema migration fails and is rolled back."""
+
+    def __init__(self, message: str, details: dict[str, Any] | None = None) -> None:
+        super().__init__(message=message, error_code="SCHEMA_MIGRATION_FAILED", details=details)
+
+
 # External Integration Exceptions
 
 
@@ -272,6 +279,7 @@ __all__ = [
     "DatabaseConnectionError",
     "DatabaseQueryError",
     "DataValidationError",
+    "SchemaMigrationError",
     # Integration
     "IntegrationException",
     "APIConnectionError",
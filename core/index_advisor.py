@@ -0,0 +1,172 @@
+"""Index advice from ``EXPLAIN QUERY PLAN``.
+
+Runs a catalogue of named queries through SQLite's planner and reports, per
+query, which indexes it uses, which tables it scans in full and where it
+needs a temporary B-tree for ORDER BY/GROUP BY. Across the catalogue it lists
+indexes no query uses and indexes made redundant by another index on the same
+table (their columns are a leading prefix of the other's).
+"""
+
+import re
+import sqlite3
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+_INDEX_PATTERN = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+
+
+@dataclass
+class IndexInfo:
+    """An index as described by ``PRAGMA index_list``/``index_info``."""
+
+    name: str
+    table: str
+    columns: list[str]
+    unique: bool
+    partial: bool
+    origin: str  # c = CREATE INDEX, u = UNIQUE constraint, pk = PRIMARY KEY
+
+
+@dataclass
+class QueryPlan:
+    """Planner output for one catalogue query."""
+
+    name: str
+    steps: list[str] = field(default_factory=list)
+    indexes: list[str] = field(default_factory=list)
+    full_scans: list[str] = field(default_factory=list)
+    temp_btrees: list[str] = field(default_factory=list)
+
+
+def explain_query_plan(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> list[str]:
+    """Return the ``detail`` column of ``EXPLAIN QUERY PLAN`` for a query."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(params))]
+
+
+def analyze_plan(name: str, steps: list[str]) -> QueryPlan:
+    """Classify plan steps into index use, full scans and temp B-trees."""
+    plan = QueryPlan(name=name, steps=steps)
+    # Views and CTEs run as co-routines; scanning their output is not a table scan
+    subqueries = {
+        step.split()[-1] for step in steps if step.startswith(("CO-ROUTINE ", "MATERIALIZE "))
+    }
+    for step in steps:
+        plan.indexes.extend(_INDEX_PATTERN.findall(step))
+        if step.startswith("USE TEMP B-TREE"):
+            plan.temp_btrees.append(step)
+        elif (
+            step.startswith("SCAN ")
+            and "USING" not in step
+            and "VIRTUAL TABLE" not in step
+            and not step.startswith(("SCAN CONSTANT ROW", "SCAN ("))
+            and step.split()[1] not in subqueries
+        ):
+            plan.full_scans.append(step)
+    return plan
+
+
+def list_indexes(conn: sqlite3.Connection) -> list[IndexInfo]:
+    """Return every index on user tables."""
+    tables = [
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        )
+    ]
+    indexes = []
+    for table in tables:
+        # Virtual tables (FTS5) have no index_list of their own
+        for _, name, unique, origin, partial in conn.execute(f"PRAGMA index_list('{table}')"):
+            columns = [
+                row[2] if row[2] is not None else "<expr>"
+                for row in conn.execute(f"PRAGMA index_info('{name}')")
+            ]
+            indexes.append(
+                IndexInfo(
+                    name=name,
+                    table=table,
+                    columns=columns,
+                    unique=bool(unique),
+                    partial=bool(partial),
+                    origin=origin,
+                )
+            )
+    return indexes
+
+
+def find_redundant_indexes(indexes: Sequence[IndexInfo]) -> list[dict[str, Any]]:
+    """Find non-unique, non-partial indexes whose columns lead another index.
+
+    Such an index serves no lookup its wider sibling cannot, but still costs a
+    B-tree write on every insert and update.
+    """
+    redundant = []
+    for index in indexes:
+        if index.unique or index.partial or index.origin != "c":
+            continue
+        for other in indexes:
+            if other is index or other.table != index.table or other.partial:
+                continue
+            width = len(index.columns)
+            same = other.columns == index.columns
+            # Of two identical indexes keep the UNIQUE one, else the first by name
+            if same and not other.unique and other.name > index.name:
+                continue
+            if other.columns[:width] == index.columns:
+                redundant.append(
+                    {"index": index.name, "table": index.table, "covered_by": other.name}
+                )
+                break
+    return redundant
+
+
+def advise_indexes(
+    conn: sqlite3.Connection, catalogue: Mapping[str, tuple[str, Sequence[Any]]]
+) -> dict[str, Any]:
+    """Explain every catalogue query and summarise index usage.
+
+    Args:
+        conn: Connection to the database
+        catalogue: Query name -> (SQL, parameters)
+
+    Returns:
+        Dictionary with per-query plans, ``full_scans`` and ``temp_btrees``
+        (query names), ``unused_indexes`` (created indexes no catalogue query
+        uses) and ``redundant_indexes``
+    """
+    plans = {
+        name: analyze_plan(name, explain_query_plan(conn, sql, params))
+        for name, (sql, params) in catalogue.items()
+    }
+    indexes = list_indexes(conn)
+    used = {index for plan in plans.values() for index in plan.indexes}
+
+    return {
+        "queries": {
+            name: {
+                "plan": plan.steps,
+                "indexes": plan.indexes,
+                "full_scans": plan.full_scans,
+                "temp_btrees": plan.temp_btrees,
+            }
+            for name, plan in plans.items()
+        },
+        "full_scans": [name for name, plan in plans.items() if plan.full_scans],
+        "temp_btrees": [name for name, plan in plans.items() if plan.temp_btrees],
+        "unused_indexes": sorted(
+            index.name for index in indexes if index.origin == "c" and index.name not in used
+        ),
+        "redundant_indexes": find_redundant_indexes(indexes),
+    }
+
+
+__all__ = [
+    "IndexInfo",
+    "QueryPlan",
+    "advise_indexes",
+    "analyze_plan",
+    "explain_query_plan",
+    "find_redundant_indexes",
+    "list_indexes",
+]
@@ -0,0 +1,271 @@
+"""Versioned schema migrations for SQLite databases.
+
+The schema version is kept in ``PRAGMA user_version``. ``MigrationRunner``
+applies every ``Migration`` with a higher version in order:
+
+1. ``apply`` runs in one ``BEGIN IMMEDIATE`` transaction (DDL and small data
+   fixes); a failure rolls it back and raises ``SchemaMigrationError``.
+2. ``backfills`` then fill new columns in keyset-paginated batches, committing
+   after each batch so other writers only ever wait for one batch.
+3. ``user_version`` is bumped once everything has committed.
+
+Because the version is only bumped at the end, an interrupted migration is
+re-run from the start on the next open: ``apply`` callbacks must therefore be
+idempotent (``IF NOT EXISTS``, column checks), and backfills only touch rows
+whose column is still NULL.
+"""
+
+import logging
+import re
+import sqlite3
+import time
+from collections.abc import Callable, Sequence
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from typing import Any
+
+from core.exceptions import SchemaMigrationError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Backfill:
+    """Fill ``table.column`` with ``expression`` for rows where it is NULL."""
+
+    table: str
+    column: str
+    expression: str
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema version step."""
+
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None] | None = None
+    backfills: tuple[Backfill, ...] = ()
+
+
+def get_user_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version stored in the database header."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def column_names(conn: sqlite3.Connection, table: str) -> set[str]:
+    """Return all column names of a table, including generated columns."""
+    return {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+
+
+def run_backfill(
+    conn: sqlite3.Connection, backfill: Backfill, batch_size: int = 10000, pause: float = 0.0
+) -> int:
+    """Fill a column batch by batch, walking the table in rowid order.
+
+    Each batch covers the next ``batch_size`` rowids and commits on its own, so
+    the write lock is held for one batch at a time and earlier rows are never
+    rescanned.
+
+    Args:
+        conn: Connection to the database
+        backfill: Column to fill
+        batch_size: Rows per transaction
+        pause: Seconds to sleep between batches to let other writers in
+
+    Returns:
+        Number of rows updated
+    """
+    table, column = backfill.table, backfill.column
+    updated = 0
+    last_rowid = 0
+    while True:
+        upper = conn.execute(
+            f"SELECT MAX(rowid) FROM (SELECT rowid FROM {table} WHERE rowid > ? "
+            f"ORDER BY rowid LIMIT ?)",
+            (last_rowid, batch_size),
+        ).fetchone()[0]
+        if upper is None:
+            break
+
+        cursor = conn.execute(
+            f"""
+        UPDATE {table} SET {column} = {backfill.expression}
+        WHERE rowid > ? AND rowid <= ? AND {column} IS NULL
+        """,
+            (last_rowid, upper),
+        )
+        conn.commit()
+        updated += max(cursor.rowcount, 0)
+        last_rowid = upper
+        if pause:
+            time.sleep(pause)
+
+    if updated:
+        logger.info(f"Backfilled {updated} rows of {table}.{column}")
+    return updated
+
+
+def rebuild_table(conn: sqlite3.Connection, table: str, transform: Callable[[str], str]) -> None:
+    """Recreate a table with a modified definition, keeping rowids and data.
+
+    Follows SQLite's generic ALTER TABLE procedure: create the new table from
+    the transformed ``CREATE TABLE`` statement, copy the stored columns, drop
+    the old table and rename the new one into place. Must run inside the
+    caller's transaction. Indexes and triggers on the table are dropped with
+    it and have to be recreated by the caller.
+
+    Args:
+        conn: Connection with an open transaction
+        table: Table to rebuild
+        transform: Maps the current ``CREATE TABLE`` SQL to the new one
+    """
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    if row is None:
+        raise SchemaMigrationError(f"Cannot rebuild missing table {table}")
+
+    temp_name = f"{table}__rebuild"
+    create_sql, count = re.subn(
+        rf'^\s*CREATE TABLE\s+(?:IF NOT EXISTS\s+)?"?{re.escape(table)}"?',
+        f"CREATE TABLE {temp_name}",
+        transform(row[0]),
+        count=1,
+        flags=re.IGNORECASE,
+    )
+    if not count:
+        raise SchemaMigrationError(f"Unexpected definition for table {table}")
+
+    # hidden: 0 = stored column, 2/3 = generated (recomputed by the new table)
+    stored = [r[1] for r in conn.execute(f"PRAGMA table_xinfo({table})") if r[6] == 0]
+    columns = ", ".join(stored)
+
+    conn.execute(f"DROP TABLE IF EXISTS {temp_name}")
+    conn.execute(create_sql)
+    conn.execute(f"INSERT INTO {temp_name} ({columns}) SELECT {columns} FROM {table}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {temp_name} RENAME TO {table}")
+
+
+class MigrationRunner:
+    """
+    Applies pending migrations to a database.
+
+    Usage:
+        runner = MigrationRunner(store.get_connection, migrations)
+        applied = runner.run()
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], AbstractContextManager],
+        migrations: Sequence[Migration],
+        batch_size: int = 10000,
+        pause: float = 0.0,
+    ) -> None:
+        """Initialize the runner.
+
+        Args:
+            connection_factory: Returns a context manager yielding a sqlite3 connection
+            migrations: Migrations with unique, positive versions
+            batch_size: Rows per backfill transaction
+            pause: Seconds to sleep between backfill batches
+        """
+        versions = [migration.version for migration in migrations]
+        if len(set(versions)) != len(versions) or any(v < 1 for v in versions):
+            raise ValueError("Migration versions must be unique positive integers")
+
+        self.connection_factory = connection_factory
+        self.migrations = sorted(migrations, key=lambda m: m.version)
+        self.batch_size = batch_size
+        self.pause = pause
+
+    @property
+    def latest_version(self) -> int:
+        """Version the schema has once every migration is applied."""
+        return self.migrations[-1].version if self.migrations else 0
+
+    def current_version(self) -> int:
+        """Return the database's schema version."""
+        with self.connection_factory() as conn:
+            return get_user_version(conn)
+
+    def pending(self) -> list[Migration]:
+        """Return migrations newer than the database's schema version."""
+        current = self.current_version()
+        return [m for m in self.migrations if m.version > current]
+
+    def run(self, target: int | None = None) -> list[int]:
+        """Apply pending migrations up to ``target`` (default: all).
+
+        Returns:
+            Versions applied, in order
+        """
+        applied: list[int] = []
+        with self.connection_factory() as conn:
+            current = get_user_version(conn)
+            if current > self.latest_version:
+                logger.warning(
+                    f"Database schema version {current} is newer than this code "
+                    f"({self.latest_version})"
+                )
+
+            for migration in self.migrations:
+                if migration.version <= current:
+                    continue
+                if target is not None and migration.version > target:
+                    break
+                self._apply(conn, migration)
+                applied.append(migration.version)
+
+        return applied
+
+    def _apply(self, conn: sqlite3.Connection, migration: Migration) -> None:
+        """Run one migration and record its version."""
+        start = time.monotonic()
+        details: dict[str, Any] = {
+            "version": migration.version,
+            "description": migration.description,
+        }
+
+        if migration.apply is not None:
+            if conn.in_transaction:
+                conn.commit()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                migration.apply(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                conn.rollback()
+                raise SchemaMigrationError(
+                    f"Migration {migration.version} failed: {e}", details=details
+                ) from e
+
+        try:
+            for backfill in migration.backfills:
+                run_backfill(conn, backfill, self.batch_size, self.pause)
+        except sqlite3.Error as e:
+            conn.rollback()
+            raise SchemaMigrationError(
+                f"Backfill for migration {migration.version} failed: {e}", details=details
+            ) from e
+
+        # PRAGMA values cannot be bound as parameters; version is an int
+        conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+        conn.commit()
+        logger.info(
+            f"Applied migration {migration.version} ({migration.description}) "
+            f"in {time.monotonic() - start:.2f}s"
+        )
+
+
+__all__ = [
+    "Backfill",
+    "Migration",
+    "MigrationRunner",
+    "column_names",
+    "get_user_version",
+    "rebuild_table",
+    "run_backfill",
+]
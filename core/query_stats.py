@@ -0,0 +1,351 @@
+"""Per-query-template latency statistics and a slow-query log for SQLite.
+
+Connections opened with ``factory=InstrumentedConnection`` hand out
+``InstrumentedCursor`` objects while their ``QueryRecorder`` is enabled (plain
+cursors otherwise, so a disabled recorder costs one method call per query).
+Each statement is normalised to a template (whitespace collapsed, literals
+replaced by ``?``) and the recorder keeps, per template:
+
+- call count, errors and a latency histogram with estimated percentiles;
+  latency is the time ``execute`` takes, i.e. until the first row is ready,
+  which includes any sorting or aggregation SQLite does up front
+- rows returned (counted as they are fetched) or changed, and fetch time
+- for templates slower than ``slow_query_ms``: the ``EXPLAIN QUERY PLAN`` of
+  the first slow call, plus a WARNING on the ``core.query_stats`` logger whose
+  fields (``query_template``, ``duration_ms``, ``rows``, ``query_plan``) come
+  out as top-level keys under ``core.logging_config.JSONFormatter``
+"""
+
+import bisect
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 5000.0)
+
+# Templates tracked individually; later ones are pooled under OVERFLOW_TEMPLATE
+MAX_TEMPLATES = 500
+OVERFLOW_TEMPLATE = "<other>"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def normalize_sql(sql: str) -> str:
+    """Reduce a statement to its template: literals become ``?``, whitespace collapses."""
+    template = _STRING_LITERAL.sub("?", sql)
+    template = _NUMBER_LITERAL.sub("?", template)
+    template = _PLACEHOLDER_LIST.sub("(?, ...)", template)
+    return _WHITESPACE.sub(" ", template).strip()
+
+
+@dataclass
+class QueryTemplateStats:
+    """Counters for one query template."""
+
+    template: str
+    calls: int = 0
+    errors: int = 0
+    slow_calls: int = 0
+    total_ms: float = 0.0
+    min_ms: float = float("inf")
+    max_ms: float = 0.0
+    rows: int = 0
+    fetch_ms: float = 0.0
+    histogram: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    plan: list[str] | None = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Short stable id for the template (for log search and dashboards)."""
+        return hashlib.sha1(self.template.encode()).hexdigest()[:12]
+
+    def percentile(self, q: float) -> float:
+        """Estimate a latency percentile as the upper bound of its histogram bucket."""
+        if not self.calls:
+            return 0.0
+        rank = q / 100 * self.calls
+        seen = 0
+        for i, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank and count:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialisable summary with derived averages and percentiles."""
+        labels = [f"<={bound:g}ms" for bound in LATENCY_BUCKETS_MS]
+        labels.append(f">{LATENCY_BUCKETS_MS[-1]:g}ms")
+        return {
+            "template": self.template,
+            "fingerprint": self.fingerprint,
+            "calls": self.calls,
+            "errors": self.errors,
+            "slow_calls": self.slow_calls,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "min_ms": round(self.min_ms, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "rows": self.rows,
+            "fetch_ms": round(self.fetch_ms, 3),
+            "histogram": {
+                label: count for label, count in zip(labels, self.histogram, strict=True) if count
+            },
+            "plan": self.plan,
+        }
+
+
+class QueryRecorder:
+    """
+    Thread-safe collector of query template statistics.
+
+    Disabled by default; ``enable`` switches instrumentation on for every
+    ``InstrumentedConnection`` that references this recorder.
+    """
+
+    def __init__(self, slow_query_ms: float = 100.0, explain_slow: bool = True) -> None:
+        """Initialize the recorder.
+
+        Args:
+            slow_query_ms: Calls at or above this latency are logged as slow
+            explain_slow: Capture ``EXPLAIN QUERY PLAN`` for slow templates
+        """
+        self.enabled = False
+        self.slow_query_ms = slow_query_ms
+        self.explain_slow = explain_slow
+        self._stats: dict[str, QueryTemplateStats] = {}
+        self._lock = threading.Lock()
+        self._since = time.time()
+
+    def enable(self, slow_query_ms: float | None = None, explain_slow: bool | None = None) -> None:
+        """Start recording, optionally changing the slow-query settings."""
+        if slow_query_ms is not None:
+            self.slow_query_ms = slow_query_ms
+        if explain_slow is not None:
+            self.explain_slow = explain_slow
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording; collected statistics are kept."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Discard collected statistics."""
+        with self._lock:
+            self._stats.clear()
+            self._since = time.time()
+
+    def _entry(self, template: str) -> QueryTemplateStats:
+        """Return the stats for a template, pooling new ones once the table is full."""
+        entry = self._stats.get(template)
+        if entry is None:
+            if len(self._stats) >= MAX_TEMPLATES:
+                template = OVERFLOW_TEMPLATE
+                entry = self._stats.get(template)
+            if entry is None:
+                entry = self._stats[template] = QueryTemplateStats(template)
+        return entry
+
+    def record(
+        self,
+        conn: sqlite3.Connection,
+        sql: str,
+        params: Any,
+        elapsed_ms: float,
+        rows: int = 0,
+        error: bool = False,
+    ) -> QueryTemplateStats:
+        """Record one executed statement.
+
+        Args:
+            conn: Connection the statement ran on (used for EXPLAIN of slow queries)
+            sql: Statement text
+            params: Bound parameters, or None when they cannot be reused (executemany)
+            elapsed_ms: Time spent in ``execute``
+            rows: Rows changed (DML); result rows are added as they are fetched
+            error: Whether the statement raised
+
+        Returns:
+            The template's stats entry
+        """
+        template = normalize_sql(sql)
+        slow = elapsed_ms >= self.slow_query_ms
+        with self._lock:
+            entry = self._entry(template)
+            entry.calls += 1
+            entry.errors += error
+            entry.total_ms += elapsed_ms
+            entry.min_ms = min(entry.min_ms, elapsed_ms)
+            entry.max_ms = max(entry.max_ms, elapsed_ms)
+            entry.rows += rows
+            entry.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+            if slow:
+                entry.slow_calls += 1
+            need_plan = slow and self.explain_slow and entry.plan is None
+
+        if slow:
+            if need_plan:
+                plan = self._explain(conn, sql, params)
+                with self._lock:
+                    entry.plan = plan
+            logger.warning(
+                f"Slow query ({elapsed_ms:.1f} ms): {template[:200]}",
+                extra={
+                    "query_template": template,
+                    "query_fingerprint": entry.fingerprint,
+                    "duration_ms": round(elapsed_ms, 3),
+                    "rows": rows,
+                    "query_plan": entry.plan,
+                },
+            )
+        return entry
+
+    def add_fetch(self, entry: QueryTemplateStats, rows: int, elapsed_ms: float = 0.0) -> None:
+        """Add fetched rows (and time spent fetching) to a template."""
+        with self._lock:
+            entry.rows += rows
+            entry.fetch_ms += elapsed_ms
+
+    @staticmethod
+    def _explain(conn: sqlite3.Connection, sql: str, params: Any) -> list[str] | None:
+        """Return the query plan of a statement, or None if it cannot be explained."""
+        if params is None or not sql.lstrip().upper().startswith(_EXPLAINABLE):
+            return None
+        try:
+            # Base-class execute: plain cursor, so the EXPLAIN itself is not recorded
+            rows = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[3] for row in rows]
+        except (sqlite3.Error, ValueError) as e:
+            return [f"<unavailable: {e}>"]
+
+    def get_stats(self, limit: int | None = None, sort_by: str = "total_ms") -> dict[str, Any]:
+        """Return collected statistics, heaviest templates first.
+
+        Args:
+            limit: Maximum number of templates to include
+            sort_by: Template field to sort by (total_ms, calls, max_ms, slow_calls, rows)
+        """
+        with self._lock:
+            templates = [entry.to_dict() for entry in self._stats.values()]
+            since = self._since
+
+        templates.sort(key=lambda t: t[sort_by], reverse=True)
+        return {
+            "enabled": self.enabled,
+            "slow_query_ms": self.slow_query_ms,
+            "since": since,
+            "total_queries": sum(t["calls"] for t in templates),
+            "total_ms": round(sum(t["total_ms"] for t in templates), 3),
+            "slow_queries": sum(t["slow_calls"] for t in templates),
+            "templates": templates[:limit] if limit else templates,
+        }
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports each statement and its fetched rows to a ``QueryRecorder``."""
+
+    _entry: QueryTemplateStats | None = None
+
+    def _timed(self, method: Any, sql: str, parameters: Any, reusable: bool) -> Any:
+        recorder: QueryRecorder = self.connection.recorder
+        start = time.perf_counter()
+        try:
+            result = method(sql, parameters)
+        except Exception:
+            recorder.record(
+                self.connection,
+                sql,
+                None,
+                (time.perf_counter() - start) * 1000,
+                error=True,
+            )
+            raise
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        changed = self.rowcount if self.description is None and self.rowcount > 0 else 0
+        self._entry = recorder.record(
+            self.connection, sql, parameters if reusable else None, elapsed_ms, changed
+        )
+        return result
+
+    def execute(self, sql: str, parameters: Any = (), /) -> "InstrumentedCursor":
+        return self._timed(super().execute, sql, parameters, reusable=True)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any], /) -> "InstrumentedCursor":
+        return self._timed(super().executemany, sql, seq_of_parameters, reusable=False)
+
+    def _add_rows(self, rows: int, start: float | None = None) -> None:
+        if self._entry is not None and rows:
+            elapsed = (time.perf_counter() - start) * 1000 if start is not None else 0.0
+            self.connection.recorder.add_fetch(self._entry, rows, elapsed)
+
+    def fetchone(self) -> Any:
+        row = super().fetchone()
+        if row is not None:
+            self._add_rows(1)
+        return row
+
+    def fetchmany(self, size: int | None = None) -> list[Any]:
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._add_rows(len(rows), start)
+        return rows
+
+    def fetchall(self) -> list[Any]:
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._add_rows(len(rows), start)
+        return rows
+
+    def __next__(self) -> Any:
+        row = super().__next__()
+        self._add_rows(1)
+        return row
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors are instrumented while ``recorder`` is enabled.
+
+    Pass as ``factory`` to ``sqlite3.connect`` and set ``recorder`` afterwards.
+    """
+
+    recorder: QueryRecorder | None = None
+
+    def cursor(self, factory: Any = None) -> sqlite3.Cursor:
+        if factory is None:
+            recorder = self.recorder
+            factory = (
+                InstrumentedCursor if recorder is not None and recorder.enabled else sqlite3.Cursor
+            )
+        return super().cursor(factory)
+
+    # sqlite3's own shortcuts create cursors internally, bypassing cursor()
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any], /) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+__all__ = [
+    "InstrumentedConnection",
+    "InstrumentedCursor",
+    "LATENCY_BUCKETS_MS",
+    "QueryRecorder",
+    "QueryTemplateStats",
+    "normalize_sql",
+]
@@ -0,0 +1,563 @@
+"""Sharded data store: one SQLite file per platform or per month.
+
+SQLite serialises writers per database file. ``ShardedMusicDataStore`` keeps
+one ``EnhancedMusicDataStore`` (file, connection pool, write lock) per shard
+key and routes every write to its shard, so ingestion for different platforms
+(or months) never waits on the same lock. Reads either fan out to the shards
+in parallel and merge the DataFrames in Python, or, through
+``get_read_connection``, run on one connection with every shard ``ATTACH``-ed
+read-only behind ``TEMP`` views that union the shard tables.
+
+Trend ids stay globally unique: each shard has an index (kept in its
+``shard_info`` table) and its ``trends`` AUTOINCREMENT sequence starts at
+``index << SHARD_ID_BITS``, so ``get_trend_history(trend_id)`` can route by id.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from core.connection_pool import resolve_pragmas
+from core.data_store import EnhancedMusicDataStore, TrendData, ViralPrediction
+
+logger = logging.getLogger(__name__)
+
+SHARD_BY = ("platform", "month")
+
+# Low bits of a trend id are the row number within its shard
+SHARD_ID_BITS = 40
+
+# Shard for rows without a platform (viral predictions) in platform mode
+SHARED_SHARD = "shared"
+
+# Tables and views exposed through get_read_connection
+UNION_TABLES = [
+    "trends",
+    "trend_history",
+    "trend_stats",
+    "trend_history_hourly",
+    "trend_history_daily",
+    "trend_history_all",
+    "viral_predictions",
+    "cross_platform_correlations",
+]
+
+# Columns of EnhancedMusicDataStore.get_first_appearances
+_FIRST_SEEN = ["match_key", "platform", "first_appearance", "peak_score", "track_name", "artist"]
+
+_UNSAFE_KEY_CHARS = re.compile(r"[^a-z0-9_-]+")
+
+
+class ShardedMusicDataStore:
+    """
+    Routes writes to per-platform or per-month ``EnhancedMusicDataStore`` shards.
+
+    Features:
+    - Independent writers: each shard has its own file, pool and write lock
+    - Parallel fan-out reads with merged, re-sorted and re-limited results
+    - Shard pruning: platform filters (platform mode) and day windows (month
+      mode) only query the shards that can match
+    - Globally unique trend ids routed back to their shard
+    - ``get_read_connection`` with all shards attached, for ad-hoc SQL
+
+    Usage:
+        store = ShardedMusicDataStore("data/shards", shard_by="platform")
+        store.save_trends_bulk(trends)
+        df = store.get_trending_tracks(days=7)
+    """
+
+    def __init__(
+        self,
+        shard_dir: str = "data/shards",
+        shard_by: str = "platform",
+        backup_dir: str = "backups",
+        max_pool_size: int = 5,
+        fanout_threads: int = 4,
+        prefix: str = "trends",
+        pragma_profile: str = "default",
+        pragmas: dict[str, Any] | None = None,
+    ) -> None:
+        """Initialize the store and open existing shards.
+
+        Args:
+            shard_dir: Directory holding one ``{prefix}_{key}.db`` file per shard
+            shard_by: "platform" or "month" (of the trend date)
+            backup_dir: Backups go to one subdirectory per shard
+            max_pool_size: Connection pool size of each shard
+            fanout_threads: Threads used to query or write shards in parallel
+            prefix: Shard file name prefix
+            pragma_profile: PRAGMA profile applied to every shard's connections
+            pragmas: PRAGMA overrides on top of the profile
+        """
+        if shard_by not in SHARD_BY:
+            raise ValueError(f"shard_by must be one of {SHARD_BY}")
+        resolve_pragmas(pragma_profile, pragmas)  # fail now, not when a shard opens
+
+        self.shard_dir = Path(shard_dir)
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        self.shard_by = shard_by
+        self.backup_dir = Path(backup_dir)
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.max_pool_size = max_pool_size
+        self.prefix = prefix
+        self.pragma_profile = pragma_profile
+        self.pragmas = pragmas
+        self.logger = logging.getLogger(__name__)
+
+        self._shards: dict[str, EnhancedMusicDataStore] = {}
+        self._by_index: dict[int, EnhancedMusicDataStore] = {}
+        self._lock = threading.Lock()
+        # Calls replayed on shards opened later (e.g. a new month)
+        self._shard_setup: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=fanout_threads, thread_name_prefix="shard-fanout"
+        )
+
+        for path in sorted(self.shard_dir.glob(f"{prefix}_*.db")):
+            self._open_shard(path.stem[len(prefix) + 1 :])
+
+    # SHARD MANAGEMENT
+
+    @property
+    def shard_keys(self) -> list[str]:
+        """Keys of the open shards, sorted."""
+        return sorted(self._shards)
+
+    def shard_key(self, platform: str | None = None, when: datetime | None = None) -> str:
+        """Return the shard key for a platform or a date, depending on ``shard_by``."""
+        if self.shard_by == "month":
+            return (when or datetime.now()).strftime("%Y-%m")
+        key = _UNSAFE_KEY_CHARS.sub("_", (platform or SHARED_SHARD).lower()).strip("_")
+        return key or SHARED_SHARD
+
+    def get_shard(self, key: str, create: bool = True) -> EnhancedMusicDataStore | None:
+        """Return the store for a shard key, opening (or creating) its file."""
+        shard = self._shards.get(key)
+        if shard is None and create:
+            with self._lock:
+                shard = self._shards.get(key) or self._open_shard(key)
+        return shard
+
+    def _open_shard(self, key: str) -> EnhancedMusicDataStore:
+        """Open a shard file and register it. Caller holds the lock (or is __init__)."""
+        shard = EnhancedMusicDataStore(
+            db_path=str(self.shard_dir / f"{self.prefix}_{key}.db"),
+            backup_dir=str(self.backup_dir / key),
+            max_pool_size=self.max_pool_size,
+            pragma_profile=self.pragma_profile,
+            pragmas=self.pragmas,
+        )
+        index = self._assign_index(shard, key)
+        self._shards[key] = shard
+        self._by_index[index] = shard
+
+        for name, args, kwargs in self._shard_setup:
+            getattr(shard, name)(*args, **kwargs)
+        self.logger.info(f"Opened shard {key} (index {index})")
+        return shard
+
+    def _assign_index(self, shard: EnhancedMusicDataStore, key: str) -> int:
+        """Read the shard's index, or give a new shard the next one and seed its ids."""
+        with shard.get_connection() as conn:
+            conn.execute(
+                """
+            CREATE TABLE IF NOT EXISTS shard_info (
+                key TEXT PRIMARY KEY,
+                shard_index INTEGER NOT NULL
+            )
+            """
+            )
+            row = conn.execute("SELECT shard_index FROM shard_info").fetchone()
+            if row is not None:
+                return row[0]
+
+            index = max(self._by_index, default=0) + 1
+            conn.execute("INSERT INTO shard_info (key, shard_index) VALUES (?, ?)", (key, index))
+            # Existing rows (if any) keep their ids; new ones start in this shard's range
+            base = conn.execute("SELECT COALESCE(MAX(id), 0) FROM trends").fetchone()[0]
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = 'trends'")
+            conn.execute(
+                "INSERT INTO sqlite_sequence (name, seq) VALUES ('trends', ?)",
+                (max(base, index << SHARD_ID_BITS),),
+            )
+            conn.commit()
+            return index
+
+    def shard_for_trend_id(self, trend_id: int) -> EnhancedMusicDataStore | None:
+        """Return the shard that owns a trend id."""
+        return self._by_index.get(trend_id >> SHARD_ID_BITS)
+
+    def _select_shards(
+        self, platform: str | None = None, days: int | None = None
+    ) -> list[EnhancedMusicDataStore]:
+        """Shards that can hold rows matching a platform filter and day window."""
+        if self.shard_by == "platform" and platform:
+            shard = self._shards.get(self.shard_key(platform))
+            return [shard] if shard is not None else []
+        if self.shard_by == "month" and days:
+            first = (datetime.now() - timedelta(days=days)).strftime("%Y-%m")
+            return [shard for key, shard in sorted(self._shards.items()) if key >= first]
+        return [self._shards[key] for key in self.shard_keys]
+
+    def _fanout(
+        self, shards: list[EnhancedMusicDataStore], call: Callable[[EnhancedMusicDataStore], Any]
+    ) -> list[Any]:
+        """Run ``call`` on each shard in parallel and return results in shard order."""
+        if len(shards) <= 1:
+            return [call(shard) for shard in shards]
+        return list(self._executor.map(call, shards))
+
+    def for_each_shard(self, method: str, *args: Any, **kwargs: Any) -> dict[str, Any]:
+        """Call a store method on every shard in parallel.
+
+        Returns:
+            Shard key -> result
+        """
+        keys = self.shard_keys
+        results = self._fanout(
+            [self._shards[key] for key in keys],
+            lambda shard: getattr(shard, method)(*args, **kwargs),
+        )
+        return dict(zip(keys, results, strict=True))
+
+    def _configure_shards(self, method: str, *args: Any, **kwargs: Any) -> None:
+        """Apply a setting to every shard, now and when new shards open."""
+        with self._lock:
+            self._shard_setup.append((method, args, kwargs))
+            shards = list(self._shards.values())
+        for shard in shards:
+            getattr(shard, method)(*args, **kwargs)
+
+    @staticmethod
+    def _merge(
+        frames: list[pd.DataFrame], sort_by: list[str], limit: int | None = None
+    ) -> pd.DataFrame:
+        """Concatenate per-shard results, re-sort (descending) and re-apply the limit."""
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        merged = pd.concat(frames, ignore_index=True)
+        merged = merged.sort_values(sort_by, ascending=False, kind="stable")
+        if limit:
+            merged = merged.head(limit)
+        return merged.reset_index(drop=True)
+
+    def close_pool(self) -> None:
+        """Close every shard's pool and stop the fan-out threads."""
+        for shard in self._shards.values():
+            shard.close_pool()
+        self._executor.shutdown(wait=True)
+
+    # WRITES
+
+    _validate_trend_data = staticmethod(EnhancedMusicDataStore._validate_trend_data)
+
+    def _trend_shard(self, trend: TrendData) -> EnhancedMusicDataStore:
+        return self.get_shard(self.shard_key(trend.platform, trend.trend_date))
+
+    def save_trend(self, trend_data: TrendData) -> int | None:
+        """Save a trend on its shard. See ``EnhancedMusicDataStore.save_trend``."""
+        return self._trend_shard(trend_data).save_trend(trend_data)
+
+    def _group_by_shard(self, trends: list[TrendData]) -> dict[str, list[int]]:
+        """Positions of the trends belonging to each shard key."""
+        groups: dict[str, list[int]] = {}
+        for position, trend in enumerate(trends):
+            groups.setdefault(self.shard_key(trend.platform, trend.trend_date), []).append(position)
+        return groups
+
+    def save_trends_bulk(self, trends: list[TrendData]) -> int:
+        """Save trends, writing the batch of each shard in parallel.
+
+        Returns:
+            Number of trends saved
+        """
+        groups = self._group_by_shard(trends)
+        shards = [self.get_shard(key) for key in groups]
+        batches = {
+            id(shard): [trends[i] for i in groups[key]]
+            for key, shard in zip(groups, shards, strict=True)
+        }
+        return sum(self._fanout(shards, lambda shard: shard.save_trends_bulk(batches[id(shard)])))
+
+    def upsert_trends(self, trends: list[TrendData]) -> list[int | None]:
+        """Save trends on their shards in parallel and return their global ids, in order."""
+        groups = self._group_by_shard(trends)
+        shards = [self.get_shard(key) for key in groups]
+        positions = {id(shard): groups[key] for key, shard in zip(groups, shards, strict=True)}
+        results = self._fanout(
+            shards,
+            lambda shard: shard.upsert_trends([trends[i] for i in positions[id(shard)]]),
+        )
+
+        ids: list[int | None] = [None] * len(trends)
+        for shard, shard_ids in zip(shards, results, strict=True):
+            for position, trend_id in zip(positions[id(shard)], shard_ids, strict=True):
+                ids[position] = trend_id
+        return ids
+
+    def save_viral_prediction(self, prediction: ViralPrediction) -> int | None:
+        """Save a prediction on the shared shard (platform mode) or the current month's."""
+        return self.get_shard(self.shard_key(None, datetime.now())).save_viral_prediction(
+            prediction
+        )
+
+    def update_trends_bulk(self, track_ids: list[str], updates: dict[str, Any]) -> int:
+        """Apply updates on every shard. Returns the number of rows updated."""
+        return sum(self.for_each_shard("update_trends_bulk", track_ids, updates).values())
+
+    def compact_history(self, **kwargs: Any) -> dict[str, int]:
+        """Compact history on every shard. Returns total rows compacted per resolution."""
+        totals: dict[str, int] = {}
+        for compacted in self.for_each_shard("compact_history", **kwargs).values():
+            for resolution, count in compacted.items():
+                totals[resolution] = totals.get(resolution, 0) + count
+        return totals
+
+    def analyze_cross_platform_spread_all(self, days: int = 30) -> pd.DataFrame:
+        """Cross-platform spread for every track, across shards.
+
+        First appearances are collected from each shard in parallel and merged
+        per (match_key, platform), so tracks split over platform or month shards
+        are compared as a whole. Edges are written on the shared shard (platform
+        mode) or the current month's. See
+        ``EnhancedMusicDataStore.analyze_cross_platform_spread_all``.
+        """
+        frames = [
+            frame
+            for frame in self._fanout(
+                self._select_shards(days=days), lambda shard: shard.get_first_appearances(days)
+            )
+            if not frame.empty
+        ]
+        if not frames:
+            return EnhancedMusicDataStore._propagation_edges(pd.DataFrame(columns=_FIRST_SEEN))
+
+        # Month shards can each hold part of a (track, platform) history
+        merged = pd.concat(frames, ignore_index=True).sort_values("first_appearance", kind="stable")
+        first_seen = merged.groupby(["match_key", "platform"], as_index=False, sort=False).agg(
+            first_appearance=("first_appearance", "min"),
+            peak_score=("peak_score", "max"),
+            track_name=("track_name", "first"),
+            artist=("artist", "first"),
+        )
+        # Name every edge after the track's earliest row on any platform
+        earliest = first_seen.groupby("match_key")[["track_name", "artist"]].transform("first")
+        first_seen[["track_name", "artist"]] = earliest
+
+        edges = EnhancedMusicDataStore._propagation_edges(first_seen)
+        self.get_shard(self.shard_key(None, datetime.now())).save_cross_platform_correlations(edges)
+        return edges
+
+    def flush(self) -> int:
+        """Commit every shard's buffered writes. Returns the records flushed."""
+        return sum(self.for_each_shard("flush").values())
+
+    def checkpoint(self, mode: str = "TRUNCATE") -> dict[str, dict[str, int]]:
+        """Checkpoint each shard's WAL. Returns the result per shard."""
+        return self.for_each_shard("checkpoint", mode)
+
+    def create_backup(self, **kwargs: Any) -> dict[str, str]:
+        """Back up every shard into its own backup subdirectory. Returns paths per shard."""
+        return self.for_each_shard("create_backup", **kwargs)
+
+    def prune_backups(self, **kwargs: Any) -> list[str]:
+        """Apply the backup retention policy to every shard. Returns deleted paths."""
+        return [
+            path
+            for deleted in self.for_each_shard("prune_backups", **kwargs).values()
+            for path in deleted
+        ]
+
+    def enable_query_stats(self, slow_query_ms: float = 100.0, explain_slow: bool = True) -> None:
+        """Enable query statistics on every shard (and shards opened later)."""
+        self._configure_shards("enable_query_stats", slow_query_ms, explain_slow)
+
+    def get_query_stats(self, limit: int | None = 20, sort_by: str = "total_ms") -> dict[str, Any]:
+        """Query statistics per shard key."""
+        return self.for_each_shard("get_query_stats", limit=limit, sort_by=sort_by)
+
+    # READS
+
+    def get_trending_tracks(
+        self,
+        platform: str | None = None,
+        region: str | None = None,
+        days: int = 7,
+        min_score: float = 0.0,
+        limit: int = 50,
+        lazy_metadata: bool = False,
+    ) -> pd.DataFrame:
+        """Top trends across shards. See ``EnhancedMusicDataStore.get_trending_tracks``."""
+        frames = self._fanout(
+            self._select_shards(platform, days),
+            lambda shard: shard.get_trending_tracks(
+                platform, region, days, min_score, limit, lazy_metadata
+            ),
+        )
+        return self._merge(frames, ["score", "trend_date"], limit)
+
+    def get_top_movers(
+        self, platform: str | None = None, days: int = 7, limit: int = 20
+    ) -> pd.DataFrame:
+        """Fastest risers across shards. See ``EnhancedMusicDataStore.get_top_movers``."""
+        frames = self._fanout(
+            self._select_shards(platform, days),
+            lambda shard: shard.get_top_movers(platform, days, limit),
+        )
+        return self._merge(frames, ["avg_velocity", "score"], limit)
+
+    def get_viral_predictions(
+        self,
+        confidence_threshold: float = 0.7,
+        status: str | None = None,
+        days: int = 30,
+        limit: int = 20,
+        lazy_features: bool = False,
+    ) -> pd.DataFrame:
+        """Predictions across shards. See ``EnhancedMusicDataStore.get_viral_predictions``."""
+        frames = self._fanout(
+            self._select_shards(days=days),
+            lambda shard: shard.get_viral_predictions(
+                confidence_threshold, status, days, limit, lazy_features
+            ),
+        )
+        return self._merge(frames, ["prediction_date", "confidence"], limit)
+
+    def get_trend_history(self, trend_id: int, days: int | None = None) -> pd.DataFrame:
+        """History of one trend, read from the shard that owns its id."""
+        shard = self.shard_for_trend_id(trend_id)
+        if shard is None:
+            return pd.DataFrame()
+        return shard.get_trend_history(trend_id, days)
+
+    def get_track_history(self, track_name: str, artist: str) -> pd.DataFrame:
+        """Combined history of a track across shards, ordered by timestamp."""
+        frames = self._fanout(
+            self._select_shards(), lambda shard: shard.get_track_history(track_name, artist)
+        )
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=["timestamp", "score", "rank"])
+        merged = pd.concat(frames, ignore_index=True).sort_values("timestamp", kind="stable")
+        return merged.reset_index(drop=True)
+
+    def search_trends(
+        self, query: str, platform: str | None = None, limit: int = 50
+    ) -> pd.DataFrame:
+        """Full-text search across shards.
+
+        BM25 statistics are per shard, so scores from different shards are only
+        roughly comparable.
+        """
+        frames = self._fanout(
+            self._select_shards(platform),
+            lambda shard: shard.search_trends(query, platform, limit),
+        )
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        merged = pd.concat(frames, ignore_index=True).sort_values("bm25", kind="stable")
+        return merged.head(limit).reset_index(drop=True)
+
+    def iter_trends(
+        self, platform: str | None = None, days: int | None = None, **kwargs: Any
+    ) -> Iterator[Any]:
+        """Stream trends shard by shard. See ``EnhancedMusicDataStore.iter_trends``."""
+        for shard in self._select_shards(platform, days):
+            yield from shard.iter_trends(platform=platform, days=days, **kwargs)
+
+    def get_audio_feature_matrix(
+        self,
+        days: int = 30,
+        min_features: int = 4,
+        limit: int | None = None,
+        with_tracks: bool = False,
+    ) -> np.ndarray | tuple[np.ndarray, pd.DataFrame]:
+        """Audio features across shards, highest score first.
+
+        See ``EnhancedMusicDataStore.get_audio_feature_matrix``.
+        """
+        results = self._fanout(
+            self._select_shards(days=days),
+            lambda shard: shard.get_audio_feature_matrix(days, min_features, limit, True),
+        )
+        width = len(EnhancedMusicDataStore.AUDIO_FEATURE_COLUMNS)
+        if not results:
+            matrix = np.empty((0, width))
+            tracks = pd.DataFrame(columns=["platform", "track_name", "artist", "score"])
+        else:
+            matrix = np.vstack([part for part, _ in results])
+            tracks = pd.concat([part for _, part in results], ignore_index=True)
+            order = np.argsort(-tracks["score"].to_numpy(), kind="stable")[:limit]
+            matrix, tracks = matrix[order], tracks.iloc[order].reset_index(drop=True)
+        return (matrix, tracks) if with_tracks else matrix
+
+    def get_data_quality_report(self) -> dict[str, Any]:
+        """Data quality report summed over shards, with each shard's issues prefixed."""
+        reports = self.for_each_shard("get_data_quality_report")
+        table_stats: dict[str, int] = {}
+        distribution: dict[str, int] = {}
+        issues: list[str] = []
+        for key, report in reports.items():
+            for table, count in report["table_statistics"].items():
+                table_stats[table] = table_stats.get(table, 0) + count
+            for platform, count in report["platform_distribution"].items():
+                distribution[platform] = distribution.get(platform, 0) + count
+            issues.extend(f"[{key}] {issue}" for issue in report["quality_issues"])
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "table_statistics": table_stats,
+            "quality_issues": issues,
+            "platform_distribution": dict(sorted(distribution.items(), key=lambda i: -i[1])),
+            "total_records": sum(table_stats.values()),
+            "issue_count": len(issues),
+            "shards": len(reports),
+        }
+
+    @contextmanager
+    def get_read_connection(self) -> Iterator[sqlite3.Connection]:
+        """Read-only connection with every shard attached behind union views.
+
+        ``trends``, ``trend_history`` and the other ``UNION_TABLES`` are TEMP
+        views over ``UNION ALL`` of the shard tables, so SQL written for a single
+        store runs unchanged. Limited by SQLite's ATTACH limit (10 by default).
+        """
+        keys = self.shard_keys
+        conn = sqlite3.connect(":memory:", check_same_thread=False, uri=True)
+        conn.row_factory = sqlite3.Row
+        try:
+            attach_limit = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+            if len(keys) > attach_limit:
+                raise ValueError(
+                    f"{len(keys)} shards exceed SQLite's ATTACH limit of {attach_limit}; "
+                    "use the fan-out read methods instead"
+                )
+
+            EnhancedMusicDataStore._register_sql_functions(conn)
+            for i, key in enumerate(keys):
+                path = Path(self._shards[key].db_path).resolve()
+                conn.execute("ATTACH DATABASE ? AS ?", (f"{path.as_uri()}?mode=ro", f"shard{i}"))
+            for table in UNION_TABLES:
+                union = " UNION ALL ".join(
+                    f"SELECT * FROM shard{i}.{table}" for i in range(len(keys))
+                )
+                if union:
+                    conn.execute(f"CREATE TEMP VIEW {table} AS {union}")
+            yield conn
+        finally:
+            conn.close()
+
+
+__all__ = ["SHARD_BY", "SHARD_ID_BITS", "SHARED_SHARD", "ShardedMusicDataStore", "UNION_TABLES"]
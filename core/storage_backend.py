@@ -0,0 +1,236 @@
+"""Query engines for the analytical methods of EnhancedMusicDataStore.
+
+The store's aggregations (trending summary, cross-platform spread, data
+quality report) are written in portable SQL and executed through an
+``AnalyticsBackend``:
+
+- ``SQLiteBackend`` runs them on the store's own (read) connections.
+- ``DuckDBBackend`` runs them on an embedded DuckDB database that either
+  attaches the SQLite file, copies its tables in as Arrow batches when the
+  DuckDB sqlite extension is unavailable (re-copying whenever SQLite reports
+  a commit), or reads Parquet snapshots written by
+  ``export_to_parquet``/``create_snapshot``. Group-bys then run vectorised
+  over columnar data. Requires the optional ``duckdb`` package.
+"""
+
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from core import columnar
+
+logger = logging.getLogger(__name__)
+
+try:
+    import duckdb
+
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+# Tables the analytical queries read
+ANALYTICS_TABLES = [
+    "trends",
+    "trend_history",
+    "trend_stats",
+    "viral_predictions",
+    "cross_platform_correlations",
+]
+
+
+def require_duckdb() -> None:
+    """Raise ImportError with an install hint if duckdb is missing."""
+    if not DUCKDB_AVAILABLE:
+        raise ImportError("duckdb is required for the DuckDB analytics engine: pip install duckdb")
+
+
+class AnalyticsBackend(ABC):
+    """Executes read-only analytical SQL and returns DataFrames.
+
+    Queries use ``?`` placeholders and SQL understood by both SQLite and DuckDB.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def query(self, sql: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+        """Run a query and return the result as a DataFrame."""
+
+    def refresh(self) -> None:  # noqa: B027 - optional hook
+        """Pick up new data if the engine works on a copy (no-op by default)."""
+
+    def close(self) -> None:  # noqa: B027 - optional hook
+        """Release engine resources (no-op by default)."""
+
+
+class SQLiteBackend(AnalyticsBackend):
+    """Runs analytical queries directly on SQLite connections."""
+
+    name = "sqlite"
+
+    def __init__(self, connection_factory: Callable[[], AbstractContextManager]) -> None:
+        """Initialize the backend.
+
+        Args:
+            connection_factory: Returns a context manager yielding a sqlite3
+                connection (e.g. ``store.get_read_connection``)
+        """
+        self.connection_factory = connection_factory
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+        with self.connection_factory() as conn:
+            return pd.read_sql_query(sql, conn, params=tuple(params))
+
+
+class DuckDBBackend(AnalyticsBackend):
+    """
+    Runs analytical queries on an embedded DuckDB database.
+
+    Sources:
+    - ``parquet_dir``: a snapshot root with one hive-partitioned dataset per table
+    - ``db_path``: the SQLite file, attached read-only through DuckDB's sqlite
+      extension; if the extension cannot be loaded (e.g. offline), tables are
+      copied in as Arrow record batches and re-copied before the next query
+      once ``PRAGMA data_version`` shows another connection has committed
+    """
+
+    name = "duckdb"
+
+    def __init__(
+        self,
+        db_path: str | None = None,
+        parquet_dir: str | None = None,
+        connection_factory: Callable[[], AbstractContextManager] | None = None,
+        tables: Sequence[str] = ANALYTICS_TABLES,
+    ) -> None:
+        """Initialize the backend.
+
+        Args:
+            db_path: SQLite database to attach
+            parquet_dir: Parquet snapshot root (takes precedence over ``db_path``)
+            connection_factory: SQLite connection context manager used for the
+                Arrow copy fallback
+            tables: Tables to expose
+        """
+        require_duckdb()
+        if not db_path and not parquet_dir:
+            raise ValueError("DuckDBBackend needs a db_path or a parquet_dir")
+
+        self.db_path = db_path
+        self.parquet_dir = parquet_dir
+        self.connection_factory = connection_factory
+        self.tables = list(tables)
+        self.mode = ""
+        self._version_conn: sqlite3.Connection | None = None
+        self._data_version: int | None = None
+
+        self._conn = duckdb.connect(":memory:")
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Expose the source tables under their SQLite names."""
+        if self.parquet_dir:
+            self._create_parquet_views()
+            self.mode = "parquet"
+            return
+
+        escaped = str(Path(self.db_path).resolve()).replace("'", "''")
+        try:
+            self._conn.execute(f"ATTACH '{escaped}' AS source (TYPE sqlite, READ_ONLY)")
+            self._conn.execute("USE source")
+            self.mode = "attach"
+        except duckdb.Error as e:
+            if self.connection_factory is None:
+                raise
+            logger.info(f"DuckDB sqlite extension unavailable ({e}); copying tables via Arrow")
+            # A dedicated connection's data_version changes on every commit made
+            # by any other connection, which tells us when the copy is stale
+            self._version_conn = sqlite3.connect(
+                f"{Path(self.db_path).resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+            self._recopy()
+            self.mode = "copy"
+
+    def _read_data_version(self) -> int:
+        return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _recopy(self) -> None:
+        """Copy the tables and remember the data version the copy reflects."""
+        # Read the version first so a commit racing the copy triggers another one
+        self._data_version = self._read_data_version()
+        self._copy_tables()
+
+    def _create_parquet_views(self) -> None:
+        """Create one view per table over its Parquet dataset."""
+        root = Path(self.parquet_dir)
+        for table in self.tables:
+            if not any((root / table).rglob("*.parquet")):
+                continue
+            pattern = str(root / table / "**" / "*.parquet").replace("'", "''")
+            self._conn.execute(
+                f"""
+            CREATE OR REPLACE VIEW {table} AS
+            SELECT * FROM read_parquet('{pattern}', hive_partitioning = true,
+                                       union_by_name = true)
+            """
+            )
+
+    def _copy_tables(self) -> None:
+        """Copy each SQLite table into DuckDB by streaming Arrow record batches."""
+        columnar.require_pyarrow()
+        import pyarrow as pa
+
+        with self.connection_factory() as conn:
+            for table in self.tables:
+                schema = columnar.table_schema(conn, table)
+                cursor = conn.execute(f"SELECT {', '.join(schema.names)} FROM {table}")
+                reader = pa.RecordBatchReader.from_batches(
+                    schema, columnar.iter_record_batches(cursor, schema)
+                )
+                self._conn.register("arrow_source", reader)
+                try:
+                    self._conn.execute(
+                        f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM arrow_source"
+                    )
+                finally:
+                    self._conn.unregister("arrow_source")
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+        with self._lock:
+            if self.mode == "copy" and self._read_data_version() != self._data_version:
+                self._recopy()
+            return self._conn.execute(sql, list(params)).df()
+
+    def refresh(self) -> None:
+        """Re-read Parquet views or re-copy tables; attached SQLite is always live."""
+        with self._lock:
+            if self.mode == "copy":
+                self._recopy()
+            elif self.mode == "parquet":
+                self._create_parquet_views()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._version_conn is not None:
+                self._version_conn.close()
+            self._conn.close()
+
+
+__all__ = [
+    "ANALYTICS_TABLES",
+    "AnalyticsBackend",
+    "DUCKDB_AVAILABLE",
+    "DuckDBBackend",
+    "SQLiteBackend",
+    "require_duckdb",
+]
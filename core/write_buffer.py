@@ -0,0 +1,169 @@
+"""Group-commit buffer for small writes.
+
+Collects individual records in memory and hands them to a flush callback in
+batches, so many single-row saves share one transaction (and one fsync).
+A batch is flushed when ``max_rows`` records are pending, when the oldest
+pending record is ``max_delay`` seconds old, or when ``flush()``/``close()``
+is called.
+
+Durability: a record is only durable once the flush that contains it has
+committed. ``add`` returns before that, so a crash can lose up to
+``max_rows`` records or ``max_delay`` seconds of writes. Callers that need a
+write to be durable must call ``flush()`` (which blocks until commit) before
+relying on it. If a flush fails the batch is put back at the front of the
+buffer and retried on the next flush.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BufferMetrics:
+    """Counters describing buffer usage."""
+
+    added: int = 0
+    flushes: int = 0
+    rows_flushed: int = 0
+    failed_flushes: int = 0
+    max_batch: int = 0
+    total_flush_time: float = 0.0
+
+
+class GroupCommitBuffer:
+    """
+    Thread-safe buffer that batches records by kind for one flush callback.
+
+    Features:
+    - Size threshold: the caller that fills the buffer flushes it inline
+    - Time threshold: a background thread flushes batches older than ``max_delay``
+    - One flush at a time; records added during a flush wait for the next one
+    - Failed batches are requeued in order
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[dict[str, list[Any]]], None],
+        max_rows: int = 500,
+        max_delay: float = 0.25,
+    ) -> None:
+        """Initialize the buffer and start its flusher thread.
+
+        Args:
+            flush_fn: Called with ``{kind: [records...]}``; must write the whole
+                batch in one transaction and raise on failure
+            max_rows: Pending records that trigger an immediate flush
+            max_delay: Seconds a record may wait before the background flush
+        """
+        if max_rows < 1:
+            raise ValueError("max_rows must be at least 1")
+
+        self.flush_fn = flush_fn
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+
+        self._pending: dict[str, list[Any]] = {}
+        self._count = 0
+        self._oldest: float | None = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._metrics = BufferMetrics()
+
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="write-buffer-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def __len__(self) -> int:
+        """Return the number of pending records."""
+        with self._lock:
+            return self._count
+
+    def add(self, kind: str, record: Any) -> None:
+        """Queue a record, flushing inline if the buffer is full."""
+        if self._closed.is_set():
+            raise RuntimeError("Write buffer is closed")
+
+        with self._lock:
+            self._pending.setdefault(kind, []).append(record)
+            self._count += 1
+            self._metrics.added += 1
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = self._count >= self.max_rows
+
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all pending records now and block until they are committed.
+
+        Returns:
+            Number of records flushed
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                count, self._count = self._count, 0
+                self._oldest = None
+            if not count:
+                return 0
+
+            start = time.monotonic()
+            try:
+                self.flush_fn(batch)
+            except Exception:
+                with self._lock:
+                    for kind, records in batch.items():
+                        self._pending[kind] = records + self._pending.get(kind, [])
+                    self._count += count
+                    self._oldest = start
+                    self._metrics.failed_flushes += 1
+                raise
+
+            with self._lock:
+                self._metrics.flushes += 1
+                self._metrics.rows_flushed += count
+                self._metrics.max_batch = max(self._metrics.max_batch, count)
+                self._metrics.total_flush_time += time.monotonic() - start
+            return count
+
+    def _flush_loop(self) -> None:
+        """Background thread: flush once the oldest pending record hits max_delay."""
+        while not self._closed.wait(self.max_delay / 2):
+            with self._lock:
+                due = self._oldest is not None and time.monotonic() - self._oldest >= self.max_delay
+            if due:
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.error(f"Background flush failed, will retry: {e}")
+
+    def close(self) -> int:
+        """Stop the flusher thread and flush remaining records.
+
+        Returns:
+            Number of records flushed
+        """
+        self._closed.set()
+        self._flusher.join()
+        return self.flush()
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Return a snapshot of buffer metrics."""
+        with self._lock:
+            metrics = asdict(self._metrics)
+            metrics["pending"] = self._count
+            flushes = self._metrics.flushes
+            metrics["avg_batch"] = self._metrics.rows_flushed / flushes if flushes else 0.0
+        return metrics
+
+
+__all__ = ["BufferMetrics", "GroupCommitBuffer"]
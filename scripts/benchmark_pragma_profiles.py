@@ -0,0 +1,189 @@
+"""Benchmark the data store's PRAGMA profiles on the standard query mix.
+
+For each profile in ``core.connection_pool.PRAGMA_PROFILES`` a fresh database is
+built from the same synthetic trends (so creation-time settings such as
+``page_size`` apply), then each query in the mix is timed on new connections
+(cold page cache) and repeated (warm page cache).
+
+Usage:
+    python scripts/benchmark_pragma_profiles.py --trends 20000 --repeat 5
+    python scripts/benchmark_pragma_profiles.py --profiles default analytics
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.connection_pool import PRAGMA_PROFILES
+from core.data_store import EnhancedMusicDataStore, TrendData
+
+PLATFORMS = ["spotify", "tiktok", "youtube", "apple_music", "soundcloud"]
+REGIONS = ["US", "GB", "DE", "BR", "JP"]
+BATCH_SIZE = 1000
+
+
+def generate_trends(count: int, seed: int = 42) -> list[TrendData]:
+    """Deterministic synthetic trends spread over the last 30 days."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    trends = []
+    for i in range(count):
+        detected = now - timedelta(days=rng.randint(0, 29), minutes=rng.randint(0, 1439))
+        trends.append(
+            TrendData(
+                platform=rng.choice(PLATFORMS),
+                track_id=f"track_{i % (count // 3 + 1)}",
+                track_name=f"Track {i % (count // 3 + 1)} {rng.choice(['Love', 'Night', 'Fire'])}",
+                artist=f"Artist {rng.randint(0, count // 20 + 1)}",
+                score=round(rng.uniform(0, 100), 2),
+                rank=rng.randint(1, 200),
+                region=rng.choice(REGIONS),
+                trend_date=detected,
+                metadata={
+                    "genre": rng.choice(["pop", "hip-hop", "rock", "edm"]),
+                    "audio_features": {
+                        "energy": rng.random(),
+                        "danceability": rng.random(),
+                        "valence": rng.random(),
+                        "acousticness": rng.random(),
+                        "tempo": rng.uniform(60, 180),
+                    },
+                },
+                first_detected=detected,
+            )
+        )
+    return trends
+
+
+def query_mix(store: EnhancedMusicDataStore) -> dict[str, Callable[[], Any]]:
+    """The store's standard read paths (none of these go through the cache)."""
+    return {
+        "trending_tracks": lambda: store.get_trending_tracks(days=30, limit=100),
+        "trending_by_platform": lambda: store.get_trending_tracks(platform="spotify", days=30),
+        "top_movers": lambda: store.get_top_movers(days=30),
+        "trend_history": lambda: store.get_trend_history(1),
+        "search": lambda: store.search_trends("love artist"),
+        "audio_feature_matrix": lambda: store.get_audio_feature_matrix(days=30),
+        "cross_platform_spread": lambda: store.analyze_cross_platform_spread(
+            "Track 1 Love", "Artist 1"
+        ),
+        "data_quality_report": store.get_data_quality_report,
+    }
+
+
+def timed(func: Callable[[], Any]) -> float:
+    """Run ``func`` once and return the elapsed milliseconds."""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def benchmark_profile(
+    profile: str, trends: list[TrendData], workdir: Path, repeat: int
+) -> dict[str, Any]:
+    """Build a database under ``profile`` and time ingest plus the query mix."""
+    path = workdir / f"bench_{profile}.db"
+    store = EnhancedMusicDataStore(
+        db_path=str(path), backup_dir=str(workdir / "backups"), pragma_profile=profile
+    )
+    try:
+        start = time.perf_counter()
+        for i in range(0, len(trends), BATCH_SIZE):
+            store.save_trends_bulk(trends[i : i + BATCH_SIZE])
+        ingest_s = time.perf_counter() - start
+        store.checkpoint()
+        settings = store.get_pragma_settings()
+    finally:
+        store.close_pool()
+
+    # Reopen so the first pass starts with an empty page cache
+    store = EnhancedMusicDataStore(
+        db_path=str(path), backup_dir=str(workdir / "backups"), pragma_profile=profile
+    )
+    try:
+        queries = {}
+        for name, func in query_mix(store).items():
+            cold = timed(func)
+            warm = [timed(func) for _ in range(repeat)]
+            queries[name] = {"cold_ms": cold, "warm_ms": statistics.median(warm)}
+    finally:
+        store.close_pool()
+
+    return {
+        "settings": settings,
+        "ingest_rows_per_s": len(trends) / ingest_s,
+        "file_mb": path.stat().st_size / 1e6,
+        "queries": queries,
+    }
+
+
+def print_report(results: dict[str, dict[str, Any]]) -> None:
+    """Print settings, ingest throughput and per-query timings side by side."""
+    profiles = list(results)
+    width = max(12, *(len(p) + 2 for p in profiles))
+    header = f"{'':<24}" + "".join(f"{p:>{width}}" for p in profiles)
+
+    print("\nEffective PRAGMAs")
+    print(header)
+    for name in next(iter(results.values()))["settings"]:
+        if name == "profile":
+            continue
+        row = "".join(f"{str(results[p]['settings'][name]):>{width}}" for p in profiles)
+        print(f"{name:<24}{row}")
+
+    print("\nIngest")
+    print(header)
+    print(
+        f"{'rows/s':<24}"
+        + "".join(f"{results[p]['ingest_rows_per_s']:>{width},.0f}" for p in profiles)
+    )
+    print(f"{'file MB':<24}" + "".join(f"{results[p]['file_mb']:>{width}.1f}" for p in profiles))
+
+    print("\nQueries: cold / warm median (ms)")
+    print(header)
+    for query in next(iter(results.values()))["queries"]:
+        cells = []
+        for p in profiles:
+            timing = results[p]["queries"][query]
+            cells.append(f"{timing['cold_ms']:.1f}/{timing['warm_ms']:.1f}".rjust(width))
+        print(f"{query:<24}" + "".join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trends", type=int, default=20000, help="Synthetic trends to ingest")
+    parser.add_argument("--repeat", type=int, default=5, help="Warm runs per query")
+    parser.add_argument(
+        "--profiles", nargs="+", choices=list(PRAGMA_PROFILES), default=list(PRAGMA_PROFILES)
+    )
+    parser.add_argument("--workdir", help="Keep the benchmark databases in this directory")
+    args = parser.parse_args()
+
+    trends = generate_trends(args.trends)
+    print("=" * 60)
+    print(f"PRAGMA profile benchmark: {args.trends:,} trends, {args.repeat} warm runs")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(args.workdir or tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        results = {}
+        for profile in args.profiles:
+            print(f"Running {profile}...")
+            results[profile] = benchmark_profile(profile, trends, workdir, args.repeat)
+
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
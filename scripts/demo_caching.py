@@ -4,6 +4,7 @@ Demonstrates:
 - Basic cache operations (get/set/delete)
 - TTL (time-to-live) functionality
 - @cached decorator for function memoization
+- @cached_batch decorator for per-item caching of batch lookups
 - LRU eviction in local cache
 - Performance improvements
 """
@@ -145,7 +146,27 @@ tracks2 = get_playlist_tracks(123, "summer_vibes")
 print(f"   Tracks: {len(tracks2)} found in {time.time() - start:.3f}s")
 print()
 
-# Demo 8: Performance summary
+# Demo 8: Batch lookups
+print("8. @cached_batch Decorator (Batch Lookups)")
+print("-" * 40)
+
+
+@cache.cached_batch(ttl=300)
+def get_artist_genres(artists: list[str]) -> dict[str, list[str]]:
+    """Simulate one API request for a batch of artists."""
+    print(f"   → Fetching genres for: {', '.join(artists)}")
+    time.sleep(0.5)
+    return {artist: ["pop"] for artist in artists}
+
+
+print("First batch (uncached):")
+get_artist_genres(["Adele", "Drake", "Lorde"])
+print("Second batch (only the new artist is fetched):")
+genres = get_artist_genres(["Adele", "Lorde", "SZA"])
+print(f"   Genres: {genres}")
+print()
+
+# Demo 9: Performance summary
 print("=" * 60)
 print("Performance Summary")
 print("=" * 60)
@@ -340,13 +340,17 @@ class EnhancedMusicDiscoverySetup:
                 "path": "data/enhanced_music_trends.db",
                 "backup_enabled": True,
                 "backup_frequency": "daily",
-                "backup_retention_days": 30,
+                "backup_compression": "gzip",
+                "backup_retention": {"hourly": 24, "daily": 7, "weekly": 4},
+                "history_retention": {"raw_days": 7, "hourly_days": 90},
+                "read_snapshot": {"enabled": False, "refresh_interval": 300},
+                "query_stats": {"enabled": False, "slow_query_ms": 100, "explain_slow": True},
+                "sharding": {"enabled": False, "by": "platform", "directory": "data/shards"},
             },
             "performance": {
-                "wal_mode": True,
-                "cache_size": 10000,
-                "synchronous": "NORMAL",
-                "temp_store": "memory",
+                # default, ingest, analytics or low_memory (core.connection_pool)
+                "pragma_profile": "default",
+                "pragmas": {},
             },
             "indexes": {"auto_create": True, "optimization_enabled": True},
             "maintenance": {"vacuum_frequency": "weekly", "analyze_frequency": "daily"},
@@ -0,0 +1,123 @@
+"""Tests for core async_data_store (awaitable store access and batched writes)."""
+
+import asyncio
+import threading
+from dataclasses import replace
+
+import pytest
+
+from core.async_data_store import AsyncMusicDataStore
+
+
+class TestAsyncMusicDataStore:
+    """Test AsyncMusicDataStore dispatch and write batching."""
+
+    def test_concurrent_saves_share_one_transaction(self, data_store, sample_trends):
+        async def run():
+            async with AsyncMusicDataStore(data_store, batch_window=0.05) as db:
+                ids = await asyncio.gather(*(db.save_trend(t) for t in sample_trends))
+                return ids, db.get_write_stats()
+
+        ids, stats = asyncio.run(run())
+
+        assert len(set(ids)) == 2
+        assert stats["batches_written"] == 1
+        assert stats["trends_written"] == 2
+        df = data_store.get_trending_tracks(platform="spotify")
+        assert set(df["track_name"]) == {"Track One", "Track Two"}
+
+    def test_saves_without_track_id_return_their_own_ids(self, data_store, sample_trends):
+        trends = [
+            replace(sample_trends[0], track_id=None, track_name=name)
+            for name in ("Alpha", "Beta", "Gamma")
+        ]
+
+        async def run():
+            async with AsyncMusicDataStore(data_store, batch_window=0.05) as db:
+                ids = await asyncio.gather(*(db.save_trend(t) for t in trends[:2]))
+                return ids + [await db.save_trend(trends[2])]
+
+        ids = asyncio.run(run())
+        with data_store.get_connection() as conn:
+            rows = dict(conn.execute("SELECT id, track_name FROM trends").fetchall())
+        assert [rows[trend_id] for trend_id in ids] == ["Alpha", "Beta", "Gamma"]
+
+    def test_batch_flushes_at_max_size(self, data_store, sample_trends):
+        trends = [
+            replace(sample_trends[0], track_id=f"tid{i}", track_name=f"Track {i}") for i in range(5)
+        ]
+
+        async def run():
+            async with AsyncMusicDataStore(data_store, max_batch_size=2, batch_window=10) as db:
+                await asyncio.gather(*(db.save_trend(t) for t in trends[:4]))
+                return db.get_write_stats()
+
+        stats = asyncio.run(run())
+        assert stats["batches_written"] == 2
+        assert stats["trends_written"] == 4
+
+    def test_flush_drains_queue_and_store_buffer(self, data_store, sample_trends):
+        from datetime import datetime, timedelta
+
+        from core.data_store import ViralPrediction
+
+        prediction = ViralPrediction(
+            track_id="tid1",
+            track_name="Track One",
+            artist="Artist A",
+            confidence=0.9,
+            predicted_peak_date=datetime.now() + timedelta(days=3),
+            predicted_peak_score=95.0,
+            prediction_features={"velocity": 2.0},
+            prediction_date=datetime.now(),
+        )
+        data_store.enable_write_buffer(max_rows=100, max_delay=60)
+
+        async def run():
+            async with AsyncMusicDataStore(data_store, batch_window=10) as db:
+                pending = asyncio.ensure_future(db.save_trend(sample_trends[0]))
+                await db.save_viral_prediction(prediction)
+                await asyncio.sleep(0)
+                flushed = await db.flush()
+                return flushed, await pending, db.get_write_stats()
+
+        flushed, trend_id, stats = asyncio.run(run())
+        assert flushed == 1
+        assert trend_id is not None
+        assert stats["pending"] == 0
+        assert len(data_store.get_viral_predictions(confidence_threshold=0.5)) == 1
+        data_store.disable_write_buffer()
+
+    def test_invalid_trend_raises_in_caller(self, data_store, sample_trends):
+        async def run():
+            async with AsyncMusicDataStore(data_store) as db:
+                await db.save_trend(replace(sample_trends[0], score=500.0))
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
+
+    def test_reads_and_writes_use_separate_threads(self, data_store, sample_trends):
+        data_store.save_trends_bulk(sample_trends)
+        seen = {}
+
+        def record(name, method):
+            def wrapper(*args, **kwargs):
+                seen[name] = threading.current_thread().name
+                return method(*args, **kwargs)
+
+            return wrapper
+
+        data_store.get_trending_tracks = record("read", data_store.get_trending_tracks)
+        data_store.update_trends_bulk = record("write", data_store.update_trends_bulk)
+
+        async def run():
+            async with AsyncMusicDataStore(data_store) as db:
+                df = await db.get_trending_tracks(platform="spotify")
+                updated = await db.update_trends_bulk(["tid1"], {"score": 90.0})
+                return df, updated
+
+        df, updated = asyncio.run(run())
+        assert len(df) == 2
+        assert updated == 1
+        assert seen["read"].startswith("datastore-reader")
+        assert seen["write"].startswith("datastore-writer")
@@ -1,9 +1,19 @@
 """Tests for core caching (LocalCacheBackend, CacheManager, @cached decorator)."""
 
+import asyncio
+import threading
 import time
+from types import SimpleNamespace
+
+import pytest
 
 from core.caching import (
+    CacheBackend,
+    CacheManager,
     LocalCacheBackend,
+    ThreadSafeLocalCacheBackend,
+    TieredCacheBackend,
+    approximate_size,
 )
 
 
@@ -59,6 +69,90 @@ class TestLocalCacheBackend:
         present = sum(1 for k in ("a", "b", "c") if backend.get(k) is not None)
         assert present == 2
 
+    def test_hit_refreshes_recency(self):
+        backend = LocalCacheBackend(max_size=3)
+        for key in ("a", "b", "c"):
+            backend.set(key, key)
+        backend.get("a")
+        backend.set("d", "d")
+        assert backend.get("b") is None
+        assert [k for k in ("a", "c", "d") if backend.get(k)] == ["a", "c", "d"]
+
+    def test_byte_limit_evicts_and_rejects_oversized(self):
+        value = "x" * 1000
+        entry_size = approximate_size("k0") + approximate_size(value)
+        backend = LocalCacheBackend(max_size=100, max_bytes=entry_size * 3)
+        for i in range(5):
+            backend.set(f"k{i}", value)
+
+        stats = backend.get_stats()
+        assert stats["items"] == 3
+        assert stats["bytes"] <= entry_size * 3
+        assert stats["evictions"] == 2
+        assert backend.get("k0") is None
+
+        backend.set("huge", "x" * (entry_size * 4))
+        assert backend.get("huge") is None
+        assert backend.get_stats()["items"] == 3
+
+    def test_expired_entries_reclaimed_on_write(self):
+        backend = LocalCacheBackend(max_size=100)
+        for i in range(10):
+            backend.set(f"short{i}", i, ttl=0.05)
+        backend.set("long", "v", ttl=60)
+        time.sleep(0.06)
+
+        backend.set("new", "v")
+        stats = backend.get_stats()
+        assert stats["items"] == 2
+        assert stats["expirations"] == 10
+        assert stats["evictions"] == 0
+
+    def test_overwrite_keeps_byte_count_consistent(self):
+        backend = LocalCacheBackend(max_size=10)
+        backend.set("k", "short", ttl=60)
+        backend.set("k", "a much longer value", ttl=60)
+        backend.delete("k")
+        assert backend.get_stats()["bytes"] == 0
+
+
+class TestThreadSafeLocalCacheBackend:
+    """Tests for the lock-striped backend under concurrent use."""
+
+    def test_concurrent_writers_keep_limits_and_accounting(self):
+        backend = ThreadSafeLocalCacheBackend(max_size=200, stripes=8)
+        errors = []
+
+        def worker(n: int) -> None:
+            try:
+                for i in range(2000):
+                    key = f"k{(n * 7919 + i) % 500}"
+                    backend.set(key, i, ttl=60)
+                    backend.get(key)
+                    if i % 10 == 0:
+                        backend.delete(f"k{i % 500}")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = backend.get_stats()
+        assert errors == []
+        assert stats["stripes"] == 8
+        assert stats["items"] <= stats["max_size"] == 200
+        assert stats["bytes"] == sum(segment.get_stats()["bytes"] for segment in backend._segments)
+
+    def test_clear_and_exists(self):
+        backend = ThreadSafeLocalCacheBackend(max_size=10, stripes=4)
+        backend.set("a", 1)
+        assert backend.exists("a") is True
+        backend.clear()
+        assert backend.get_stats()["items"] == 0
+
 
 class TestCacheManager:
     """Tests for CacheManager with injected LocalCacheBackend."""
@@ -81,6 +175,39 @@ class TestCacheManager:
         assert mock_cache.get("a") is None
         assert mock_cache.get("b") is None
 
+    def test_async_api_calls_in_memory_backend_inline(self, mock_cache):
+        async def run():
+            await mock_cache.aset("k", "v")
+            value = await mock_cache.aget("k")
+            await mock_cache.adelete("k")
+            return value, await mock_cache.aget("k")
+
+        assert asyncio.run(run()) == ("v", None)
+
+    def test_async_api_offloads_blocking_backend(self):
+        class RecordingBackend(CacheBackend):
+            def __init__(self) -> None:
+                self.data: dict = {}
+                self.threads: set[int] = set()
+
+            def get(self, key):
+                self.threads.add(threading.get_ident())
+                return self.data.get(key)
+
+            def set(self, key, value, ttl=None):
+                self.threads.add(threading.get_ident())
+                self.data[key] = value
+
+        backend = RecordingBackend()
+        cache = CacheManager(backend=backend)
+
+        async def run():
+            await cache.aset("k", 1)
+            return await cache.aget("k")
+
+        assert asyncio.run(run()) == 1
+        assert threading.get_ident() not in backend.threads
+
 
 class TestCachedDecorator:
     """Tests for @cached decorator - call count and same result."""
@@ -118,3 +245,303 @@ class TestCachedDecorator:
 
         assert fn() == "ok"
         assert fn() == "ok"
+
+
+class SharedBackend(LocalCacheBackend):
+    """Stands in for Redis: one store plus a synchronous pub/sub bus shared by several tiers."""
+
+    def __init__(self) -> None:
+        super().__init__(max_size=1000)
+        self.subscribers: list = []
+
+    def publish(self, channel, message):
+        for subscribed, handler in list(self.subscribers):
+            if subscribed == channel:
+                handler(message)
+
+    def subscribe(self, channel, handler):
+        self.subscribers.append((channel, handler))
+        return lambda: self.subscribers.remove((channel, handler))
+
+
+def wait_for(predicate, timeout: float = 2.0) -> None:
+    """Poll until ``predicate()`` is true (background refreshes run on other threads)."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+class TestSingleFlight:
+    """Tests for request coalescing, stale-while-revalidate and early expiry."""
+
+    def test_concurrent_misses_compute_once(self, mock_cache):
+        calls = 0
+        start = threading.Barrier(8)
+
+        @mock_cache.cached(ttl=60)
+        def slow(x: int) -> int:
+            nonlocal calls
+            calls += 1
+            time.sleep(0.1)
+            return x * 2
+
+        results = []
+
+        def worker() -> None:
+            start.wait()
+            results.append(slow(21))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == [42] * 8
+        assert calls == 1
+
+    def test_errors_reach_waiters_and_are_not_cached(self, mock_cache):
+        calls = 0
+
+        def failing() -> int:
+            nonlocal calls
+            calls += 1
+            raise ValueError("boom")
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                mock_cache.get_or_compute("k", failing)
+        assert calls == 2
+
+    def test_waiter_computes_itself_after_timeout(self, mock_cache):
+        release = threading.Event()
+        started = threading.Event()
+
+        def hung() -> str:
+            started.set()
+            release.wait(5)
+            return "leader"
+
+        leader = threading.Thread(target=mock_cache.get_or_compute, args=("k", hung))
+        leader.start()
+        started.wait(5)
+        try:
+            assert mock_cache.get_or_compute("k", lambda: "waiter", wait_timeout=0.05) == "waiter"
+        finally:
+            release.set()
+            leader.join()
+
+    def test_compute_requesting_its_own_key_does_not_deadlock(self, mock_cache):
+        depth = 0
+
+        def recursive() -> int:
+            nonlocal depth
+            depth += 1
+            if depth == 1:
+                return mock_cache.get_or_compute("k", recursive, wait_timeout=5) + 1
+            return 1
+
+        start = time.monotonic()
+        assert mock_cache.get_or_compute("k", recursive) == 2
+        assert depth == 2
+        assert time.monotonic() - start < 1  # ran directly, not after the wait timed out
+
+    def test_async_concurrent_misses_compute_once(self, mock_cache):
+        calls = 0
+
+        @mock_cache.cached(ttl=60)
+        async def fetch(name: str) -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return name.upper()
+
+        async def run():
+            return await asyncio.gather(*(fetch("artist") for _ in range(10)))
+
+        assert asyncio.run(run()) == ["ARTIST"] * 10
+        assert calls == 1
+
+    def test_stale_value_served_while_refreshing(self, mock_cache):
+        version = 0
+
+        def compute() -> int:
+            nonlocal version
+            version += 1
+            return version
+
+        assert mock_cache.get_or_compute("k", compute, ttl=0.05, stale_ttl=60) == 1
+        time.sleep(0.06)
+        assert mock_cache.get("k") is None  # logically expired
+
+        assert mock_cache.get_or_compute("k", compute, ttl=60, stale_ttl=60) == 1
+        wait_for(lambda: mock_cache.get("k") == 2)
+        assert mock_cache.get_or_compute("k", compute, ttl=60, stale_ttl=60) == 2
+
+    def test_early_expiry_refreshes_before_ttl(self, mock_cache, monkeypatch):
+        # Pin the XFetch draw to its tail so the refresh always triggers
+        monkeypatch.setattr("core.caching.random", SimpleNamespace(random=lambda: 1 - 1e-9))
+        version = 0
+
+        def compute() -> int:
+            nonlocal version
+            version += 1
+            time.sleep(0.1)
+            return version
+
+        assert mock_cache.get_or_compute("k", compute, ttl=1, early_expiry=1.0) == 1
+        assert mock_cache.get_or_compute("k", compute, ttl=1, early_expiry=1.0) == 1
+        wait_for(lambda: mock_cache.get("k") == 2)
+
+
+class TestTieredCacheBackend:
+    """Tests for the L1/L2 tiered backend and cross-process invalidation."""
+
+    def test_l2_hits_are_promoted_to_l1(self):
+        shared = SharedBackend()
+        shared.set("k", "v")
+        tier = TieredCacheBackend(shared)
+
+        assert tier.get("k") == "v"
+        assert tier.get("k") == "v"
+        assert tier.get("missing") is None
+
+        stats = tier.get_stats()
+        assert (stats["l1_hits"], stats["l1_misses"]) == (1, 2)
+        assert (stats["l2_hits"], stats["l2_misses"]) == (1, 1)
+        assert stats["l1"]["items"] == 1
+
+    def test_writes_invalidate_other_workers_l1(self):
+        shared = SharedBackend()
+        worker_a, worker_b = TieredCacheBackend(shared), TieredCacheBackend(shared)
+
+        worker_a.set("summary", 1, ttl=60)
+        assert worker_b.get("summary") == 1  # now cached in B's L1
+
+        worker_a.set("summary", 2, ttl=60)
+        assert worker_b.get("summary") == 2
+        worker_a.delete("summary")
+        assert worker_b.get("summary") is None
+
+        worker_a.set("other", 3)
+        worker_b.get("other")
+        worker_a.clear()
+        assert worker_b.get("other") is None
+        assert worker_b.get_stats()["invalidations_received"] == 5
+        assert worker_a.get_stats()["invalidations_received"] == 0  # own messages skipped
+
+        worker_b.close()
+        assert len(shared.subscribers) == 1
+
+    def test_l1_ttl_bounds_staleness_without_broadcast(self):
+        l2 = LocalCacheBackend()
+        tier = TieredCacheBackend(l2, l1_ttl=0.05)
+        tier.set("k", "old", ttl=60)
+        l2.set("k", "new", ttl=60)  # changed behind the tier's back
+
+        assert tier.get("k") == "old"
+        time.sleep(0.06)
+        assert tier.get("k") == "new"
+
+    def test_promotion_is_capped_at_remaining_l2_ttl(self):
+        l2 = LocalCacheBackend()
+        tier = TieredCacheBackend(l2, l1_ttl=60)
+        l2.set("short", "v", ttl=0.05)
+        l2.set("batch", "w", ttl=0.05)
+        l2.set("forever", "x")
+
+        assert tier.get("short") == "v"
+        assert tier.get_many(["batch", "forever"]) == {"batch": "w", "forever": "x"}
+        time.sleep(0.06)
+        # Gone from L2, so L1 must not keep serving them for the full l1_ttl
+        assert tier.get("short") is None
+        assert tier.get_many(["batch", "forever"]) == {"forever": "x"}
+
+    def test_cache_manager_reports_tier_stats(self):
+        cache = CacheManager(backend=TieredCacheBackend(SharedBackend()), key_prefix="t")
+        cache.set("k", "v")
+        cache.get("k")
+
+        stats = cache.get_stats()
+        assert stats["backend"] == "TieredCacheBackend"
+        assert stats["l1_hit_ratio"] == 1.0
+
+
+class TestBatchOperations:
+    """Tests for get_many/set_many/delete_many and @cached_batch."""
+
+    @pytest.mark.parametrize("backend_cls", [LocalCacheBackend, ThreadSafeLocalCacheBackend])
+    def test_backend_many_round_trip(self, backend_cls):
+        backend = backend_cls(max_size=100)
+        backend.set_many({f"k{i}": i for i in range(10)}, ttl=60)
+
+        assert backend.get_many(["k1", "k5", "missing"]) == {"k1": 1, "k5": 5}
+        backend.delete_many(["k1", "k2"])
+        assert backend.get_many(["k1", "k2", "k3"]) == {"k3": 3}
+
+    def test_tiered_batches_l2_reads_and_broadcasts_once(self):
+        shared = SharedBackend()
+        shared.set_many({"a": 1, "b": 2})
+        tier = TieredCacheBackend(shared)
+        messages = []
+        shared.subscribe("audora:cache:invalidate", messages.append)
+
+        tier.get("a")
+        assert tier.get_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+        stats = tier.get_stats()
+        assert (stats["l1_hits"], stats["l2_hits"], stats["l2_misses"]) == (1, 2, 1)
+
+        tier.set_many({"x": 1, "y": 2})
+        tier.delete_many(["x", "y"])
+        assert len(messages) == 2
+
+    def test_manager_get_many_strips_prefix_and_unwraps(self, mock_cache):
+        mock_cache.set_many({"a": 1, "b": 2})
+        mock_cache.get_or_compute("c", lambda: 3)
+
+        assert mock_cache.get_many(["a", "b", "c", "d"]) == {"a": 1, "b": 2, "c": 3}
+        mock_cache.delete_many(["a", "c"])
+        assert mock_cache.get_many(["a", "b", "c"]) == {"b": 2}
+
+    def test_cached_batch_computes_only_misses(self, mock_cache):
+        batches = []
+
+        @mock_cache.cached_batch(ttl=60)
+        def squares(numbers: list[int], offset: int = 0) -> list[int]:
+            batches.append(list(numbers))
+            return [n * n + offset for n in numbers]
+
+        assert squares([1, 2, 3]) == [1, 4, 9]
+        assert squares([3, 2, 4, 4]) == [9, 4, 16, 16]
+        assert squares([2], offset=1) == [5]  # extra arguments are part of the key
+        assert batches == [[1, 2, 3], [4], [2]]
+
+    def test_cached_batch_accepts_dict_results_and_skips_none(self, mock_cache):
+        batches = []
+
+        @mock_cache.cached_batch(ttl=60, key_builder=str.lower)
+        def lookup(names: list[str]) -> dict[str, str]:
+            batches.append(list(names))
+            return {name: name.upper() for name in names if name != "ghost"}
+
+        assert lookup(["Adele", "ghost"]) == ["ADELE", None]
+        assert lookup(["adele", "ghost"]) == ["ADELE", None]
+        assert batches == [["Adele", "ghost"], ["ghost"]]
+
+    def test_cached_batch_async(self, mock_cache):
+        batches = []
+
+        @mock_cache.cached_batch(ttl=60)
+        async def fetch(ids: list[str]) -> list[str]:
+            batches.append(list(ids))
+            await asyncio.sleep(0)
+            return [f"track:{i}" for i in ids]
+
+        async def run():
+            first = await fetch(["a", "b"])
+            second = await fetch(["b", "c"])
+            return first, second
+
+        assert asyncio.run(run()) == (["track:a", "track:b"], ["track:b", "track:c"])
+        assert batches == [["a", "b"], ["c"]]
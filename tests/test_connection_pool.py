@@ -0,0 +1,174 @@
+"""Tests for core connection_pool (bounded checkout, PRAGMAs, health checks, metrics)."""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from core.connection_pool import SQLiteConnectionPool, resolve_pragmas
+from core.exceptions import DatabaseConnectionError
+
+
+class TestSQLiteConnectionPool:
+    """Test SQLiteConnectionPool checkout/release semantics."""
+
+    def test_reuses_released_connection(self, temp_db_path):
+        pool = SQLiteConnectionPool(str(temp_db_path), max_size=2)
+        with pool.connection() as c1:
+            first = c1
+        with pool.connection() as c2:
+            assert c2 is first
+        assert pool.get_metrics()["created"] == 1
+        pool.close()
+
+    def test_pragmas_applied_to_every_connection(self, temp_db_path):
+        pool = SQLiteConnectionPool(str(temp_db_path), max_size=2)
+        with pool.connection() as c1, pool.connection() as c2:
+            for conn in (c1, c2):
+                assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+                assert conn.execute("PRAGMA cache_size").fetchone()[0] == 10000
+        pool.close()
+
+    def test_checkout_times_out_when_exhausted(self, temp_db_path):
+        pool = SQLiteConnectionPool(str(temp_db_path), max_size=1, timeout=0.1)
+        with pool.connection(), pytest.raises(DatabaseConnectionError):
+            pool.acquire()
+        assert pool.get_metrics()["timeouts"] == 1
+        pool.close()
+
+    def test_blocked_checkout_resumes_on_release(self, temp_db_path):
+        pool = SQLiteConnectionPool(str(temp_db_path), max_size=1, timeout=5)
+        conn = pool.acquire()
+        acquired = []
+
+        def worker():
+            with pool.connection() as c:
+                acquired.append(c)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        pool.release(conn)
+        thread.join(timeout=5)
+
+        assert acquired == [conn]
+        assert pool.get_metrics()["size"] == 1
+        pool.close()
+
+    def test_close_discards_connections_released_later(self, temp_db_path):
+        pool = SQLiteConnectionPool(str(temp_db_path), max_size=2)
+        conn = pool.acquire()
+        pool.release(pool.acquire())
+
+        assert pool.close() == 1
+        conn.execute("SELECT 1")  # checked-out connections keep working
+        pool.release(conn)
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        assert pool.get_metrics()["size"] == 0
+        assert len(pool) == 0
+        with pytest.raises(DatabaseConnectionError):
+            pool.acquire()
+
+    def test_close_wakes_blocked_checkout(self, temp_db_path):
+        pool = SQLiteConnectionPool(str(temp_db_path), max_size=1, timeout=30)
+        conn = pool.acquire()
+        errors = []
+
+        def worker():
+            try:
+                pool.acquire()
+            except DatabaseConnectionError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        time.sleep(0.05)
+        pool.close()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert len(errors) == 1
+        pool.release(conn)
+
+    def test_unhealthy_connection_replaced(self, temp_db_path):
+        pool = SQLiteConnectionPool(str(temp_db_path), max_size=1)
+        with pool.connection() as conn:
+            broken = conn
+        broken.close()
+
+        with pool.connection() as conn:
+            assert conn is not broken
+            assert conn.execute("SELECT 1").fetchone()[0] == 1
+
+        metrics = pool.get_metrics()
+        assert metrics["health_check_failures"] == 1
+        assert metrics["created"] == 2
+        pool.close()
+
+    def test_uncommitted_transaction_rolled_back_on_release(self, temp_db_path):
+        pool = SQLiteConnectionPool(str(temp_db_path), max_size=1)
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.commit()
+            conn.execute("INSERT INTO t VALUES (1)")
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        pool.close()
+
+    def test_concurrent_checkouts_never_share_connection(self, temp_db_path):
+        pool = SQLiteConnectionPool(str(temp_db_path), max_size=3, timeout=5)
+        in_use: set[int] = set()
+        lock = threading.Lock()
+        errors = []
+
+        def worker():
+            for _ in range(50):
+                with pool.connection() as conn:
+                    with lock:
+                        if id(conn) in in_use:
+                            errors.append("shared")
+                        in_use.add(id(conn))
+                    conn.execute("SELECT 1")
+                    with lock:
+                        in_use.discard(id(conn))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        metrics = pool.get_metrics()
+        assert errors == []
+        assert metrics["created"] <= 3
+        assert metrics["in_use"] == 0
+        assert metrics["checkouts"] == 400
+        pool.close()
+
+
+class TestPragmaProfiles:
+    """Test named PRAGMA profiles."""
+
+    def test_profile_layers_over_defaults_with_page_size_first(self):
+        pragmas = resolve_pragmas("analytics", {"busy_timeout": 1000})
+        assert next(iter(pragmas)) == "page_size"
+        assert pragmas["journal_mode"] == "WAL"
+        assert pragmas["recursive_triggers"] == "ON"
+        assert pragmas["mmap_size"] == 1073741824
+        assert pragmas["busy_timeout"] == 1000
+
+    def test_rejects_unknown_profile_and_unsafe_values(self):
+        with pytest.raises(ValueError):
+            resolve_pragmas("turbo")
+        with pytest.raises(ValueError):
+            resolve_pragmas(overrides={"cache_size": "1; DROP TABLE trends"})
+
+    def test_page_size_applies_to_new_database(self, temp_db_path):
+        pool = SQLiteConnectionPool(str(temp_db_path), pragmas=resolve_pragmas("analytics"))
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x)")
+            assert conn.execute("PRAGMA page_size").fetchone()[0] == 8192
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        pool.close()
@@ -1,5 +1,12 @@
 """Tests for core data_store (pooling, save_trends_bulk, get_tracks_with_artists_bulk, get_trending_summary_cached, update_trends_bulk)."""
 
+import itertools
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
 from core.data_store import EnhancedMusicDataStore
 
 
@@ -25,6 +32,15 @@ class TestDataStorePooling:
         # No exception and pool cleaned
         store.close_pool()
 
+    def test_pool_metrics_reported(self, data_store):
+        with data_store.get_connection() as conn:
+            conn.execute("SELECT 1")
+            assert data_store.get_pool_metrics()["in_use"] == 1
+        metrics = data_store.get_pool_metrics()
+        assert metrics["in_use"] == 0
+        assert metrics["created"] >= 1
+        assert metrics["max_size"] == 5
+
 
 class TestSaveTrendsBulk:
     """Test save_trends_bulk and query back."""
@@ -46,6 +62,84 @@ class TestSaveTrendsBulk:
             assert row[2] == sample_trends[0].artist
             assert row[3] == sample_trends[0].score
 
+    def test_save_trends_bulk_upsert_keeps_id_and_links_history(self, data_store, sample_trends):
+        data_store.save_trends_bulk(sample_trends)
+        with data_store.get_connection() as conn:
+            first_id = conn.execute(
+                "SELECT id FROM trends WHERE track_id = ?", (sample_trends[0].track_id,)
+            ).fetchone()[0]
+
+        sample_trends[0].score = 90.0
+        data_store.save_trends_bulk(sample_trends)
+
+        with data_store.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT id, score FROM trends WHERE track_id = ?", (sample_trends[0].track_id,)
+            ).fetchall()
+            history = conn.execute(
+                "SELECT velocity FROM trend_history WHERE trend_id = ? ORDER BY id",
+                (first_id,),
+            ).fetchall()
+
+        assert [tuple(r) for r in rows] == [(first_id, 90.0)]
+        assert [h[0] for h in history] == [0.0, 5.0]
+
+    def test_save_trends_bulk_keeps_rows_without_track_id(self, data_store, sample_trends):
+        for trend in sample_trends:
+            trend.track_id = None
+        data_store.save_trends_bulk(sample_trends)
+        data_store.save_trends_bulk(sample_trends)
+
+        with data_store.get_connection() as conn:
+            rows = conn.execute("SELECT id, track_name, score FROM trends ORDER BY id").fetchall()
+            history = conn.execute(
+                "SELECT t.track_name, h.score FROM trend_history h "
+                "JOIN trends t ON t.id = h.trend_id ORDER BY h.id"
+            ).fetchall()
+
+        assert [r["track_name"] for r in rows] == ["Track One", "Track Two"] * 2
+        # Each history row links to the trend it was written for, not the newest NULL-keyed row
+        assert [tuple(h) for h in history] == [
+            ("Track One", 85.0),
+            ("Track Two", 72.0),
+        ] * 2
+
+    def test_upsert_trends_returns_ids_in_input_order(self, data_store, sample_trends):
+        from dataclasses import replace
+
+        invalid = replace(sample_trends[0], score=500.0)
+        duplicate = replace(sample_trends[0], score=90.0)
+        ids = data_store.upsert_trends([sample_trends[0], invalid, sample_trends[1], duplicate])
+
+        with data_store.get_connection() as conn:
+            rows = dict(conn.execute("SELECT track_id, id FROM trends").fetchall())
+        assert ids == [rows["tid1"], None, rows["tid2"], rows["tid1"]]
+
+    def test_save_trends_bulk_holds_write_lock_before_reading(
+        self, data_store, sample_trends, monkeypatch
+    ):
+        validate = data_store._validate_trends_vectorized
+
+        def validate_while_writing(trends):
+            # Another writer must already be locked out when staging starts
+            other = sqlite3.connect(data_store.db_path, timeout=0)
+            try:
+                with pytest.raises(sqlite3.OperationalError, match="locked"):
+                    other.execute("BEGIN IMMEDIATE")
+            finally:
+                other.close()
+            return validate(trends)
+
+        monkeypatch.setattr(data_store, "_validate_trends_vectorized", validate_while_writing)
+        assert data_store.save_trends_bulk(sample_trends) == 2
+
+    def test_save_trends_bulk_skips_invalid_rows(self, data_store, sample_trends):
+        sample_trends[1].score = 150.0
+        assert data_store.save_trends_bulk(sample_trends) == 1
+        with data_store.get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM trends").fetchone()[0] == 1
+            assert conn.execute("SELECT COUNT(*) FROM trend_history").fetchone()[0] == 1
+
 
 class TestGetTracksWithArtistsBulk:
     """Test get_tracks_with_artists_bulk."""
@@ -63,6 +157,29 @@ class TestGetTracksWithArtistsBulk:
         df = data_store.get_tracks_with_artists_bulk([])
         assert df.empty
 
+    def test_exact_lookup_ignores_case_and_accents(self, data_store, sample_trends):
+        sample_trends[0].track_name = "Café Nights"
+        data_store.save_trends_bulk(sample_trends)
+        df = data_store.get_tracks_with_artists_bulk([("CAFE  nights", "artist a")])
+        assert df["track_name"].tolist() == ["Café Nights"]
+
+    def test_exact_lookup_does_not_match_substrings(self, data_store, sample_trends):
+        data_store.save_trends_bulk(sample_trends)
+        df = data_store.get_tracks_with_artists_bulk([("Track", "Artist")])
+        assert df.empty
+
+    def test_fuzzy_lookup_matches_substrings(self, data_store, sample_trends):
+        data_store.save_trends_bulk(sample_trends)
+        df = data_store.get_tracks_with_artists_bulk([("rack Tw", "Artist")], fuzzy=True)
+        assert df["track_name"].tolist() == ["Track Two"]
+
+    def test_large_batch_beyond_parameter_limit(self, data_store, sample_trends):
+        data_store.save_trends_bulk(sample_trends)
+        pairs = [(f"missing {i}", f"nobody {i}") for i in range(5000)]
+        pairs.append((sample_trends[1].track_name, sample_trends[1].artist))
+        df = data_store.get_tracks_with_artists_bulk(pairs)
+        assert df["track_id"].tolist() == [sample_trends[1].track_id]
+
 
 class TestGetTrendingSummaryCached:
     """Test get_trending_summary_cached returns same result on second call (cache hit)."""
@@ -100,3 +217,813 @@ class TestUpdateTrendsBulk:
     def test_update_trends_bulk_empty_returns_zero(self, data_store):
         assert data_store.update_trends_bulk([], {"score": 1}) == 0
         assert data_store.update_trends_bulk(["x"], {}) == 0
+
+
+class TestEpochDateColumns:
+    """Test epoch columns, their backfill migration and range filtering."""
+
+    def test_epoch_columns_match_sqlite_strftime(self, data_store, sample_trends):
+        data_store.save_trends_bulk(sample_trends)
+        with data_store.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT trend_ts, CAST(strftime('%s', trend_date) AS INTEGER) FROM trends"
+            ).fetchall()
+        assert rows
+        assert all(row[0] == row[1] for row in rows)
+
+    def test_old_trends_excluded_by_day_window(self, data_store, sample_trends):
+        old = sample_trends[1]
+        old.trend_date = old.trend_date - timedelta(days=30)
+        data_store.save_trends_bulk(sample_trends)
+        df = data_store.get_trending_tracks(days=7)
+        assert df["track_name"].tolist() == [sample_trends[0].track_name]
+
+    def test_migration_backfills_legacy_database(self, temp_db_path):
+        conn = sqlite3.connect(temp_db_path)
+        conn.execute(
+            """
+            CREATE TABLE trends (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, platform TEXT NOT NULL, track_id TEXT,
+                track_name TEXT NOT NULL, artist TEXT NOT NULL, score REAL NOT NULL,
+                rank INTEGER, region TEXT NOT NULL DEFAULT 'global', trend_date TEXT NOT NULL,
+                first_detected TEXT NOT NULL, last_updated TEXT NOT NULL, metadata TEXT,
+                is_active BOOLEAN DEFAULT 1, created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(platform, track_id, region, trend_date) ON CONFLICT REPLACE
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO trends (platform, track_id, track_name, artist, score, rank, region,"
+            " trend_date, first_detected, last_updated) VALUES"
+            " ('spotify', 't', 'Song', 'Artist', 50, 1, 'US',"
+            " '2024-01-01T00:00:00', '2024-01-01T00:00:00', '2024-01-01T00:00:00')"
+        )
+        conn.commit()
+        conn.close()
+
+        store = EnhancedMusicDataStore(
+            db_path=str(temp_db_path), backup_dir=str(temp_db_path.parent / "backups")
+        )
+        with store.get_connection() as conn:
+            row = conn.execute("SELECT trend_ts, first_detected_ts FROM trends").fetchone()
+        store.close_pool()
+        assert tuple(row) == (1704067200, 1704067200)
+
+    def test_trend_window_query_uses_index(self, data_store):
+        with data_store.get_connection() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT COUNT(*), AVG(score) FROM trends"
+                " WHERE is_active = 1 AND trend_ts >= ?",
+                (0,),
+            ).fetchall()
+        detail = " ".join(row[3] for row in plan)
+        assert "idx_trends_active_ts_score" in detail
+
+
+class TestTrendStatsRollup:
+    """Test the trigger-maintained trend_stats rollup and the queries that read it."""
+
+    def test_stats_follow_history_inserts(self, data_store, sample_trends):
+        data_store.save_trends_bulk(sample_trends)
+        sample_trends[0].score = 95.0
+        data_store.save_trends_bulk(sample_trends)
+
+        df = data_store.get_trending_tracks(platform="spotify")
+        row = df[df["track_name"] == sample_trends[0].track_name].iloc[0]
+        assert row["data_points"] == 2
+        assert row["avg_velocity"] == 5.0
+
+    def test_top_movers_ordered_by_velocity(self, data_store, sample_trends):
+        data_store.save_trends_bulk(sample_trends)
+        sample_trends[1].score = 92.0
+        data_store.save_trends_bulk(sample_trends)
+
+        movers = data_store.get_top_movers(days=7)
+        assert movers["track_name"].tolist()[0] == sample_trends[1].track_name
+        assert movers.iloc[0]["avg_velocity"] == 10.0
+
+    def test_stats_seeded_from_existing_history(self, temp_db_path, data_store, sample_trends):
+        data_store.save_trends_bulk(sample_trends)
+        with data_store.get_connection() as conn:
+            conn.execute("DELETE FROM trend_stats")
+            # Pretend the database predates the seeding migration
+            conn.execute("PRAGMA user_version = 2")
+            conn.commit()
+        data_store.close_pool()
+
+        store = EnhancedMusicDataStore(
+            db_path=str(temp_db_path), backup_dir=str(temp_db_path.parent / "backups")
+        )
+        with store.get_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM trend_stats").fetchone()[0]
+        store.close_pool()
+        assert count == len(sample_trends)
+
+
+class TestSearchTrends:
+    """Test the FTS5-backed search_trends API."""
+
+    def test_search_ranks_track_name_hits(self, data_store, sample_trends):
+        sample_trends[1].artist = "Track One Tribute Band"
+        data_store.save_trends_bulk(sample_trends)
+        df = data_store.search_trends("track one")
+        assert df["track_name"].tolist() == ["Track One", "Track Two"]
+        assert "bm25" in df.columns
+
+    def test_search_ignores_accents_and_filters_platform(self, data_store, sample_trends):
+        sample_trends[0].track_name = "Déjà Vu"
+        sample_trends[1].track_name = "Deja Vu"
+        sample_trends[1].platform = "tiktok"
+        data_store.save_trends_bulk(sample_trends)
+        assert len(data_store.search_trends("deja vu")) == 2
+        df = data_store.search_trends("deja", platform="tiktok")
+        assert df["platform"].tolist() == ["tiktok"]
+
+    def test_search_indexes_metadata_and_follows_updates(self, data_store, sample_trends):
+        sample_trends[0].metadata = {"genre": "synthwave"}
+        data_store.save_trends_bulk(sample_trends)
+        assert data_store.search_trends("synthwave")["track_id"].tolist() == ["tid1"]
+
+        sample_trends[0].metadata = {"genre": "drill"}
+        data_store.save_trends_bulk(sample_trends)
+        assert data_store.search_trends("synthwave").empty
+        assert data_store.search_trends("drill")["track_id"].tolist() == ["tid1"]
+
+    def test_cross_platform_spread_uses_substring_match(self, data_store, sample_trends):
+        sample_trends[1].track_name = "Track One"
+        sample_trends[1].artist = "Artist A"
+        sample_trends[1].platform = "tiktok"
+        data_store.save_trends_bulk(sample_trends)
+        result = data_store.analyze_cross_platform_spread("rack On", "rtist A")
+        assert sorted(result["platforms"]) == ["spotify", "tiktok"]
+
+    def test_track_history_uses_substring_match(self, data_store, sample_trends):
+        sample_trends[1].track_name = "Track One"
+        sample_trends[1].artist = "Artist A"
+        sample_trends[1].platform = "tiktok"
+        data_store.save_trends_bulk(sample_trends)
+
+        history = data_store.get_track_history("rack On", "rtist A")
+        assert sorted(history["score"].tolist()) == [72.0, 85.0]
+        assert data_store.get_track_history("Track Three", "Artist A").empty
+
+
+class TestParquetSnapshots:
+    """Test Parquet export, import and snapshot round trips."""
+
+    def test_export_partitions_trends_by_platform_and_day(
+        self, data_store, sample_trends, tmp_path
+    ):
+        pytest.importorskip("pyarrow")
+        sample_trends[1].platform = "tiktok"
+        data_store.save_trends_bulk(sample_trends)
+
+        path = data_store.export_to_parquet("trends", str(tmp_path / "trends"))
+        partitions = sorted(p.name for p in (tmp_path / "trends").iterdir())
+        assert path == str(tmp_path / "trends")
+        assert partitions == ["platform=spotify", "platform=tiktok"]
+        assert all(
+            p.name.startswith("trend_day=")
+            for p in (tmp_path / "trends" / "platform=spotify").iterdir()
+        )
+
+    def test_export_days_window(self, data_store, sample_trends, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        sample_trends[1].trend_date = sample_trends[1].trend_date - timedelta(days=30)
+        data_store.save_trends_bulk(sample_trends)
+
+        data_store.export_to_parquet("trends", str(tmp_path / "recent"), days=7)
+        table = pq.read_table(str(tmp_path / "recent"))
+        assert table.column("track_id").to_pylist() == ["tid1"]
+
+    def test_snapshot_round_trip_preserves_ids_and_history(
+        self, data_store, sample_trends, tmp_path
+    ):
+        pytest.importorskip("pyarrow")
+        sample_trends[0].metadata = {"nested": {"tags": ["a", "b"]}}
+        data_store.save_trends_bulk(sample_trends)
+        snapshot = data_store.create_snapshot(str(tmp_path / "snap"))
+
+        other = EnhancedMusicDataStore(
+            db_path=str(tmp_path / "restored.db"), backup_dir=str(tmp_path / "backups")
+        )
+        counts = other.restore_snapshot(snapshot)
+        assert counts["trends"] == 2
+        assert counts["trend_history"] == 2
+
+        df = other.get_trending_tracks()
+        row = df[df["track_name"] == "Track One"].iloc[0]
+        assert row["metadata"] == {"nested": {"tags": ["a", "b"]}}
+        assert row["data_points"] == 1
+        assert not other.search_trends("track one").empty
+        other.close_pool()
+
+    def test_replace_import_keeps_trend_stats_in_sync(self, data_store, sample_trends, tmp_path):
+        pytest.importorskip("pyarrow")
+        from dataclasses import replace
+
+        data_store.save_trends_bulk(sample_trends)
+        sample_trends[0].score = 90.0
+        data_store.save_trends_bulk(sample_trends)
+        stats_sql = "SELECT * FROM trend_stats ORDER BY trend_id"
+        with data_store.get_connection() as conn:
+            first_id = conn.execute("SELECT id FROM trends WHERE track_id = 'tid1'").fetchone()[0]
+            # A compacted bucket, counted in trend_stats like compact_history leaves it
+            conn.execute(
+                """
+            INSERT INTO trend_history_hourly
+            (trend_id, bucket, samples, mean_score, mean_velocity, last_rank, last_timestamp)
+            VALUES (?, '2020-01-01T00:00:00', 3, 50.0, 1.0, 1, '2020-01-01T00:59:00')
+            """,
+                (first_id,),
+            )
+            conn.execute(
+                "UPDATE trend_stats SET data_points = data_points + 3, "
+                "sum_velocity = sum_velocity + 3 WHERE trend_id = ?",
+                (first_id,),
+            )
+            conn.commit()
+            expected = [tuple(row) for row in conn.execute(stats_sql)]
+
+        data_store.export_to_parquet("trends", str(tmp_path / "trends"))
+        data_store.save_trends_bulk([replace(sample_trends[1], track_id="tid3")])
+        data_store.import_from_parquet("trends", str(tmp_path / "trends"), replace=True)
+
+        with data_store.get_connection() as conn:
+            assert [tuple(row) for row in conn.execute(stats_sql)] == expected
+            assert conn.execute("SELECT COUNT(*) FROM trend_history_hourly").fetchone()[0] == 1
+
+        # The delete triggers dropped for the import are back
+        with data_store.get_connection() as conn:
+            conn.execute("DELETE FROM trends WHERE id = ?", (first_id,))
+            conn.commit()
+            assert conn.execute("SELECT COUNT(*) FROM trend_history_hourly").fetchone()[0] == 0
+            assert conn.execute("SELECT COUNT(*) FROM trend_stats").fetchone()[0] == 1
+
+
+class TestBackups:
+    """Test paged/compressed backups and retention pruning."""
+
+    def test_paged_backup_reports_progress(self, data_store, sample_trends):
+        data_store.save_trends_bulk(sample_trends)
+        steps = []
+        path = data_store.create_backup(
+            pages=1, sleep=0, progress=lambda status, remaining, total: steps.append(remaining)
+        )
+        assert len(steps) > 1
+        assert steps[-1] == 0
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM trends").fetchone()[0] == 2
+
+    def test_backup_restarted_by_writes_falls_back_to_one_step(self, data_store, sample_trends):
+        from dataclasses import replace
+
+        data_store.save_trends_bulk(sample_trends)
+        steps = []
+
+        def write_during_backup(status, remaining, total):
+            steps.append(remaining)
+            # Every write from another connection restarts the paged copy
+            data_store.save_trends_bulk([replace(sample_trends[0], track_id=f"w{len(steps)}")])
+
+        path = data_store.create_backup(
+            pages=1, sleep=0, progress=write_during_backup, max_restarts=2
+        )
+
+        restarts = sum(later > earlier for earlier, later in itertools.pairwise(steps))
+        assert restarts == 3
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM trends").fetchone()[0] == 2 + len(steps)
+
+    def test_gzip_backup(self, data_store, sample_trends, tmp_path):
+        import gzip
+
+        data_store.save_trends_bulk(sample_trends)
+        path = data_store.create_backup(compression="gzip")
+        assert path.endswith(".db.gz")
+
+        restored = tmp_path / "restored.db"
+        with gzip.open(path, "rb") as src:
+            restored.write_bytes(src.read())
+        with sqlite3.connect(restored) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM trends").fetchone()[0] == 2
+
+    def test_prune_backups_keeps_newest_per_bucket(self, data_store):
+        now = datetime(2026, 10, 17, 12, 0, 0)
+        stamps = [now - timedelta(minutes=30 * i) for i in range(6)]  # 3 hours, 2 per hour
+        stamps += [now - timedelta(days=d) for d in range(1, 4)]
+        for stamp in stamps:
+            name = f"music_trends_backup_{stamp.strftime('%Y%m%d_%H%M%S')}.db"
+            (data_store.backup_dir / name).touch()
+
+        deleted = data_store.prune_backups(hourly=2, daily=2, weekly=0)
+
+        kept = [created for created, _ in data_store.list_backups()]
+        assert kept == [now, now - timedelta(minutes=30), now - timedelta(days=1)]
+        assert len(deleted) == len(stamps) - 3
+
+
+class TestHistoryCompaction:
+    """Test trend_history downsampling into hourly/daily aggregates."""
+
+    def _seed_history(self, data_store, sample_trends):
+        data_store.save_trends_bulk(sample_trends[:1])
+        with data_store.get_connection() as conn:
+            trend_id = conn.execute("SELECT id FROM trends").fetchone()[0]
+            conn.execute("DELETE FROM trend_history")
+            old = (datetime.now() - timedelta(days=10)).replace(hour=5, minute=0)
+            rows = [
+                (trend_id, (old + timedelta(minutes=m)).isoformat(), score, rank, velocity)
+                for m, score, rank, velocity in (
+                    (0, 10.0, 9, 1.0),
+                    (20, 30.0, 5, 3.0),
+                    (40, 20.0, 7, 2.0),
+                    (70, 50.0, 2, 4.0),
+                )
+            ]
+            rows.append((trend_id, datetime.now().isoformat(), 60.0, 1, 5.0))
+            conn.executemany(
+                "INSERT INTO trend_history (trend_id, timestamp, score, rank, velocity) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+        return trend_id
+
+    def test_raw_rows_rolled_into_hourly(self, data_store, sample_trends):
+        trend_id = self._seed_history(data_store, sample_trends)
+
+        result = data_store.compact_history(raw_days=7, hourly_days=30, batch_size=2)
+
+        assert result == {"hourly": 4, "daily": 0}
+        with data_store.get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM trend_history").fetchone()[0] == 1
+            buckets = conn.execute(
+                "SELECT samples, min_score, max_score, mean_score, mean_velocity, last_rank "
+                "FROM trend_history_hourly WHERE trend_id = ? ORDER BY bucket",
+                (trend_id,),
+            ).fetchall()
+        assert [tuple(b) for b in buckets] == [
+            (3, 10.0, 30.0, 20.0, 2.0, 7),
+            (1, 50.0, 50.0, 50.0, 4.0, 2),
+        ]
+
+    def test_hourly_rolled_into_daily(self, data_store, sample_trends):
+        trend_id = self._seed_history(data_store, sample_trends)
+
+        data_store.compact_history(raw_days=7, hourly_days=30)
+        result = data_store.compact_history(raw_days=1, hourly_days=7)
+
+        assert result == {"hourly": 0, "daily": 2}
+        with data_store.get_connection() as conn:
+            daily = conn.execute(
+                "SELECT samples, min_score, max_score, mean_score, last_rank "
+                "FROM trend_history_daily WHERE trend_id = ?",
+                (trend_id,),
+            ).fetchall()
+            assert conn.execute("SELECT COUNT(*) FROM trend_history_hourly").fetchone()[0] == 0
+        assert [tuple(d) for d in daily] == [(4, 10.0, 50.0, 27.5, 2)]
+
+    def test_history_reads_union_raw_and_aggregates(self, data_store, sample_trends):
+        trend_id = self._seed_history(data_store, sample_trends)
+        data_store.compact_history(raw_days=7, hourly_days=30)
+
+        history = data_store.get_trend_history(trend_id)
+        assert list(history["resolution"]) == ["hourly", "hourly", "raw"]
+        assert history["samples"].sum() == 5
+        assert len(data_store.get_trend_history(trend_id, days=1)) == 1
+
+        with data_store.get_connection() as conn:
+            stats = conn.execute(
+                "SELECT data_points FROM trend_stats WHERE trend_id = ?", (trend_id,)
+            ).fetchone()
+        assert stats[0] >= 5
+
+
+class TestWriteBuffer:
+    """Test group-committed save_trend / save_viral_prediction."""
+
+    def test_buffered_saves_commit_together(self, data_store, sample_trends):
+        with data_store.buffered_writes(max_rows=100, max_delay=60):
+            assert [data_store.save_trend(t) for t in sample_trends] == [None, None]
+            assert data_store.get_trending_tracks(platform="spotify").empty
+            metrics = data_store.get_write_buffer_metrics()
+            assert metrics["pending"] == 2
+
+        df = data_store.get_trending_tracks(platform="spotify")
+        assert set(df["track_name"]) == {"Track One", "Track Two"}
+        assert data_store.save_trend(sample_trends[0]) is not None
+
+    def test_flush_writes_predictions(self, data_store):
+        from core.data_store import ViralPrediction
+
+        prediction = ViralPrediction(
+            track_id="tid1",
+            track_name="Track One",
+            artist="Artist A",
+            confidence=0.9,
+            predicted_peak_date=datetime.now() + timedelta(days=3),
+            predicted_peak_score=95.0,
+            prediction_features={"velocity": 2.0},
+            prediction_date=datetime.now(),
+        )
+        data_store.enable_write_buffer(max_rows=100, max_delay=60)
+        assert data_store.get_write_buffer_metrics()["pending"] == 0
+        data_store.save_viral_prediction(prediction)
+        assert data_store.flush() == 1
+        assert len(data_store.get_viral_predictions(confidence_threshold=0.5)) == 1
+        assert data_store.disable_write_buffer() == 0
+
+    def test_invalid_trend_rejected_before_buffering(self, data_store, sample_trends):
+        from dataclasses import replace
+
+        with data_store.buffered_writes(), pytest.raises(ValueError):
+            data_store.save_trend(replace(sample_trends[0], score=-1.0))
+        assert data_store.get_write_buffer_metrics() == {}
+
+
+class TestStreamingReads:
+    """Test iter_trends chunked iteration, projection and lazy metadata."""
+
+    def _seed(self, data_store, sample_trends, count=25):
+        from dataclasses import replace
+
+        trends = [
+            replace(
+                sample_trends[i % 2],
+                track_id=f"tid{i}",
+                track_name=f"Track {i}",
+                metadata={"genre": "pop" if i % 2 else "rock", "plays": i},
+            )
+            for i in range(count)
+        ]
+        data_store.save_trends_bulk(trends)
+
+    def test_records_stream_all_rows_with_lazy_metadata(self, data_store, sample_trends):
+        from core.data_store import LazyJSON
+
+        self._seed(data_store, sample_trends)
+        records = list(data_store.iter_trends(chunk_size=7))
+
+        assert len(records) == 25
+        assert "trend_ts" not in records[0]
+        metadata = records[0]["metadata"]
+        assert isinstance(metadata, LazyJSON)
+        assert not metadata.decoded
+        assert metadata["genre"] == "rock"
+        assert metadata.decoded
+
+    def test_projection_and_metadata_keys(self, data_store, sample_trends):
+        self._seed(data_store, sample_trends)
+        records = list(
+            data_store.iter_trends(
+                platform="spotify", columns=["track_name", "score"], metadata_keys=["plays"]
+            )
+        )
+
+        assert set(records[0]) == {"track_name", "score", "metadata_plays"}
+        assert sorted(r["metadata_plays"] for r in records) == list(range(25))
+
+    def test_frames_are_chunked(self, data_store, sample_trends):
+        self._seed(data_store, sample_trends)
+        frames = list(data_store.iter_trends(output="frames", chunk_size=10, lazy_metadata=False))
+
+        assert [len(f) for f in frames] == [10, 10, 5]
+        assert frames[0]["metadata"].iloc[0] == {"genre": "rock", "plays": 0}
+
+    def test_arrow_batches(self, data_store, sample_trends):
+        pytest.importorskip("pyarrow")
+        self._seed(data_store, sample_trends)
+        batches = list(
+            data_store.iter_trends(
+                output="arrow", columns=["track_name", "score"], metadata_keys=["genre"]
+            )
+        )
+
+        assert sum(b.num_rows for b in batches) == 25
+        assert batches[0].schema.names == ["track_name", "score", "metadata_genre"]
+
+    def test_invalid_projection_rejected(self, data_store):
+        with pytest.raises(ValueError):
+            list(data_store.iter_trends(columns=["track_name; DROP TABLE trends"]))
+        with pytest.raises(ValueError):
+            list(data_store.iter_trends(metadata_keys=["genre') --"]))
+
+    def test_export_to_csv_streams_chunks(self, data_store, sample_trends, tmp_path):
+        import pandas as pd
+
+        self._seed(data_store, sample_trends)
+        path = data_store.export_to_csv("trends", str(tmp_path / "trends.csv"), chunk_size=4)
+
+        assert len(pd.read_csv(path)) == 25
+
+
+class TestGeneratedMetadataColumns:
+    """Test json_extract generated columns and get_audio_feature_matrix."""
+
+    def _seed(self, data_store, sample_trends):
+        from dataclasses import replace
+
+        audio = {"energy": 0.9, "danceability": 0.8, "valence": 0.7, "acousticness": 0.1}
+        data_store.save_trends_bulk(
+            [
+                replace(sample_trends[0], metadata={"audio_features": {**audio, "tempo": 128}}),
+                replace(sample_trends[1], metadata={"views": 1000, "likes": 50}),
+            ]
+        )
+
+    def test_generated_columns_read_metadata(self, data_store, sample_trends):
+        self._seed(data_store, sample_trends)
+        with data_store.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT track_id, energy, tempo, views, likes FROM trends ORDER BY track_id"
+            ).fetchall()
+        assert [tuple(r) for r in rows] == [
+            ("tid1", 0.9, 128.0, None, None),
+            ("tid2", None, None, 1000, 50),
+        ]
+
+    def test_audio_feature_matrix(self, data_store, sample_trends):
+        self._seed(data_store, sample_trends)
+        matrix, tracks = data_store.get_audio_feature_matrix(days=7, with_tracks=True)
+
+        assert matrix.shape == (1, 5)
+        assert matrix.tolist() == [[0.9, 0.8, 0.7, 0.1, 128.0]]
+        assert tracks["track_name"].tolist() == ["Track One"]
+        assert data_store.get_audio_feature_matrix(days=7, min_features=0).shape == (2, 5)
+
+    def test_audio_feature_query_uses_partial_index(self, data_store):
+        query = (
+            "EXPLAIN QUERY PLAN SELECT energy, tempo FROM trends"
+            f" WHERE is_active = 1 AND trend_ts >= 0 AND {data_store._HAS_AUDIO_FEATURES}"
+        )
+        with data_store.get_connection() as conn:
+            detail = " ".join(row[3] for row in conn.execute(query))
+        assert "idx_trends_audio_features" in detail
+
+
+class TestReadSnapshot:
+    """Test read-only snapshot routing and WAL checkpoints."""
+
+    def test_reads_served_from_snapshot_until_refresh(self, data_store, sample_trends):
+        data_store.save_trends_bulk(sample_trends[:1])
+        data_store.enable_read_snapshot(refresh_interval=3600)
+        try:
+            data_store.save_trends_bulk(sample_trends[1:])
+            assert len(data_store.get_trending_tracks(platform="spotify")) == 1
+
+            data_store.refresh_read_snapshot()
+            assert len(data_store.get_trending_tracks(platform="spotify")) == 2
+            pairs = data_store.get_tracks_with_artists_bulk([("Track Two", "Artist B")])
+            assert len(pairs) == 1
+        finally:
+            data_store.disable_read_snapshot()
+
+        assert not list((data_store.backup_dir / "read_snapshots").glob("*.db"))
+
+    def test_snapshot_connections_are_read_only(self, data_store):
+        data_store.enable_read_snapshot(refresh_interval=3600)
+        try:
+            with data_store.get_read_connection() as conn, pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM trends")
+        finally:
+            data_store.disable_read_snapshot()
+
+    def test_old_snapshot_files_are_removed(self, data_store):
+        data_store.enable_read_snapshot(refresh_interval=3600)
+        try:
+            for _ in range(3):
+                data_store.refresh_read_snapshot()
+            assert len(list((data_store.backup_dir / "read_snapshots").glob("*.db"))) == 2
+        finally:
+            data_store.disable_read_snapshot()
+
+    def test_refresh_closes_connections_still_reading_old_snapshot(self, data_store):
+        data_store.enable_read_snapshot(refresh_interval=3600)
+        try:
+            with data_store.get_read_connection() as conn:
+                old_pool = data_store._snapshot_pool
+                data_store.refresh_read_snapshot()
+                conn.execute("SELECT COUNT(*) FROM trends")  # in-flight read finishes
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+            assert old_pool.get_metrics()["size"] == 0
+
+            with data_store.get_read_connection() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM trends").fetchone()[0] == 0
+        finally:
+            data_store.disable_read_snapshot()
+
+    def test_checkpoint_truncates_wal(self, data_store, sample_trends):
+        data_store.save_trends_bulk(sample_trends)
+        result = data_store.checkpoint()
+
+        assert result["busy"] == 0
+        wal = Path(f"{data_store.db_path}-wal")
+        assert not wal.exists() or wal.stat().st_size == 0
+
+
+@pytest.fixture(params=["sqlite", "duckdb"])
+def analytics_engine(request, data_store):
+    """Engine name for tests that must pass on both analytics engines."""
+    if request.param == "duckdb":
+        pytest.importorskip("duckdb")
+        pytest.importorskip("pyarrow")
+    data_store._cache.clear()
+    yield request.param
+    data_store.use_analytics_engine("sqlite")
+    data_store._cache.clear()
+
+
+class TestAnalyticsEngines:
+    """Run the analytical methods against both the SQLite and DuckDB engines."""
+
+    def _seed(self, store, sample_trends, engine):
+        from dataclasses import replace
+
+        earlier = sample_trends[0].first_detected - timedelta(hours=6)
+        store.save_trends_bulk(
+            [
+                replace(sample_trends[0], first_detected=earlier),
+                replace(sample_trends[0], platform="tiktok", score=90.0),
+                sample_trends[1],
+            ]
+        )
+        store.use_analytics_engine(engine)
+        assert store.analytics_engine == engine
+
+    def test_trending_summary(self, data_store, sample_trends, analytics_engine):
+        self._seed(data_store, sample_trends, analytics_engine)
+        summary = data_store.get_trending_summary_cached(days=7)
+
+        assert summary["stats"]["unique_tracks"] == 2
+        assert summary["stats"]["platforms"] == 2
+        assert summary["stats"]["total_entries"] == 3
+        assert summary["top_tracks"][0]["platform"] == "tiktok"
+
+    def test_cross_platform_spread(self, data_store, sample_trends, analytics_engine):
+        self._seed(data_store, sample_trends, analytics_engine)
+        result = data_store.analyze_cross_platform_spread("track one", "artist a")
+
+        assert result["platforms"] == ["spotify", "tiktok"]
+        assert result["propagation_pattern"][0]["hours_difference"] == 6.0
+
+    def test_cross_platform_spread_all(self, data_store, sample_trends, analytics_engine):
+        self._seed(data_store, sample_trends, analytics_engine)
+        edges = data_store.analyze_cross_platform_spread_all(days=7)
+
+        assert len(edges) == 1
+        edge = edges.iloc[0]
+        assert (edge["track_name"], edge["source_platform"], edge["target_platform"]) == (
+            "Track One",
+            "spotify",
+            "tiktok",
+        )
+        assert edge["lag_hours"] == 6.0
+        assert edge["propagation_strength"] == 0.5
+        with data_store.get_connection() as conn:
+            stored = conn.execute(
+                "SELECT source_platform, target_platform, lag_hours "
+                "FROM cross_platform_correlations"
+            ).fetchall()
+        assert [tuple(row) for row in stored] == [("spotify", "tiktok", 6.0)]
+
+    def test_writes_after_switch_are_visible(self, data_store, sample_trends, analytics_engine):
+        self._seed(data_store, sample_trends, analytics_engine)
+        from dataclasses import replace
+
+        data_store.save_trends_bulk([replace(sample_trends[1], platform="youtube")])
+        report = data_store.get_data_quality_report()
+
+        assert report["table_statistics"]["trends"] == 4
+        assert report["platform_distribution"]["youtube"] == 1
+
+    def test_data_quality_report(self, data_store, sample_trends, analytics_engine):
+        self._seed(data_store, sample_trends, analytics_engine)
+        report = data_store.get_data_quality_report()
+
+        assert report["table_statistics"]["trends"] == 3
+        assert report["platform_distribution"] == {"spotify": 2, "tiktok": 1}
+        assert report["issue_count"] == 0
+
+    def test_duckdb_reads_parquet_snapshot(self, data_store, sample_trends, tmp_path):
+        pytest.importorskip("duckdb")
+        pytest.importorskip("pyarrow")
+        self._seed(data_store, sample_trends, "sqlite")
+        snapshot = data_store.create_snapshot(str(tmp_path / "snapshot"))
+
+        data_store.use_analytics_engine("duckdb", parquet_dir=snapshot)
+        try:
+            data_store._cache.clear()
+            summary = data_store.get_trending_summary_cached(days=7)
+        finally:
+            data_store.use_analytics_engine("sqlite")
+            data_store._cache.clear()
+        assert summary["stats"]["total_entries"] == 3
+
+
+class TestSchemaMigrations:
+    """Test user_version migrations and the index report."""
+
+    def test_new_database_is_at_latest_version(self, data_store):
+        version = data_store.get_schema_version()
+        assert version["version"] == version["latest"]
+        assert version["pending"] == []
+
+    def test_legacy_replace_key_is_rebuilt(self, temp_db_path, data_store, sample_trends):
+        from core.migrations import rebuild_table
+
+        trend_id = data_store.save_trend(sample_trends[0])
+        with data_store.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rebuild_table(
+                conn,
+                "trends",
+                lambda sql: sql.replace(
+                    "UNIQUE(platform, track_id, region, trend_date)",
+                    "UNIQUE(platform, track_id, region, trend_date) ON CONFLICT REPLACE",
+                ),
+            )
+            conn.execute("UPDATE trends SET trend_ts = NULL, match_key = NULL")
+            conn.execute("PRAGMA user_version = 0")
+            conn.commit()
+        data_store.close_pool()
+
+        store = EnhancedMusicDataStore(
+            db_path=str(temp_db_path), backup_dir=str(temp_db_path.parent / "backups")
+        )
+        try:
+            sample_trends[0].score = 90.0
+            assert store.save_trend(sample_trends[0]) == trend_id
+
+            with store.get_connection() as conn:
+                sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'trends'")
+                assert "REPLACE" not in sql.fetchone()[0]
+                row = conn.execute("SELECT trend_ts, match_key, score FROM trends").fetchone()
+                history = conn.execute("SELECT trend_id, velocity FROM trend_history").fetchall()
+            assert row["trend_ts"] is not None and row["match_key"] is not None
+            assert row["score"] == 90.0
+            assert [tuple(h) for h in history] == [(trend_id, 0.0), (trend_id, 5.0)]
+            assert not store.search_trends("Track One").empty
+        finally:
+            store.close_pool()
+
+    def test_index_report_has_no_redundant_indexes(self, data_store):
+        report = data_store.get_index_report()
+
+        assert report["redundant_indexes"] == []
+        assert report["full_scans"] == []
+        assert "idx_trends_active_ts_score" in report["queries"]["trending_tracks"]["indexes"]
+
+
+class TestQueryStats:
+    """Test the store's query instrumentation."""
+
+    def test_get_query_stats_covers_store_queries(self, data_store, sample_trends):
+        data_store.enable_query_stats(slow_query_ms=10_000)
+        data_store.save_trends_bulk(sample_trends)
+        data_store.get_trending_tracks(platform="spotify")
+
+        stats = data_store.get_query_stats(limit=None)
+        templates = {t["template"]: t for t in stats["templates"]}
+        trending = next(t for name, t in templates.items() if "LEFT JOIN trend_stats" in name)
+        assert trending["calls"] == 1
+        assert trending["rows"] == len(sample_trends)
+
+        data_store.reset_query_stats()
+        data_store.disable_query_stats()
+        data_store.get_trending_tracks()
+        assert data_store.get_query_stats()["total_queries"] == 0
+
+
+class TestPragmaProfiles:
+    """Test PRAGMA profile selection on the store."""
+
+    def test_profile_applies_to_every_pooled_connection(self, temp_db_path):
+        store = EnhancedMusicDataStore(str(temp_db_path), pragma_profile="low_memory")
+        try:
+            with store.get_connection() as c1, store.get_connection() as c2:
+                for conn in (c1, c2):
+                    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -2048
+                    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+            settings = store.get_pragma_settings()
+            assert settings["profile"] == "low_memory"
+            assert settings["mmap_size"] == 0
+            assert settings["temp_store"] == 1  # FILE
+        finally:
+            store.close_pool()
+
+    def test_overrides_and_snapshot_inherit_read_settings(self, temp_db_path, tmp_path):
+        store = EnhancedMusicDataStore(
+            str(temp_db_path), pragma_profile="analytics", pragmas={"mmap_size": 1048576}
+        )
+        try:
+            assert store.get_pragma_settings()["mmap_size"] == 1048576
+            store.enable_read_snapshot(snapshot_dir=str(tmp_path / "snapshots"))
+            with store.get_read_connection() as conn:
+                assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 1048576
+                assert conn.execute("PRAGMA cache_size").fetchone()[0] == -262144
+        finally:
+            store.disable_read_snapshot()
+            store.close_pool()
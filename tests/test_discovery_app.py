@@ -0,0 +1,36 @@
+"""Tests for core discovery_app (storing discoveries through the async store)."""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("jinja2")
+
+from core.async_data_store import AsyncMusicDataStore  # noqa: E402
+from core.discovery_app import EnhancedMusicDiscoveryApp  # noqa: E402
+
+
+class TestStoreDiscoveries:
+    """Test EnhancedMusicDiscoveryApp._store_discoveries."""
+
+    def test_discoveries_without_track_id_get_their_own_rows(self, data_store):
+        discoveries = [
+            {"platform": "spotify", "track_name": f"Song {i}", "artist": "Artist", "score": 50.0}
+            for i in range(3)
+        ]
+
+        async def run():
+            async with AsyncMusicDataStore(data_store, batch_window=0.05) as db:
+                app = SimpleNamespace(db=db, logger=logging.getLogger(__name__))
+                await EnhancedMusicDiscoveryApp._store_discoveries(app, discoveries)
+
+        asyncio.run(run())
+
+        with data_store.get_connection() as conn:
+            rows = conn.execute("SELECT id, track_id, track_name FROM trends").fetchall()
+        assert sorted(row["track_name"] for row in rows) == ["Song 0", "Song 1", "Song 2"]
+        assert len({row["id"] for row in rows}) == 3
+        assert all(row["track_id"] for row in rows)
@@ -0,0 +1,152 @@
+"""Tests for core migrations (versioned runner, batched backfills, rebuilds) and index advice."""
+
+import sqlite3
+from contextlib import closing, contextmanager
+
+import pytest
+
+from core.exceptions import SchemaMigrationError
+from core.index_advisor import advise_indexes, analyze_plan
+from core.migrations import (
+    Backfill,
+    Migration,
+    MigrationRunner,
+    get_user_version,
+    rebuild_table,
+    run_backfill,
+)
+
+
+@pytest.fixture
+def connect(tmp_path):
+    """Connection factory over a scratch database with a small items table."""
+    path = tmp_path / "migrations.db"
+    with closing(sqlite3.connect(path)) as conn:
+        conn.execute(
+            "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, "
+            "UNIQUE(name) ON CONFLICT REPLACE)"
+        )
+        conn.executemany("INSERT INTO items (name) VALUES (?)", [(f"n{i}",) for i in range(25)])
+        conn.commit()
+
+    @contextmanager
+    def factory():
+        with closing(sqlite3.connect(path)) as conn:
+            yield conn
+
+    return factory
+
+
+class TestMigrationRunner:
+    """Test version tracking, ordering and failure handling."""
+
+    def test_applies_pending_in_order_and_records_version(self, connect):
+        order = []
+        migrations = [
+            Migration(2, "second", lambda conn: order.append(2)),
+            Migration(1, "first", lambda conn: order.append(1)),
+        ]
+        runner = MigrationRunner(connect, migrations)
+
+        assert runner.run() == [1, 2]
+        assert order == [1, 2]
+        assert runner.current_version() == 2
+        assert runner.run() == []
+
+    def test_run_stops_at_target(self, connect):
+        runner = MigrationRunner(connect, [Migration(1, "a"), Migration(2, "b")])
+
+        assert runner.run(target=1) == [1]
+        assert [m.version for m in runner.pending()] == [2]
+
+    def test_failed_migration_rolls_back_and_keeps_version(self, connect):
+        def broken(conn):
+            conn.execute("ALTER TABLE items ADD COLUMN extra TEXT")
+            conn.execute("SELECT * FROM missing_table")
+
+        runner = MigrationRunner(connect, [Migration(1, "broken", broken)])
+        with pytest.raises(SchemaMigrationError):
+            runner.run()
+
+        with connect() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(items)")}
+            assert "extra" not in columns
+            assert get_user_version(conn) == 0
+
+    def test_rejects_duplicate_versions(self, connect):
+        with pytest.raises(ValueError):
+            MigrationRunner(connect, [Migration(1, "a"), Migration(1, "b")])
+
+    def test_backfill_commits_in_batches(self, connect):
+        def add_column(conn):
+            conn.execute("ALTER TABLE items ADD COLUMN upper_name TEXT")
+
+        migration = Migration(
+            1, "upper", add_column, (Backfill("items", "upper_name", "upper(name)"),)
+        )
+        MigrationRunner(connect, [migration], batch_size=10).run()
+
+        with connect() as conn:
+            missing = conn.execute("SELECT COUNT(*) FROM items WHERE upper_name IS NULL")
+            assert missing.fetchone()[0] == 0
+            # Re-running only touches rows that are still NULL
+            assert run_backfill(conn, Backfill("items", "upper_name", "upper(name)"), 10) == 0
+
+
+class TestRebuildTable:
+    """Test the create-copy-rename table rebuild."""
+
+    def test_rebuild_drops_conflict_clause_and_keeps_rows(self, connect):
+        with connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rebuild_table(conn, "items", lambda sql: sql.replace(" ON CONFLICT REPLACE", ""))
+            conn.commit()
+
+            sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'items'").fetchone()[0]
+            assert "REPLACE" not in sql
+            assert conn.execute("SELECT COUNT(*), MAX(id) FROM items").fetchone() == (25, 25)
+            with pytest.raises(sqlite3.IntegrityError):
+                conn.execute("INSERT INTO items (name) VALUES ('n1')")
+
+
+class TestIndexAdvisor:
+    """Test EXPLAIN QUERY PLAN classification and index reports."""
+
+    def test_analyze_plan_flags_scans_and_temp_btrees(self):
+        plan = analyze_plan(
+            "q",
+            [
+                "CO-ROUTINE v",
+                "SCAN items",
+                "SEARCH other USING INDEX idx_other (a=?)",
+                "SCAN v",
+                "USE TEMP B-TREE FOR ORDER BY",
+            ],
+        )
+        assert plan.full_scans == ["SCAN items"]
+        assert plan.indexes == ["idx_other"]
+        assert plan.temp_btrees == ["USE TEMP B-TREE FOR ORDER BY"]
+
+    def test_report_finds_redundant_and_unused_indexes(self, connect):
+        with connect() as conn:
+            conn.execute("ALTER TABLE items ADD COLUMN kind TEXT")
+            conn.execute("CREATE INDEX idx_items_kind ON items(kind)")
+            conn.execute("CREATE INDEX idx_items_kind_name ON items(kind, name)")
+            conn.execute("CREATE INDEX idx_items_name ON items(name)")
+            conn.execute("CREATE TABLE logs (message TEXT)")
+
+            report = advise_indexes(
+                conn,
+                {
+                    "by_kind": ("SELECT name FROM items WHERE kind = ? AND name > ?", ("a", "")),
+                    "logs": ("SELECT message FROM logs WHERE message = ?", ("x",)),
+                },
+            )
+
+        redundant = {item["index"]: item["covered_by"] for item in report["redundant_indexes"]}
+        assert redundant == {
+            "idx_items_kind": "idx_items_kind_name",
+            "idx_items_name": "sqlite_autoindex_items_1",
+        }
+        assert report["full_scans"] == ["logs"]
+        assert "idx_items_kind_name" not in report["unused_indexes"]
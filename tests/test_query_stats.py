@@ -0,0 +1,85 @@
+"""Tests for core query_stats (templates, histograms, instrumented connections)."""
+
+import json
+import logging
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from core.logging_config import JSONFormatter
+from core.query_stats import InstrumentedConnection, QueryRecorder, normalize_sql
+
+
+@pytest.fixture
+def recorder():
+    return QueryRecorder(slow_query_ms=1000.0)
+
+
+@pytest.fixture
+def conn(recorder):
+    with closing(sqlite3.connect(":memory:", factory=InstrumentedConnection)) as conn:
+        conn.recorder = recorder
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.executemany("INSERT INTO items (name) VALUES (?)", [(f"n{i}",) for i in range(10)])
+        yield conn
+
+
+class TestNormalizeSql:
+    """Test query template normalisation."""
+
+    def test_literals_and_whitespace(self):
+        sql = "SELECT *\n  FROM t WHERE a = 'x''y' AND b >= 1.5 AND c IN (?, ?, ?) LIMIT 10"
+        assert (
+            normalize_sql(sql) == "SELECT * FROM t WHERE a = ? AND b >= ? AND c IN (?, ...) LIMIT ?"
+        )
+
+    def test_identifiers_with_digits_are_kept(self):
+        assert normalize_sql("SELECT col1 FROM t2") == "SELECT col1 FROM t2"
+
+
+class TestQueryRecorder:
+    """Test recording through instrumented connections."""
+
+    def test_disabled_recorder_uses_plain_cursors(self, conn, recorder):
+        assert type(conn.execute("SELECT 1")) is sqlite3.Cursor
+        assert recorder.get_stats()["total_queries"] == 0
+
+    def test_records_calls_and_fetched_rows(self, conn, recorder):
+        recorder.enable()
+        for limit in (3, 5):
+            conn.execute("SELECT name FROM items LIMIT ?", (limit,)).fetchall()
+        cursor = conn.execute("UPDATE items SET name = upper(name) WHERE id <= 4")
+
+        stats = recorder.get_stats(sort_by="calls")
+        select = stats["templates"][0]
+        assert select["template"] == "SELECT name FROM items LIMIT ?"
+        assert select["calls"] == 2
+        assert select["rows"] == 8
+        assert sum(select["histogram"].values()) == 2
+        assert select["p50_ms"] <= select["p99_ms"]
+        update = stats["templates"][1]
+        assert update["rows"] == cursor.rowcount == 4
+        assert stats["slow_queries"] == 0
+
+    def test_iterated_rows_are_counted(self, conn, recorder):
+        recorder.enable()
+        assert len(list(conn.execute("SELECT id FROM items"))) == 10
+        assert recorder.get_stats()["templates"][0]["rows"] == 10
+
+    def test_errors_are_counted(self, conn, recorder):
+        recorder.enable()
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("SELECT missing FROM items")
+        assert recorder.get_stats()["templates"][0]["errors"] == 1
+
+    def test_slow_query_logs_plan_as_json(self, conn, recorder, caplog):
+        recorder.enable(slow_query_ms=0.0)
+        with caplog.at_level(logging.WARNING, logger="core.query_stats"):
+            conn.execute("SELECT name FROM items WHERE id = ?", (1,)).fetchone()
+
+        record = caplog.records[-1]
+        payload = json.loads(JSONFormatter().format(record))
+        assert payload["query_template"] == "SELECT name FROM items WHERE id = ?"
+        assert payload["query_plan"] == ["SEARCH items USING INTEGER PRIMARY KEY (rowid=?)"]
+        assert recorder.get_stats()["templates"][0]["plan"] == payload["query_plan"]
@@ -0,0 +1,136 @@
+"""Tests for core sharded_data_store (write routing, fan-out reads, global ids)."""
+
+import asyncio
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.async_data_store import AsyncMusicDataStore
+from core.sharded_data_store import SHARD_ID_BITS, ShardedMusicDataStore
+
+
+@pytest.fixture
+def sharded_store(tmp_path):
+    store = ShardedMusicDataStore(
+        shard_dir=str(tmp_path / "shards"), backup_dir=str(tmp_path / "backups")
+    )
+    yield store
+    store.close_pool()
+
+
+@pytest.fixture
+def multi_platform_trends(sample_trends):
+    """sample_trends plus a TikTok copy of each with a higher score."""
+    return sample_trends + [
+        replace(trend, platform="tiktok", score=trend.score + 10) for trend in sample_trends
+    ]
+
+
+class TestShardedMusicDataStore:
+    """Test ShardedMusicDataStore routing and merging."""
+
+    def test_writes_go_to_one_file_per_platform(self, tmp_path, sharded_store, sample_trends):
+        tiktok = replace(sample_trends[0], platform="TikTok")
+        sharded_store.save_trends_bulk(sample_trends + [tiktok])
+
+        assert sharded_store.shard_keys == ["spotify", "tiktok"]
+        assert sorted(p.name for p in (tmp_path / "shards").glob("*.db")) == [
+            "trends_spotify.db",
+            "trends_tiktok.db",
+        ]
+        spotify = sharded_store.get_shard("spotify")
+        assert len(spotify.get_trending_tracks()) == 2
+
+    def test_trend_ids_are_global_and_routable(
+        self, tmp_path, sharded_store, multi_platform_trends
+    ):
+        ids = sharded_store.upsert_trends(multi_platform_trends)
+
+        assert len(set(ids)) == 4
+        assert {trend_id >> SHARD_ID_BITS for trend_id in ids} == {1, 2}
+        history = sharded_store.get_trend_history(ids[-1])
+        assert history["score"].tolist() == [multi_platform_trends[-1].score]
+
+        # Indexes survive reopening, so new ids stay in their shard's range
+        sharded_store.close_pool()
+        reopened = ShardedMusicDataStore(
+            shard_dir=str(tmp_path / "shards"), backup_dir=str(tmp_path / "backups")
+        )
+        try:
+            assert reopened.upsert_trends(multi_platform_trends) == ids
+        finally:
+            reopened.close_pool()
+
+    def test_fan_out_reads_merge_sort_and_limit(self, sharded_store, multi_platform_trends):
+        sharded_store.save_trends_bulk(multi_platform_trends)
+
+        top = sharded_store.get_trending_tracks(limit=3)
+        assert top["score"].tolist() == [95.0, 85.0, 82.0]
+        assert top["platform"].tolist() == ["tiktok", "spotify", "tiktok"]
+
+        spotify_only = sharded_store.get_trending_tracks(platform="spotify")
+        assert set(spotify_only["platform"]) == {"spotify"}
+
+        history = sharded_store.get_track_history("Track One", "Artist A")
+        assert sorted(history["score"].tolist()) == [85.0, 95.0]
+
+        report = sharded_store.get_data_quality_report()
+        assert report["table_statistics"]["trends"] == 4
+        assert report["platform_distribution"] == {"spotify": 2, "tiktok": 2}
+
+    def test_read_connection_unions_shards(self, sharded_store, multi_platform_trends):
+        sharded_store.save_trends_bulk(multi_platform_trends)
+
+        with sharded_store.get_read_connection() as conn:
+            counts = dict(
+                conn.execute("SELECT platform, COUNT(*) FROM trends GROUP BY platform").fetchall()
+            )
+            history = conn.execute("SELECT COUNT(*) FROM trend_history_all").fetchone()[0]
+        assert counts == {"spotify": 2, "tiktok": 2}
+        assert history == 4
+
+    def test_month_sharding_prunes_by_window(self, tmp_path, sample_trends):
+        store = ShardedMusicDataStore(
+            shard_dir=str(tmp_path / "months"),
+            shard_by="month",
+            backup_dir=str(tmp_path / "backups"),
+        )
+        try:
+            old = replace(sample_trends[1], trend_date=datetime.now() - timedelta(days=400))
+            store.save_trends_bulk([sample_trends[0], old])
+
+            assert len(store.shard_keys) == 2
+            assert len(store.get_trending_tracks(days=7)) == 1
+            assert len(store.get_trending_tracks(days=500)) == 2
+        finally:
+            store.close_pool()
+
+    def test_async_facade_returns_global_ids(self, sharded_store, multi_platform_trends):
+        async def run():
+            async with AsyncMusicDataStore(sharded_store, batch_window=0.05) as db:
+                return await asyncio.gather(*(db.save_trend(t) for t in multi_platform_trends))
+
+        ids = asyncio.run(run())
+        with sharded_store.get_read_connection() as conn:
+            rows = dict(conn.execute("SELECT id, platform FROM trends").fetchall())
+        assert [rows[trend_id] for trend_id in ids] == [t.platform for t in multi_platform_trends]
+        assert {trend_id >> SHARD_ID_BITS for trend_id in ids} == {1, 2}
+
+    def test_cross_platform_spread_all_spans_shards(self, sharded_store, multi_platform_trends):
+        earlier = multi_platform_trends[2].first_detected - timedelta(hours=3)
+        multi_platform_trends[2] = replace(multi_platform_trends[2], first_detected=earlier)
+        sharded_store.save_trends_bulk(multi_platform_trends)
+
+        edges = sharded_store.analyze_cross_platform_spread_all(days=7)
+        hops = {
+            edge.track_name: (edge.source_platform, edge.lag_hours)
+            for edge in edges.itertuples(index=False)
+        }
+        assert hops["Track One"] == ("tiktok", 3.0)
+        assert hops["Track Two"][0] == "spotify"
+
+        shared = sharded_store.get_shard("shared", create=False)
+        with shared.get_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM cross_platform_correlations").fetchone()
+        assert count[0] == 2
@@ -0,0 +1,62 @@
+"""Tests for core write_buffer (group commit thresholds, flush and requeue)."""
+
+import time
+
+import pytest
+
+from core.write_buffer import GroupCommitBuffer
+
+
+class TestGroupCommitBuffer:
+    """Test GroupCommitBuffer flush triggers and failure handling."""
+
+    def test_flushes_inline_at_max_rows(self):
+        batches = []
+        buffer = GroupCommitBuffer(batches.append, max_rows=3, max_delay=60)
+        for i in range(4):
+            buffer.add("trend", i)
+
+        assert batches == [{"trend": [0, 1, 2]}]
+        assert len(buffer) == 1
+        assert buffer.close() == 1
+        assert batches[-1] == {"trend": [3]}
+
+    def test_background_flush_after_max_delay(self):
+        batches = []
+        buffer = GroupCommitBuffer(batches.append, max_rows=100, max_delay=0.05)
+        buffer.add("trend", 1)
+        buffer.add("prediction", 2)
+
+        deadline = time.monotonic() + 2
+        while not batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert batches == [{"trend": [1], "prediction": [2]}]
+        buffer.close()
+
+    def test_failed_flush_requeues_batch(self):
+        calls = []
+
+        def flaky(batch):
+            calls.append(batch)
+            if len(calls) == 1:
+                raise RuntimeError("database is locked")
+
+        buffer = GroupCommitBuffer(flaky, max_rows=100, max_delay=60)
+        buffer.add("trend", 1)
+        with pytest.raises(RuntimeError):
+            buffer.flush()
+        buffer.add("trend", 2)
+
+        assert buffer.flush() == 2
+        assert calls[-1] == {"trend": [1, 2]}
+        metrics = buffer.get_metrics()
+        assert metrics["failed_flushes"] == 1
+        assert metrics["rows_flushed"] == 2
+        buffer.close()
+
+    def test_add_after_close_raises(self):
+        buffer = GroupCommitBuffer(lambda batch: None)
+        buffer.close()
+        with pytest.raises(RuntimeError):
+            buffer.add("trend", 1)